@@ -1,20 +1,41 @@
 # src/config/settings.py
 import os
+
+
+def _env_int(name, default):
+    """Integer setting with an environment override (CHESS_*)."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
 # Board settings
 
 COORD_MARGIN = 24
 BOARD_SIZE = 8
 SQUARE_SIZE = 80
 
+PANEL_WIDTH = 300
+
 BOARD_WIDTH = BOARD_SIZE * SQUARE_SIZE
 BOARD_HEIGHT = BOARD_SIZE * SQUARE_SIZE
 # Window: board + right panel (300px) + margins
 WINDOW_SIZE = (
-    BOARD_WIDTH + 300 + COORD_MARGIN,
+    BOARD_WIDTH + PANEL_WIDTH + COORD_MARGIN,
     BOARD_HEIGHT + COORD_MARGIN
 )
 FPS = 60
 
+# Resizable window: SQUARE_SIZE/WINDOW_SIZE are only the initial layout,
+# the live geometry comes from src.gui.layout.BoardLayout
+RESIZABLE_WINDOW = True
+MIN_SQUARE_SIZE = 40
+MIN_PANEL_WIDTH = 240
+RESIZE_THROTTLE_MS = 100
+ATLAS_CACHE_LIMIT = 8
+
+# Evaluation graph (right panel)
+EVAL_GRAPH_HEIGHT = 110
+EVAL_GRAPH_MIN_PLIES = 40     # x-scale capacity, doubled whenever a game outgrows it
+
 BOARD_OFFSET_X = COORD_MARGIN
 BOARD_OFFSET_Y = 0
 
@@ -35,7 +56,96 @@ PIECE_IMAGES = {
     'bR': '/images/bR.png', 'bQ': '/images/bQ.png', 'bK': '/images/bK.png'
 }
 FONT_PATH = os.path.join(ASSET_PATH, "fonts", "arial.ttf")
+CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache")
+ATLAS_CACHE_PATH = os.path.join(CACHE_PATH, "atlas")
+SAVE_PATH = os.environ.get("CHESS_SAVE_PATH") or os.path.join(PROJECT_ROOT, "saves")
+POSITION_INDEX_PATH = os.path.join(SAVE_PATH, "positions.db")
+PUZZLE_DB_PATH = os.path.join(SAVE_PATH, "puzzles.db")
 
 # Stockfish settings
 STOCKFISH_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "stockfish", "stockfish")
-ANALYSIS_DEPTH = 17
\ No newline at end of file
+ANALYSIS_DEPTH = 17        # depth for positions the user stops on in replay
+
+# Adaptive analysis budgets (see src/core/analysis_policy.py)
+ANALYSIS_PLAY_MOVETIME_MS = 150    # quick pass on every move while playing
+ANALYSIS_REVIEW_DWELL_MS = 400     # stay on a replay ply this long to deepen it
+ANALYSIS_IDLE_AFTER_MS = 3000      # no input for this long -> background deepening
+ANALYSIS_IDLE_DEPTH = 22           # target depth for background deepening
+ANALYSIS_SLICE_MS = 150            # deepening runs in short slices to keep the UI live
+ANALYSIS_GAME_CPU_BUDGET_S = 180   # engine seconds per game spent on deepening
+ANALYSIS_MULTIPV = _env_int("CHESS_ANALYSIS_MULTIPV", 3)   # candidate lines returned by one search
+ANALYSIS_CACHE_SIZE = 4096  # positions kept in the analysis cache
+# Run the analysis engine in a child process that streams every search
+# update through a shared-memory ring (src/core/shm_ring.py) to the UI
+ANALYSIS_PROCESS = _env_int("CHESS_ANALYSIS_PROCESS", 0)
+SHM_RING_CAPACITY = 1024    # records; a reader this far behind loses the oldest
+SHM_RING_PV_MOVES = 16      # principal variation moves kept per record
+PRESCREEN_BLUNDER_CP = 150  # static eval drop that gets a move deepened first
+
+# Game persistence: every record is flushed to the OS immediately,
+# fsync is batched by record count or elapsed seconds
+GAME_LOG_FSYNC_RECORDS = 16
+GAME_LOG_FSYNC_INTERVAL = 2.0
+
+# Chess clock: DEFAULT_TIME_CONTROL is "minutes+increment" (e.g. "5+3") or None for untimed
+DEFAULT_TIME_CONTROL = os.environ.get("CHESS_TIME_CONTROL") or None
+CLOCK_HEIGHT = 36
+AI_MIN_THINK_S = 0.3      # the AI never answers faster than this (unless short of time)
+AI_THINK_JITTER = 0.15    # +-15% random variation of allocated think time
+AI_TIME_SAFETY_S = 0.2    # kept in reserve on the AI's clock
+
+# Broadcast deltas kept for subscribers to catch up from; older ones resync from a snapshot
+BROADCAST_LOG_SIZE = 1024
+
+# Engine options (env overrides shown, CLI flags in src/main.py). Analysis and
+# AI engines get separate thread budgets that together stay within ENGINE_CORES.
+ENGINE_CORES = _env_int("CHESS_ENGINE_CORES", os.cpu_count() or 1)
+ANALYSIS_THREADS = _env_int("CHESS_ANALYSIS_THREADS", 0)    # 0 = cores the AI engines leave free
+ANALYSIS_HASH_MB = _env_int("CHESS_ANALYSIS_HASH_MB", 256)
+ANALYSIS_SKILL_LEVEL = 20
+AI_THREADS = _env_int("CHESS_AI_THREADS", max(1, ENGINE_CORES // 4))
+AI_HASH_MB = _env_int("CHESS_AI_HASH_MB", 64)
+AI_SKILL_LEVEL = _env_int("CHESS_AI_SKILL_LEVEL", 0)        # 0 = derived from difficulty level
+
+# LAN play server (src/net). Server-side engines run one thread each, so
+# SERVER_ENGINE_WORKERS searches can run in parallel without oversubscribing.
+SERVER_HOST = os.environ.get("CHESS_SERVER_HOST", "0.0.0.0")
+SERVER_PORT = _env_int("CHESS_SERVER_PORT", 8765)
+SERVER_ENGINE_WORKERS = _env_int("CHESS_SERVER_ENGINE_WORKERS", ENGINE_CORES)
+SERVER_ENGINES_PER_LEVEL = 2         # pooled AI engines per difficulty level
+SERVER_MAX_WRITE_BUFFER = 256 * 1024  # a client this far behind is disconnected
+
+# Puzzle extraction: a move that drops the mover's winning chances by
+# PUZZLE_MIN_SWING points starts a candidate; the engine check keeps it if the
+# best reply is unique (PUZZLE_UNIQUE_MARGIN win% ahead of the second line)
+# and wins PUZZLE_MIN_MATERIAL centipawns of material or mates
+PUZZLE_MIN_SWING = 30
+PUZZLE_UNIQUE_MARGIN = 15
+PUZZLE_MIN_MATERIAL = 200
+PUZZLE_MAX_SOLVER_MOVES = 3
+PUZZLE_CHECK_DEPTH = 16
+PUZZLE_WORKERS = max(1, ENGINE_CORES // 2)
+PUZZLE_PAGE_SIZE = 50
+# Distributed analysis (src/net/analysis_cluster.py): a coordinator hands
+# batches of positions to worker processes on other machines. A batch not
+# answered within CLUSTER_BATCH_TIMEOUT_S (or whose worker disconnects) is
+# retried elsewhere, at most CLUSTER_MAX_ATTEMPTS times. Idle workers run a
+# backup copy of batches in flight longer than CLUSTER_BACKUP_AFTER_S.
+CLUSTER_HOST = os.environ.get("CHESS_CLUSTER_HOST", "0.0.0.0")
+CLUSTER_PORT = _env_int("CHESS_CLUSTER_PORT", 8766)
+CLUSTER_BATCH_SIZE = 8
+CLUSTER_BATCH_TIMEOUT_S = 120
+CLUSTER_BACKUP_AFTER_S = 5
+CLUSTER_MAX_ATTEMPTS = 3
+CLUSTER_WORKER_ENGINES = _env_int("CHESS_CLUSTER_WORKER_ENGINES", ENGINE_CORES)
+CLUSTER_WORKER_HASH_MB = 64
+# Soak test (src/tools/soak.py): menu -> game -> replay -> back cycles; growth
+# is measured against the state after SOAK_WARMUP_CYCLES cycles (caches and
+# lazily imported modules settle first) and must stay under these limits
+SOAK_WARMUP_CYCLES = 3
+SOAK_PLIES = 8
+SOAK_MAX_RSS_GROWTH_MB = 32
+SOAK_MAX_TRACEMALLOC_GROWTH_KB = 2048
+SOAK_MAX_FD_GROWTH = 0
+SOAK_MAX_CHILD_GROWTH = 0
+SOAK_MAX_THREAD_GROWTH = 0
@@ -1,16 +1,45 @@
 # src/core/analysis.py
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import chess
 from stockfish import Stockfish
-from src.config.settings import STOCKFISH_PATH, ANALYSIS_DEPTH
+from src.config.settings import STOCKFISH_PATH, ANALYSIS_MULTIPV, ANALYSIS_CACHE_SIZE
+from src.core.analysis_policy import AdaptiveAnalysisPolicy
+from src.core.engine_options import EngineOptions
+from src.core.stockfish_player import close_engine
 import os
 
+TERMINAL_DEPTH = 255   # depth reported for positions without legal moves
+
+
+def terminal_result(fen):
+    """Result for a position without legal moves: mate when in check, otherwise a stalemate draw."""
+    score_type = "mate" if chess.Board(fen).is_check() else "cp"
+    return {"type": score_type, "value": 0, "best_move": None, "lines": [], "depth": TERMINAL_DEPTH}
+
+
+def position_cache_key(fen):
+    """FEN without the move counters, so transpositions share a cache entry."""
+    return " ".join(fen.split()[:4])
+
+
 class ChessAnalysis:
-    def __init__(self):
+    def __init__(self, multipv=ANALYSIS_MULTIPV, policy=None, options=None, coordinator=None):
         self.enabled = False
+        self.coordinator = coordinator   # AnalysisCoordinator for analyze_many() on remote workers (library use)
         self.stockfish = None
+        self.options = options or EngineOptions(multipv=multipv)
+        self.multipv = self.options.multipv
+        self.policy = policy or AdaptiveAnalysisPolicy()
+        self.cache = OrderedDict()
+        self.engine_seconds = 0.0
+        self._slice = None      # (fen, started Event, Future) of the deepening slice running in the background
+        self._slice_executor = None
         if os.path.exists(STOCKFISH_PATH):
             try:
-                self.stockfish = Stockfish(path=STOCKFISH_PATH)
-                self.stockfish.set_depth(ANALYSIS_DEPTH)
+                self.stockfish = Stockfish(path=STOCKFISH_PATH, parameters=self.options.uci_parameters())
                 self.enabled = True  # Only enable if loaded successfully
             except Exception as e:
                 print(f"[WARNING] Failed to initialize Stockfish: {e}")
@@ -19,22 +48,199 @@ class ChessAnalysis:
             print(f"[WARNING] Stockfish executable not found at: {STOCKFISH_PATH}")
             self.enabled = False
 
+    def close(self):
+        """Stop the engine process and drop the cache; analysis stays disabled afterwards."""
+        self._stop_slice()
+        if self._slice_executor is not None:
+            self._slice_executor.shutdown(wait=True)
+            self._slice_executor = None
+        if self.stockfish is not None:
+            close_engine(self.stockfish)
+            self.stockfish = None
+        self.enabled = False
+        self.cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def toggle_analysis(self):
         if self.stockfish is not None:
             self.enabled = not self.enabled
 
-    def analyze_position(self, fen):
+    def poll(self):
+        """(fen, result, final) of results that arrived since the last call; searches here return theirs directly."""
+        return ()
+
+    def pending(self):
+        """Searches requested but not finished yet."""
+        self._collect_slice()
+        return 0 if self._slice is None else 1
+
+    def analyze_position(self, fen, budget=None):
+        """Evaluate a position; returns the best line plus the top MultiPV candidate lines.
+
+        All lines come from a single MultiPV search limited by `budget`
+        (default: the policy's quick play budget). Results are cached per
+        position and any cached entry is returned as is. Scores are from
+        White's point of view.
+        """
         if not self.enabled or self.stockfish is None:
             return None
+        key = position_cache_key(fen)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            return cached
+        self._stop_slice()
+        result = self._search(fen, budget or self.policy.play_budget)
+        if result is not None:
+            self._store(key, result)
+        return result
+
+    def analyze_many(self, fens, budget=None):
+        """Evaluate many positions (bulk review); results in the order of `fens`.
+
+        Cached positions and repeats are searched once. With a coordinator
+        the rest go to the remote workers in one submission, otherwise they
+        are searched here one after another.
+        """
+        budget = budget or self.policy.play_budget
+        results = [None] * len(fens)
+        missing = {}
+        for i, fen in enumerate(fens):
+            key = position_cache_key(fen)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.setdefault(key, []).append(i)
+        if not missing:
+            return results
+
+        if self.coordinator is not None:
+            fresh = self.coordinator.analyze_many([fens[indices[0]] for indices in missing.values()], budget,
+                                                  self.multipv)
+        elif self.enabled and self.stockfish is not None:
+            self._stop_slice()
+            fresh = [self._search(fens[indices[0]], budget) for indices in missing.values()]
+        else:
+            return results
+        for (key, indices), result in zip(missing.items(), fresh):
+            if result is None:
+                continue
+            self._store(key, result)
+            for i in indices:
+                results[i] = result
+        return results
+
+    def deepen(self, fen, known_depth=0):
+        """Run one policy slice on a position, in the background.
+
+        Returns a result deeper than `known_depth` once the cache has one;
+        otherwise starts a slice on a worker thread (unless one is running,
+        see pending()) and returns None. Ask again after the slice finished.
+        """
+        if not self.enabled or self.stockfish is None:
+            return None
+        self._collect_slice()
+        key = position_cache_key(fen)
+        cached = self.cache.get(key)
+        if cached is not None and cached.get("depth", 0) > known_depth:
+            return cached
+        if self._slice is None:
+            if self._slice_executor is None:
+                self._slice_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis-slice")
+            started = threading.Event()
+            future = self._slice_executor.submit(self._search, fen, self.policy.slice_budget,
+                                                 lambda *_: started.set())
+            self._slice = (fen, started, future)
+        return None
+
+    def _collect_slice(self):
+        """Cache the result of a finished slice if it got deeper than what is cached."""
+        if self._slice is None or not self._slice[2].done():
+            return
+        fen, _, future = self._slice
+        self._slice = None
+        result = future.result()
+        key = position_cache_key(fen)
+        cached = self.cache.get(key)
+        if result is not None and (cached is None or result["depth"] > cached.get("depth", 0)):
+            self._store(key, result)
+
+    def _stop_slice(self):
+        """End a running slice early and wait for it; the engine is free afterwards."""
+        if self._slice is None:
+            return
+        _, started, future = self._slice
+        # Only after the first info line: until then the worker may still be writing to the engine
+        while not future.done():
+            if started.wait(timeout=0.005):
+                try:
+                    self.stockfish._put("stop")
+                except Exception as e:
+                    print(f"[WARNING] Could not stop the analysis slice: {e}")
+                break
+        future.result()
+        self._collect_slice()
+
+    def _store(self, key, result):
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        if len(self.cache) > ANALYSIS_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def _search(self, fen, budget, on_line=None):
+        """One MultiPV search under `budget`, parsed from the engine's info lines.
+
+        `on_line(multipv, line, pv)` is called for every info line kept, with
+        the line dict (including its depth) and the full PV as UCI strings.
+        """
+        sign = 1 if fen.split()[1] == "w" else -1
+        started = time.perf_counter()
+        lines = {}
         try:
-            self.stockfish.set_fen_position(fen)
-            evaluation = self.stockfish.get_evaluation()
-            best_move = self.stockfish.get_best_move()
-            return {
-                "type": evaluation["type"],
-                "value": evaluation["value"],
-                "best_move": best_move
-            }
+            # Keep the hash between positions of the same game (no ucinewgame)
+            self.stockfish.set_fen_position(fen, send_ucinewgame_token=False)
+            self.stockfish._put(budget.go_command())
+            while True:
+                parts = self.stockfish._read_line().split(" ")
+                if parts[0] == "bestmove":
+                    break
+                if (parts[0] != "info" or "multipv" not in parts or "pv" not in parts or
+                        "lowerbound" in parts or "upperbound" in parts):
+                    continue
+                score_at = parts.index("score")
+                pv_at = parts.index("pv")
+                multipv = int(parts[parts.index("multipv") + 1])
+                lines[multipv] = {
+                    "move": parts[pv_at + 1],
+                    "type": parts[score_at + 1],
+                    "value": int(parts[score_at + 2]) * sign,
+                    "depth": int(parts[parts.index("depth") + 1])
+                }
+                if on_line is not None:
+                    on_line(multipv, lines[multipv], parts[pv_at + 1:])
         except Exception as e:
             print(f"[ERROR] Stockfish analysis failed: {e}")
-            return None
\ No newline at end of file
+            return None
+        finally:
+            self.engine_seconds += time.perf_counter() - started
+
+        ordered = [lines[k] for k in sorted(lines) if k <= self.multipv]
+        if not ordered:
+            # No legal moves: checkmate or stalemate
+            return terminal_result(fen)
+        depth = ordered[0].pop("depth")
+        for line in ordered[1:]:
+            line.pop("depth")
+        return {
+            "type": ordered[0]["type"],
+            "value": ordered[0]["value"],
+            "best_move": ordered[0]["move"],
+            "lines": ordered,
+            "depth": depth
+        }
\ No newline at end of file
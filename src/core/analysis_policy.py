@@ -0,0 +1,115 @@
+# src/core/analysis_policy.py
+from src.config.settings import (
+    ANALYSIS_DEPTH, ANALYSIS_PLAY_MOVETIME_MS, ANALYSIS_REVIEW_DWELL_MS,
+    ANALYSIS_IDLE_AFTER_MS, ANALYSIS_IDLE_DEPTH, ANALYSIS_SLICE_MS,
+    ANALYSIS_GAME_CPU_BUDGET_S
+)
+from src.core.batch_eval import screen_game
+
+
+class SearchBudget:
+    """Limits for one engine search: any of depth, movetime (ms) and nodes."""
+
+    def __init__(self, depth=None, movetime=None, nodes=None):
+        if depth is None and movetime is None and nodes is None:
+            raise ValueError("SearchBudget needs at least one of depth, movetime or nodes")
+        self.depth = depth
+        self.movetime = movetime
+        self.nodes = nodes
+
+    def go_command(self):
+        parts = ["go"]
+        if self.depth is not None:
+            parts += ["depth", str(self.depth)]
+        if self.movetime is not None:
+            parts += ["movetime", str(self.movetime)]
+        if self.nodes is not None:
+            parts += ["nodes", str(self.nodes)]
+        return " ".join(parts)
+
+    def __repr__(self):
+        return f"SearchBudget({self.go_command()[3:]})"
+
+
+class AdaptiveAnalysisPolicy:
+    """Decides how much engine time each position gets.
+
+    - While playing, every new position gets a quick movetime pass.
+    - A replay position the user stays on is deepened to ANALYSIS_DEPTH.
+    - When there is no input for a while, analysed plies of the game are
+      deepened in the background to ANALYSIS_IDLE_DEPTH. Moves the static
+      batch prescreen (batch_eval.screen_game) flags as likely blunders
+      are deepened first.
+    Deepening runs in short movetime slices (the engine's hash carries the
+    work over between slices) and stops once the per-game CPU budget is spent.
+    A ply whose depth stops improving for MAX_STALLED_SLICES slices is skipped.
+    """
+
+    MAX_STALLED_SLICES = 8
+
+    def __init__(self, cpu_budget_s=ANALYSIS_GAME_CPU_BUDGET_S):
+        self.cpu_budget_s = cpu_budget_s
+        self.play_budget = SearchBudget(movetime=ANALYSIS_PLAY_MOVETIME_MS)
+        self.slice_budget = SearchBudget(movetime=ANALYSIS_SLICE_MS)
+        self.last_input_ms = 0
+        self.replay_ply = None
+        self.replay_since_ms = 0
+        self.stalled = {}   # ply -> consecutive slices without a deeper result
+        self._suspects = []
+        self._suspects_key = None
+
+    def note_input(self, now_ms):
+        self.last_input_ms = now_ms
+
+    def note_view(self, controller, now_ms):
+        """Track which replay ply is shown and since when."""
+        ply = controller.replay_index if controller.replay_mode else None
+        if ply != self.replay_ply:
+            self.replay_ply = ply
+            self.replay_since_ms = now_ms
+
+    def note_result(self, ply, improved):
+        """Record whether a deepening slice on `ply` produced a deeper result."""
+        self.stalled[ply] = 0 if improved else self.stalled.get(ply, 0) + 1
+
+    def _runnable(self, ply):
+        return self.stalled.get(ply, 0) < self.MAX_STALLED_SLICES
+
+    def suspect_plies(self, controller):
+        """Positions around prescreened blunders (before and after each move), worst first."""
+        key = tuple(controller.move_history)
+        if key != self._suspects_key:
+            self._suspects_key = key
+            self._suspects = []
+            for ply in screen_game(controller.initial_fen, controller.move_history):
+                self._suspects += [ply, ply + 1]
+        return self._suspects
+
+    def exhausted(self, engine_seconds):
+        return engine_seconds >= self.cpu_budget_s
+
+    def next_deepening(self, controller, engine_seconds, now_ms):
+        """Ply of the next position to deepen, or None."""
+        if self.exhausted(engine_seconds) or controller.awaiting_promotion:
+            return None
+        history = controller.analysis_history
+        if len(history) != len(controller.move_history) + 1:
+            return None  # history not aligned with plies (analysis was off for part of the game)
+
+        if (self.replay_ply is not None and self.replay_ply < len(history) and
+                now_ms - self.replay_since_ms >= ANALYSIS_REVIEW_DWELL_MS and
+                _depth(history[self.replay_ply]) < ANALYSIS_DEPTH and self._runnable(self.replay_ply)):
+            return self.replay_ply
+
+        if now_ms - self.last_input_ms >= ANALYSIS_IDLE_AFTER_MS:
+            # Shown position first, then suspected blunders, then the rest of the game from the end
+            current = self.replay_ply if self.replay_ply is not None else len(history) - 1
+            order = [current] + self.suspect_plies(controller) + list(range(len(history) - 1, -1, -1))
+            for ply in order:
+                if ply < len(history) and _depth(history[ply]) < ANALYSIS_IDLE_DEPTH and self._runnable(ply):
+                    return ply
+        return None
+
+
+def _depth(analysis):
+    return analysis.get("depth", 0) if analysis else 0
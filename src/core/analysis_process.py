@@ -0,0 +1,229 @@
+# src/core/analysis_process.py
+import multiprocessing
+import os
+import queue
+import time
+from collections import OrderedDict
+
+import chess
+
+from src.config.settings import STOCKFISH_PATH, ANALYSIS_MULTIPV, ANALYSIS_CACHE_SIZE
+from src.core.analysis import ChessAnalysis, TERMINAL_DEPTH, terminal_result
+from src.core.analysis_policy import AdaptiveAnalysisPolicy, SearchBudget
+from src.core.engine_options import EngineOptions
+from src.core.game_log import pack_move, unpack_move, SCORE_KINDS, SCORE_NAMES
+from src.core.position_index import position_key
+from src.core.shm_ring import ShmRing, RingReader
+
+LINE_FINISHED = 0   # record line number marking the end of a search (score kind 0: failed or skipped)
+LINE_ELAPSED = 255  # record line number carrying a search's engine time (ms) in its score, sent before the end
+
+
+def _limits(budget):
+    return budget.depth, budget.movetime, budget.nodes
+
+
+def serve(ring_name, requests, options):
+    """Child process: search requested positions, streaming every info line into the ring.
+
+    Requests are (fen, limits); only the newest queued request is searched,
+    older ones are reported finished without a result.
+    """
+    ring = ShmRing.attach(ring_name)
+    analysis = ChessAnalysis(options=options)
+    try:
+        while True:
+            request = requests.get()
+            skipped = []
+            while request is not None:
+                try:
+                    newer = requests.get_nowait()
+                except queue.Empty:
+                    break
+                skipped.append(request)
+                request = newer
+            for fen, _ in skipped:
+                ring.publish(position_key(chess.Board(fen)), 0, 0, 0, LINE_FINISHED)
+            if request is None:
+                return
+            fen, limits = request
+            key = position_key(chess.Board(fen))
+
+            def publish(multipv, line, pv):
+                ring.publish(key, line["depth"], SCORE_KINDS[line["type"]], line["value"], multipv,
+                             [pack_move(chess.Move.from_uci(move)) for move in pv[:ring.pv_moves]])
+
+            result = None
+            if analysis.stockfish:
+                started = time.perf_counter()
+                result = analysis._search(fen, SearchBudget(*limits), publish)
+                ring.publish(key, 0, 0, round((time.perf_counter() - started) * 1000), LINE_ELAPSED)
+            if result is None:
+                ring.publish(key, 0, 0, 0, LINE_FINISHED)
+            else:
+                best = [pack_move(chess.Move.from_uci(result["best_move"]))] if result["best_move"] else []
+                ring.publish(key, result["depth"], SCORE_KINDS[result["type"]], result["value"], LINE_FINISHED, best)
+    finally:
+        analysis.close()
+        ring.close()
+
+
+class ProcessAnalysis:
+    """ChessAnalysis for the game loop with the engine in a child process.
+
+    Searches run in the background: analyze_position() and deepen() return
+    what is known and queue a search otherwise. The child publishes every
+    info line as a fixed-size record into a shared-memory ring; poll()
+    reads the new records straight from shared memory each frame, so no
+    result is pickled and the UI sees each search deepen as it runs.
+    """
+
+    def __init__(self, multipv=ANALYSIS_MULTIPV, policy=None, options=None):
+        self.options = options or EngineOptions(multipv=multipv)
+        self.multipv = self.options.multipv
+        self.policy = policy or AdaptiveAnalysisPolicy()
+        self.enabled = False
+        self.stockfish = None       # the child process when an engine is available
+        self.engine_seconds = 0.0      # time the child spent searching, as it reports
+        self.results = OrderedDict()    # position key -> newest result
+        self.final = set()              # keys whose last search finished
+        self.lines = {}                 # position key -> {multipv: line} of the search in progress
+        self.in_flight = {}             # position key -> [fen, live]
+        if not os.path.exists(STOCKFISH_PATH):
+            print(f"[WARNING] Stockfish executable not found at: {STOCKFISH_PATH}")
+            return
+        context = multiprocessing.get_context("spawn")
+        self.ring = ShmRing()
+        self.reader = RingReader(self.ring)
+        self.requests = context.Queue()
+        self.process = context.Process(target=serve, args=(self.ring.name, self.requests, self.options),
+                                       name="analysis-engine", daemon=True)
+        self.process.start()
+        self.stockfish = self.process
+        self.enabled = True
+
+    def close(self):
+        """Stop the child process and free the ring."""
+        if self.stockfish is None:
+            return
+        self.requests.put(None)
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.requests.close()
+        self.requests.join_thread()
+        self.ring.close()
+        self.ring.unlink()
+        self.stockfish = None
+        self.enabled = False
+        self.results.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def toggle_analysis(self):
+        if self.stockfish is not None:
+            self.enabled = not self.enabled
+
+    def pending(self):
+        return len(self.in_flight)
+
+    def _request(self, fen, key, budget, live):
+        entry = self.in_flight.get(key)
+        if entry is not None:
+            entry[1] = entry[1] or live
+            return
+        self.in_flight[key] = [fen, live]
+        self.final.discard(key)
+        self.lines.pop(key, None)
+        self.requests.put((fen, _limits(budget)))
+
+    def analyze_position(self, fen, budget=None):
+        """The known result for the position (None at first); searches it unless a search finished already."""
+        if not self.enabled or self.stockfish is None:
+            return None
+        key = position_key(chess.Board(fen))
+        if key not in self.final:
+            self._request(fen, key, budget or self.policy.play_budget, True)
+        return self.results.get(key)
+
+    def deepen(self, fen, known_depth=0):
+        """A finished result deeper than `known_depth`, else None after queueing a slice on the position."""
+        if not self.enabled or self.stockfish is None:
+            return None
+        key = position_key(chess.Board(fen))
+        result = self.results.get(key)
+        if key in self.final and result is not None and result["depth"] > known_depth:
+            return result
+        self._request(fen, key, self.policy.slice_budget, False)
+        return None
+
+    def poll(self):
+        """(fen, result, final) per position updated by the records published since the last call.
+
+        Only searches asked for by analyze_position are reported; deepen()
+        hands out the results of its own slices.
+        """
+        if self.stockfish is None:
+            return ()
+        updated = {}
+        for record in self.reader.poll():
+            entry = self.in_flight.get(record.key)
+            if entry is None:
+                continue    # a search the last poll already saw finish
+            if record.line == LINE_ELAPSED:
+                self.engine_seconds += record.value / 1000
+                continue
+            if record.line != LINE_FINISHED:
+                if record.line <= self.multipv and record.pv:
+                    self.lines.setdefault(record.key, {})[record.line] = {
+                        "move": unpack_move(record.pv[0]).uci(), "type": SCORE_NAMES[record.kind],
+                        "value": record.value, "depth": record.depth
+                    }
+                    result = self._assemble(record.key)
+                    if result is not None and entry[1]:
+                        updated[record.key] = (entry[0], result, False)
+                continue
+            del self.in_flight[record.key]
+            self.lines.pop(record.key, None)
+            if record.kind == 0:
+                updated.pop(record.key, None)
+                continue
+            result = self.results.get(record.key)
+            if record.depth == TERMINAL_DEPTH and not record.pv:
+                result = terminal_result(entry[0])
+            if result is not None:
+                self._store(record.key, result)
+                self.final.add(record.key)
+                if entry[1]:
+                    updated[record.key] = (entry[0], result, True)
+        return list(updated.values())
+
+    def _assemble(self, key):
+        lines = self.lines[key]
+        if 1 not in lines:
+            return None
+        ordered = [dict(lines[k]) for k in sorted(lines)]
+        depth = ordered[0]["depth"]
+        for line in ordered:
+            line.pop("depth")
+        result = {
+            "type": ordered[0]["type"],
+            "value": ordered[0]["value"],
+            "best_move": ordered[0]["move"],
+            "lines": ordered,
+            "depth": depth
+        }
+        self._store(key, result)
+        return result
+
+    def _store(self, key, result):
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > ANALYSIS_CACHE_SIZE:
+            old, _ = self.results.popitem(last=False)
+            self.final.discard(old)
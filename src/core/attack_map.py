@@ -0,0 +1,91 @@
+# src/core/attack_map.py
+from collections import namedtuple
+
+import chess
+
+# Material values used to call a piece hanging (kings never hang)
+PIECE_VALUES = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9, chess.KING: 0}
+
+# attacked: {color: bitboard of squares that color attacks}
+# hanging:  bitboard of pieces attacked and undefended, or attacked by a cheaper piece
+# checkers: bitboard of pieces giving check; king_square: king in check or None
+ThreatInfo = namedtuple("ThreatInfo", ["attacked", "hanging", "checkers", "king_square"])
+
+
+class AttackMaps:
+    """Per-square attack bitboards for a chess.Board, updated move by move.
+
+    After a push only the moved/captured pieces and the sliders whose rays
+    crossed a square that changed occupancy are recomputed; the previous
+    masks are stacked so a pop restores them without any recomputation.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.piece_attacks = [0] * 64
+        self._stack = []
+        self.refresh()
+
+    def refresh(self):
+        """Recompute every square from scratch (new or externally changed position)."""
+        board = self.board
+        self.piece_attacks = [board.attacks_mask(sq) if board.piece_type_at(sq) else 0 for sq in chess.SQUARES]
+        self._stack = []
+
+    def after_push(self, old_occupied, move):
+        board = self.board
+        changed = old_occupied ^ board.occupied
+        touched = changed | chess.BB_SQUARES[move.to_square]
+        sliders = (board.bishops | board.rooks | board.queens) & ~touched
+        for sq in chess.scan_forward(sliders):
+            if self.piece_attacks[sq] & changed:
+                touched |= chess.BB_SQUARES[sq]
+
+        saved = []
+        for sq in chess.scan_forward(touched):
+            saved.append((sq, self.piece_attacks[sq]))
+            self.piece_attacks[sq] = board.attacks_mask(sq) if board.piece_type_at(sq) else 0
+        self._stack.append(saved)
+
+    def after_pop(self):
+        if not self._stack:
+            self.refresh()
+            return
+        for sq, mask in self._stack.pop():
+            self.piece_attacks[sq] = mask
+
+    def attacks(self, color):
+        mask = 0
+        for sq in chess.scan_forward(self.board.occupied_co[color]):
+            mask |= self.piece_attacks[sq]
+        return mask
+
+    def threats(self):
+        """ThreatInfo for the current position."""
+        board = self.board
+        by_type = {chess.WHITE: {}, chess.BLACK: {}}
+        attacked = {chess.WHITE: 0, chess.BLACK: 0}
+        for color in (chess.WHITE, chess.BLACK):
+            for sq in chess.scan_forward(board.occupied_co[color]):
+                piece_type = board.piece_type_at(sq)
+                # A king only takes undefended pieces, so it never counts as the cheaper attacker
+                if piece_type != chess.KING:
+                    by_type[color][piece_type] = by_type[color].get(piece_type, 0) | self.piece_attacks[sq]
+                attacked[color] |= self.piece_attacks[sq]
+
+        hanging = 0
+        for sq in chess.scan_forward(board.occupied & ~board.kings):
+            color = board.color_at(sq)
+            bit = chess.BB_SQUARES[sq]
+            if not attacked[not color] & bit:
+                continue
+            value = PIECE_VALUES[board.piece_type_at(sq)]
+            cheaper = any(
+                mask & bit for piece_type, mask in by_type[not color].items() if PIECE_VALUES[piece_type] < value
+            )
+            if cheaper or not attacked[color] & bit:
+                hanging |= bit
+
+        king_square = board.king(board.turn) if board.is_check() else None
+        checkers = int(board.checkers()) if king_square is not None else 0
+        return ThreatInfo(attacked, hanging, checkers, king_square)
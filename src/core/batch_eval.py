@@ -0,0 +1,241 @@
+# src/core/batch_eval.py
+import chess
+import numpy as np
+
+from src.config.settings import PRESCREEN_BLUNDER_CP
+from src.core.scoring import MATE_SCORE
+
+# Plane order of packed positions: White P N B R Q K, then Black P N B R Q K
+PIECE_TYPES = [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING]
+PIECE_VALUES = np.array([100, 320, 330, 500, 900, 0], dtype=np.int32)
+MOBILITY_WEIGHTS = np.array([0, 4, 5, 2, 1, 0], dtype=np.int32)   # cp per reachable square
+
+# Piece-square tables (Simplified Evaluation Function), White's view, rank 8 first
+_PST_RANK8_FIRST = [
+    [0, 0, 0, 0, 0, 0, 0, 0,
+     50, 50, 50, 50, 50, 50, 50, 50,
+     10, 10, 20, 30, 30, 20, 10, 10,
+     5, 5, 10, 25, 25, 10, 5, 5,
+     0, 0, 0, 20, 20, 0, 0, 0,
+     5, -5, -10, 0, 0, -10, -5, 5,
+     5, 10, 10, -20, -20, 10, 10, 5,
+     0, 0, 0, 0, 0, 0, 0, 0],
+    [-50, -40, -30, -30, -30, -30, -40, -50,
+     -40, -20, 0, 0, 0, 0, -20, -40,
+     -30, 0, 10, 15, 15, 10, 0, -30,
+     -30, 5, 15, 20, 20, 15, 5, -30,
+     -30, 0, 15, 20, 20, 15, 0, -30,
+     -30, 5, 10, 15, 15, 10, 5, -30,
+     -40, -20, 0, 5, 5, 0, -20, -40,
+     -50, -40, -30, -30, -30, -30, -40, -50],
+    [-20, -10, -10, -10, -10, -10, -10, -20,
+     -10, 0, 0, 0, 0, 0, 0, -10,
+     -10, 0, 5, 10, 10, 5, 0, -10,
+     -10, 5, 5, 10, 10, 5, 5, -10,
+     -10, 0, 10, 10, 10, 10, 0, -10,
+     -10, 10, 10, 10, 10, 10, 10, -10,
+     -10, 5, 0, 0, 0, 0, 5, -10,
+     -20, -10, -10, -10, -10, -10, -10, -20],
+    [0, 0, 0, 0, 0, 0, 0, 0,
+     5, 10, 10, 10, 10, 10, 10, 5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     0, 0, 0, 5, 5, 0, 0, 0],
+    [-20, -10, -10, -5, -5, -10, -10, -20,
+     -10, 0, 0, 0, 0, 0, 0, -10,
+     -10, 0, 5, 5, 5, 5, 0, -10,
+     -5, 0, 5, 5, 5, 5, 0, -5,
+     0, 0, 5, 5, 5, 5, 0, -5,
+     -10, 5, 5, 5, 5, 5, 0, -10,
+     -10, 0, 5, 0, 0, 0, 0, -10,
+     -20, -10, -10, -5, -5, -10, -10, -20],
+    [-30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -20, -30, -30, -40, -40, -30, -30, -20,
+     -10, -20, -20, -20, -20, -20, -20, -10,
+     20, 20, 0, 0, 0, 0, 20, 20,
+     20, 30, 10, 0, 0, 10, 30, 20],
+]
+
+
+def _build_pst():
+    """(12, 64) signed table in python-chess square order (a1 = 0), material included."""
+    white = np.array(_PST_RANK8_FIRST, dtype=np.int32).reshape(6, 8, 8)[:, ::-1, :].reshape(6, 64)
+    white = white + PIECE_VALUES[:, None]
+    black = white.reshape(6, 8, 8)[:, ::-1, :].reshape(6, 64)   # mirror ranks
+    return np.concatenate([white, -black])
+
+
+PST = _build_pst()
+
+_U = np.uint64
+_FULL = _U(0xFFFFFFFFFFFFFFFF)
+_NOT_A = _U(0xFEFEFEFEFEFEFEFE)
+_NOT_H = _U(0x7F7F7F7F7F7F7F7F)
+_NOT_AB = _U(0xFCFCFCFCFCFCFCFC)
+_NOT_GH = _U(0x3F3F3F3F3F3F3F3F)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_SQUARE_BITS = np.arange(64, dtype=np.uint64)
+
+# (shift, wrap mask): positive shifts go left (towards h8)
+_ROOK_DIRS = [(8, _FULL), (-8, _FULL), (1, _NOT_A), (-1, _NOT_H)]
+_BISHOP_DIRS = [(9, _NOT_A), (7, _NOT_H), (-7, _NOT_A), (-9, _NOT_H)]
+
+
+def _shift(bb, n):
+    return bb << _U(n) if n > 0 else bb >> _U(-n)
+
+
+def _slide(gen, empty, directions):
+    """Kogge-Stone sliding attacks of every piece in `gen`, stopped by blockers."""
+    attacks = np.zeros_like(gen)
+    for n, mask in directions:
+        g, e = gen, empty & mask
+        g = g | (e & _shift(g, n))
+        e = e & _shift(e, n)
+        g = g | (e & _shift(g, 2 * n))
+        e = e & _shift(e, 2 * n)
+        g = g | (e & _shift(g, 4 * n))
+        attacks |= _shift(g, n) & mask
+    return attacks
+
+
+def _knight_attacks(bb):
+    l1, l2 = (bb >> _U(1)) & _NOT_H, (bb >> _U(2)) & _NOT_GH
+    r1, r2 = (bb << _U(1)) & _NOT_A, (bb << _U(2)) & _NOT_AB
+    h1, h2 = l1 | r1, l2 | r2
+    return (h1 << _U(16)) | (h1 >> _U(16)) | (h2 << _U(8)) | (h2 >> _U(8))
+
+
+def _king_attacks(bb):
+    row = bb | ((bb << _U(1)) & _NOT_A) | ((bb >> _U(1)) & _NOT_H)
+    return (row | (row << _U(8)) | (row >> _U(8))) & ~bb
+
+
+def _pawn_attacks(bb, white):
+    if white:
+        return ((bb << _U(9)) & _NOT_A) | ((bb << _U(7)) & _NOT_H)
+    return ((bb >> _U(7)) & _NOT_A) | ((bb >> _U(9)) & _NOT_H)
+
+
+def popcount(bb):
+    """Set bits per element of a uint64 array."""
+    bb = np.ascontiguousarray(bb, dtype=np.uint64)
+    return _POPCOUNT8[bb.view(np.uint8)].reshape(bb.shape + (8,)).sum(axis=-1, dtype=np.int32)
+
+
+def pack_bitboards(positions):
+    """Pack boards or FENs into ((N, 12) uint64 bitboards, (N,) bool White-to-move)."""
+    masks, turns = [], []
+    for position in positions:
+        board = chess.Board(position) if isinstance(position, str) else position
+        for color in (chess.WHITE, chess.BLACK):
+            masks.extend(board.pieces_mask(pt, color) for pt in PIECE_TYPES)
+        turns.append(board.turn == chess.WHITE)
+    bitboards = np.array(masks, dtype=np.uint64).reshape(-1, 12)
+    return bitboards, np.array(turns, dtype=bool)
+
+
+def unpack_planes(bitboards):
+    """(N, 12) bitboards -> (N, 12, 64) uint8 one-hot planes."""
+    return ((bitboards[..., None] >> _SQUARE_BITS) & _U(1)).astype(np.uint8)
+
+
+def _attack_maps(bitboards):
+    """(N, 2, 6) attack sets per side and piece type."""
+    occupied = np.bitwise_or.reduce(bitboards, axis=1)
+    empty = ~occupied
+    maps = np.zeros((len(bitboards), 2, 6), dtype=np.uint64)
+    for side in (0, 1):
+        p, n, b, r, q, k = (bitboards[:, side * 6 + i] for i in range(6))
+        maps[:, side, 0] = _pawn_attacks(p, side == 0)
+        maps[:, side, 1] = _knight_attacks(n)
+        maps[:, side, 2] = _slide(b, empty, _BISHOP_DIRS)
+        maps[:, side, 3] = _slide(r, empty, _ROOK_DIRS)
+        maps[:, side, 4] = _slide(q, empty, _ROOK_DIRS + _BISHOP_DIRS)
+        maps[:, side, 5] = _king_attacks(k)
+    return maps
+
+
+def _mobility(bitboards, maps):
+    """White minus Black weighted count of squares reachable by each piece type."""
+    score = np.zeros(len(bitboards), dtype=np.int32)
+    for side, sign in ((0, 1), (1, -1)):
+        own = np.bitwise_or.reduce(bitboards[:, side * 6:side * 6 + 6], axis=1)
+        reach = popcount(maps[:, side, :] & ~own[:, None])
+        score += sign * (reach * MOBILITY_WEIGHTS).sum(axis=1, dtype=np.int32)
+    return score
+
+
+def _threat_gain(bitboards, maps, white_to_move):
+    """Best one-capture gain for the side to move (a one-ply quiescence proxy).
+
+    A piece counts as won outright when it is attacked and undefended, or
+    as value minus attacker value when a cheaper piece other than the king attacks it.
+    """
+    n = len(bitboards)
+    us = np.where(white_to_move, 0, 1)
+    them = 1 - us
+    rows = np.arange(n)
+    our_maps, their_maps = maps[rows, us], maps[rows, them]
+    our_all = np.bitwise_or.reduce(our_maps, axis=1)
+    their_all = np.bitwise_or.reduce(their_maps, axis=1)
+    gain = np.zeros(n, dtype=np.int32)
+    for t in range(5):   # kings are never captured
+        targets = bitboards[rows, them * 6 + t]
+        hanging = (targets & our_all & ~their_all) != 0
+        gain = np.maximum(gain, np.where(hanging, PIECE_VALUES[t], 0))
+        for a in range(5):   # a king takes only undefended pieces (the hanging case)
+            trade = PIECE_VALUES[t] - PIECE_VALUES[a]
+            if trade > 0:
+                hit = (targets & our_maps[:, a]) != 0
+                gain = np.maximum(gain, np.where(hit, trade, 0))
+    return gain
+
+
+def evaluate_packed(bitboards, white_to_move):
+    """Static evaluation (centipawns, White's view) of packed positions."""
+    planes = unpack_planes(bitboards).astype(np.int32)
+    score = np.einsum("nps,ps->n", planes, PST)
+    maps = _attack_maps(bitboards)
+    score += _mobility(bitboards, maps)
+    gain = _threat_gain(bitboards, maps, white_to_move)
+    return score + np.where(white_to_move, gain, -gain)
+
+
+def evaluate(positions):
+    """Static evaluation (centipawns, White's view) of a batch of boards or FENs.
+
+    Material + piece-square tables + mobility, plus the best single capture
+    for the side to move. Meant for cheap screening, not for display.
+    """
+    if not positions:
+        return np.zeros(0, dtype=np.int32)
+    return evaluate_packed(*pack_bitboards(positions))
+
+
+def screen_game(initial_fen, moves, threshold=PRESCREEN_BLUNDER_CP):
+    """Plies whose move probably lost at least `threshold` centipawns, worst first.
+
+    Ply i is the move played from position i (0 = initial position). One
+    batch evaluation covers the whole game, so this is cheap enough to run
+    before deciding where engine time goes.
+    """
+    board = chess.Board(initial_fen)
+    boards = [board.copy(stack=False)]
+    for move in moves:
+        board.push(move)
+        boards.append(board.copy(stack=False))
+    values = evaluate(boards).astype(np.int64)
+    if board.is_checkmate():
+        values[-1] = -MATE_SCORE if board.turn == chess.WHITE else MATE_SCORE
+
+    signs = np.where([b.turn == chess.WHITE for b in boards[:-1]], 1, -1)
+    losses = signs * (values[:-1] - values[1:])
+    suspects = np.flatnonzero(losses >= threshold)
+    return [int(ply) for ply in suspects[np.argsort(-losses[suspects], kind="stable")]]
@@ -1,11 +1,13 @@
 # src/core/board.py
 import chess
+from src.core.attack_map import AttackMaps
 
 class ChessBoard:
-    def __init__(self):
-        self.board = chess.Board()
+    def __init__(self, fen=None):
+        self.board = chess.Board(fen) if fen else chess.Board()
         self.selected_square = None
         self.legal_moves = []
+        self.attack_maps = AttackMaps(self.board)
 
     def select_square(self, square):
         """Select a square and get legal moves for the piece."""
@@ -18,12 +20,24 @@ class ChessBoard:
 
     def make_move(self, move):
         if move in self.board.legal_moves:
+            old_occupied = self.board.occupied
             self.board.push(move)
+            self.attack_maps.after_push(old_occupied, move)
             self.selected_square = None
             self.legal_moves = []
             return True
         return False
 
+    def undo_move(self):
+        """Take back the last move; returns it, or None if there is none."""
+        if not self.board.move_stack:
+            return None
+        move = self.board.pop()
+        self.attack_maps.after_pop()
+        self.selected_square = None
+        self.legal_moves = []
+        return move
+
     def get_fen(self):
         return self.board.fen()
 
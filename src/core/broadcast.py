@@ -0,0 +1,185 @@
+# src/core/broadcast.py
+import threading
+from collections import namedtuple
+
+import chess
+
+from src.config.settings import BROADCAST_LOG_SIZE
+
+# kind "move":     ply, data = chess.Move
+# kind "analysis": ply, data = analysis result stored at analysis_history[ply]
+# kind "undo":     ply = moves left, data = analysis entries left
+Delta = namedtuple("Delta", ["seq", "kind", "ply", "data"])
+
+
+class Snapshot:
+    """Immutable game state as of delta `seq`; shared by every late joiner."""
+
+    def __init__(self, seq, initial_fen, moves, analyses):
+        self.seq = seq
+        self.initial_fen = initial_fen
+        self.moves = tuple(moves)
+        self.analyses = tuple(analyses)
+        self._board = None
+
+    def board(self):
+        """A fresh board at the snapshot position (replayed once, then copied)."""
+        if self._board is None:
+            board = chess.Board(self.initial_fen)
+            for move in self.moves:
+                board.push(move)
+            self._board = board
+        return self._board.copy()
+
+
+class BroadcastChannel:
+    """Publishes a GameController's moves and analysis as numbered deltas.
+
+    Publishing appends to one shared log and costs the same for one
+    subscriber or thousands; each Subscription is just a cursor into that
+    log. A subscriber that falls further behind than the log keeps is
+    resynchronised from a snapshot instead of replaying the gap.
+    """
+
+    def __init__(self, controller, log_size=BROADCAST_LOG_SIZE):
+        self.controller = controller
+        self.log_size = log_size
+        self.log = []
+        self.base_seq = 1     # seq of log[0]
+        self.seq = 0          # seq of the newest delta
+        self.lock = threading.Lock()
+        self._snapshot = None
+        controller.add_listener(self)
+
+    def close(self):
+        self.controller.remove_listener(self)
+
+    # GameController listener
+
+    def on_move(self, move):
+        self._publish("move", len(self.controller.move_history) - 1, move)
+
+    def on_analysis(self, result):
+        ply = len(self.controller.analysis_history) - 1
+        self._publish("analysis", ply, self.controller.analysis_history[ply])
+
+    def on_analysis_update(self, ply, result):
+        self._publish("analysis", ply, self.controller.analysis_history[ply])
+
+    def on_undo(self):
+        self._publish("undo", len(self.controller.move_history), len(self.controller.analysis_history))
+
+    def _publish(self, kind, ply, data):
+        with self.lock:
+            self.seq += 1
+            self.log.append(Delta(self.seq, kind, ply, data))
+            if len(self.log) >= 2 * self.log_size:
+                drop = len(self.log) - self.log_size
+                del self.log[:drop]
+                self.base_seq += drop
+
+    # Subscriber side
+
+    def snapshot(self):
+        """Current state; one Snapshot object is reused until the next delta."""
+        with self.lock:
+            if self._snapshot is None or self._snapshot.seq != self.seq:
+                self._snapshot = Snapshot(
+                    self.seq, self.controller.initial_fen,
+                    self.controller.move_history, self.controller.analysis_history
+                )
+            return self._snapshot
+
+    def subscribe(self):
+        return Subscription(self)
+
+    def deltas_since(self, cursor):
+        """Deltas after seq `cursor`, or None if they are no longer in the log."""
+        with self.lock:
+            if cursor + 1 < self.base_seq:
+                return None
+            return self.log[cursor + 1 - self.base_seq:]
+
+
+class Subscription:
+    """A viewer's cursor into a BroadcastChannel."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.cursor = None
+
+    def poll(self):
+        """(snapshot or None, deltas) the viewer has not seen yet.
+
+        The first poll, and any poll after falling out of the log, returns a
+        snapshot to start from. Analysis deltas are coalesced: each ply keeps
+        only its newest result, at the position of its first delta, so a
+        viewer that polls rarely applies one update per ply instead of every
+        deepening step. Coalescing never crosses an undo.
+        """
+        if self.cursor is not None:
+            deltas = self.channel.deltas_since(self.cursor)
+            if deltas is not None:
+                if deltas:
+                    self.cursor = deltas[-1].seq
+                return None, coalesce(deltas)
+        snapshot = self.channel.snapshot()
+        self.cursor = snapshot.seq
+        return snapshot, []
+
+
+def coalesce(deltas):
+    out = []
+    first = {}   # ply -> index in out of its first analysis delta since the last undo
+    for delta in deltas:
+        if delta.kind == "analysis":
+            index = first.get(delta.ply)
+            if index is not None:
+                out[index] = delta
+                continue
+            first[delta.ply] = len(out)
+        elif delta.kind == "undo":
+            first.clear()
+        out.append(delta)
+    return out
+
+
+class GameView:
+    """Viewer-side mirror of a broadcast game, kept current from deltas."""
+
+    def __init__(self, subscription):
+        self.subscription = subscription
+        self.board = None
+        self.initial_fen = None
+        self.moves = []
+        self.analyses = []
+        self.seq = 0
+
+    def refresh(self):
+        """Apply everything new; returns True if the view changed."""
+        snapshot, deltas = self.subscription.poll()
+        if snapshot is not None:
+            self.initial_fen = snapshot.initial_fen
+            self.board = snapshot.board()
+            self.moves = list(snapshot.moves)
+            self.analyses = list(snapshot.analyses)
+            self.seq = snapshot.seq
+        for delta in deltas:
+            self.apply(delta)
+        return snapshot is not None or bool(deltas)
+
+    def apply(self, delta):
+        if delta.kind == "move":
+            self.board.push(delta.data)
+            self.moves.append(delta.data)
+        elif delta.kind == "analysis":
+            if delta.ply < len(self.analyses):
+                self.analyses[delta.ply] = delta.data
+            else:
+                self.analyses.append(delta.data)
+        elif delta.kind == "undo":
+            while len(self.moves) > delta.ply:
+                self.moves.pop()
+                self.board.pop()
+            del self.analyses[delta.data:]
+        self.seq = delta.seq
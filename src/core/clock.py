@@ -0,0 +1,114 @@
+# src/core/clock.py
+import random
+import time
+
+import chess
+
+from src.config.settings import AI_MIN_THINK_S, AI_THINK_JITTER, AI_TIME_SAFETY_S
+
+
+def parse_time_control(spec):
+    """'5+3' (minutes + increment seconds) -> (base_s, increment_s)."""
+    base, _, increment = spec.partition("+")
+    return float(base) * 60, float(increment or 0)
+
+
+class ChessClock:
+    """Two-sided game clock with a Fischer increment."""
+
+    def __init__(self, base_s, increment_s=0.0, now=time.monotonic):
+        self.base_s = base_s
+        self.increment_s = increment_s
+        self._now = now
+        self.remaining = {chess.WHITE: float(base_s), chess.BLACK: float(base_s)}
+        self.running = None       # color whose time is running
+        self.started_at = 0.0
+        self._history = []        # remaining times before each press, for undo
+
+    def start(self, color):
+        if self.running is None:
+            self.running = color
+            self.started_at = self._now()
+
+    def stop(self):
+        if self.running is not None:
+            self.remaining[self.running] = self.time_left(self.running)
+            self.running = None
+
+    def time_left(self, color):
+        left = self.remaining[color]
+        if self.running == color:
+            left -= self._now() - self.started_at
+        return max(0.0, left)
+
+    def press(self, color):
+        """`color` completed a move: bank the increment and start the opponent's time."""
+        self._history.append(dict(self.remaining))
+        if self.running == color:
+            self.remaining[color] = self.time_left(color) + self.increment_s
+        self.running = not color
+        self.started_at = self._now()
+
+    def undo(self):
+        """Restore the times from before the last press; the previous mover is to move again."""
+        if not self._history:
+            return
+        self.remaining = self._history.pop()
+        if self.running is not None:
+            self.running = not self.running
+            self.started_at = self._now()
+
+    def flagged(self):
+        """Color that ran out of time, or None."""
+        if self.running is not None and self.time_left(self.running) <= 0:
+            return self.running
+        return None
+
+    @staticmethod
+    def format(seconds):
+        if seconds < 10:
+            return f"{seconds:.1f}"
+        seconds = int(seconds)
+        return f"{seconds // 60}:{seconds % 60:02d}"
+
+    def display_key(self):
+        """Both clocks as shown; changes only when the display needs a redraw."""
+        return self.format(self.time_left(chess.WHITE)), self.format(self.time_left(chess.BLACK))
+
+
+class TimeManager:
+    """Allocates AI think time from the clock, the position and the move number.
+
+    A share of the remaining time (spread over the moves likely still to
+    come, plus most of the increment) is scaled by how complex the position
+    looks (number of legal moves) and by game phase: quick in the opening,
+    longest in the middlegame, with some randomness so the AI does not move
+    at a machine-regular pace.
+    """
+
+    def __init__(self, min_think_s=AI_MIN_THINK_S, jitter=AI_THINK_JITTER, rng=None):
+        self.min_think_s = min_think_s
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def allocate(self, board, remaining_s, increment_s):
+        """Seconds to think on `board` with `remaining_s` left on the mover's clock."""
+        cap = max(0.05, min(remaining_s * 0.25, remaining_s - AI_TIME_SAFETY_S))
+        legal = board.legal_moves.count()
+        if legal <= 1:
+            return min(self.min_think_s, cap)
+
+        moves_to_go = max(12, 40 - board.fullmove_number // 2)
+        think = remaining_s / moves_to_go + increment_s * 0.75
+
+        complexity = 0.7 + 0.6 * min(legal, 45) / 45
+        if legal <= 3:
+            complexity = 0.4   # nearly forced
+        if board.fullmove_number <= 6:
+            phase = 0.5
+        elif board.fullmove_number <= 30:
+            phase = 1.2
+        else:
+            phase = 1.0
+        think *= complexity * phase * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(min(self.min_think_s, cap), min(think, cap))
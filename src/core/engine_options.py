@@ -0,0 +1,88 @@
+# src/core/engine_options.py
+from src.config.settings import (
+    ENGINE_CORES, ANALYSIS_THREADS, ANALYSIS_HASH_MB, ANALYSIS_MULTIPV, ANALYSIS_SKILL_LEVEL,
+    AI_THREADS, AI_HASH_MB, AI_SKILL_LEVEL, ANALYSIS_PROCESS
+)
+
+
+class EngineOptions:
+    """UCI options for one engine process."""
+
+    def __init__(self, threads=1, hash_mb=16, multipv=1, skill_level=None):
+        self.threads = max(1, threads)
+        self.hash_mb = max(1, hash_mb)
+        self.multipv = max(1, multipv)
+        self.skill_level = skill_level
+
+    def uci_parameters(self):
+        """Parameters for stockfish.Stockfish(parameters=...)."""
+        params = {"Threads": self.threads, "Hash": self.hash_mb, "MultiPV": self.multipv}
+        if self.skill_level is not None:
+            params["Skill Level"] = self.skill_level
+        return params
+
+    def __repr__(self):
+        return (f"EngineOptions(threads={self.threads}, hash_mb={self.hash_mb}, "
+                f"multipv={self.multipv}, skill_level={self.skill_level})")
+
+
+class EngineConfig:
+    """Splits the machine's cores between the analysis engine and the AI engines.
+
+    AI engines get their thread budget first (they decide the game's pace);
+    the analysis engine gets what is left unless ANALYSIS_THREADS pins it,
+    and is clamped so both together stay within `cores` (every engine keeps
+    at least one thread, so only a machine with fewer cores than engines
+    is oversubscribed).
+    """
+
+    def __init__(self, cores=ENGINE_CORES, analysis_threads=ANALYSIS_THREADS, analysis_hash_mb=ANALYSIS_HASH_MB,
+                 multipv=ANALYSIS_MULTIPV, ai_threads=AI_THREADS, ai_hash_mb=AI_HASH_MB,
+                 ai_skill_level=AI_SKILL_LEVEL, analysis_process=ANALYSIS_PROCESS):
+        self.cores = max(1, cores)
+        self.analysis_threads = analysis_threads
+        self.analysis_hash_mb = analysis_hash_mb
+        self.multipv = multipv
+        self.ai_threads = ai_threads
+        self.ai_hash_mb = ai_hash_mb
+        self.ai_skill_level = ai_skill_level or None
+        self.analysis_process = bool(analysis_process)   # analysis engine in a child process (ProcessAnalysis)
+
+    def for_game(self, ai_players):
+        """(analysis EngineOptions, AI EngineOptions) for a game with `ai_players` AI sides."""
+        ai_each = 0
+        if ai_players:
+            # Leave at least one core for analysis
+            ai_each = max(1, min(self.ai_threads, (self.cores - 1) // ai_players))
+        free = max(1, self.cores - ai_each * ai_players)
+        analysis_threads = min(self.analysis_threads, free) if self.analysis_threads else free
+
+        analysis = EngineOptions(
+            analysis_threads, self.analysis_hash_mb, self.multipv, ANALYSIS_SKILL_LEVEL
+        )
+        ai = EngineOptions(max(1, ai_each), self.ai_hash_mb, 1, self.ai_skill_level)
+        return analysis, ai
+
+    @classmethod
+    def from_args(cls, args):
+        """Build from argparse results; unset flags keep the settings/env defaults."""
+        config = cls()
+        for name in ("cores", "analysis_threads", "analysis_hash_mb", "multipv",
+                     "ai_threads", "ai_hash_mb", "ai_skill_level", "analysis_process"):
+            value = getattr(args, name, None)
+            if value is not None:
+                setattr(config, name, value)
+        config.ai_skill_level = config.ai_skill_level or None
+        return config
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--cores", type=int, help="total cores for all engines")
+        parser.add_argument("--analysis-threads", type=int, help="analysis engine Threads")
+        parser.add_argument("--analysis-hash-mb", type=int, help="analysis engine Hash (MB)")
+        parser.add_argument("--multipv", type=int, help="analysis MultiPV lines")
+        parser.add_argument("--ai-threads", type=int, help="Threads per AI engine")
+        parser.add_argument("--ai-hash-mb", type=int, help="Hash per AI engine (MB)")
+        parser.add_argument("--ai-skill-level", type=int, help="fixed AI Skill Level (0-20)")
+        parser.add_argument("--analysis-process", action="store_true", default=None,
+                            help="run analysis in a child process streaming results through shared memory")
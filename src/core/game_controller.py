@@ -3,16 +3,27 @@ import chess
 import time
 import random
 import copy
+from concurrent.futures import ThreadPoolExecutor, wait
 from src.core.board import ChessBoard
 from src.core.player import Player
+from src.core.scoring import move_quality
+from src.core.clock import ChessClock, TimeManager
+from src.core.attack_map import AttackMaps
 
 class GameController:
-    def __init__(self, white_is_human=True, black_is_human=True, white_difficulty=1, black_difficulty=1):
-        self.board = ChessBoard()
-        self.white_player = Player(chess.WHITE, is_human=white_is_human, difficulty_level=white_difficulty)
-        self.black_player = Player(chess.BLACK, is_human=black_is_human, difficulty_level=black_difficulty)
+    def __init__(self, white_is_human=True, black_is_human=True, white_difficulty=1, black_difficulty=1,
+                 engine_options=None, time_control=None, initial_fen=None):
+        self.board = ChessBoard(initial_fen)
+        self.white_player = Player(chess.WHITE, is_human=white_is_human, difficulty_level=white_difficulty,
+                                   engine_options=engine_options)
+        self.black_player = Player(chess.BLACK, is_human=black_is_human, difficulty_level=black_difficulty,
+                                   engine_options=engine_options)
         self.game_over = False
         self.ai_move_pending = False
+        self._ai_search = None     # (ply, Future) of the AI move being computed
+        self._ai_executor = None
+        self.ai_move_delay_s = 0.2  # untimed games: pause before the AI answers
+        self.ai_move_gate = None    # optional ply -> bool: may a finished AI move be played now (trace replays)
         self.move_history = []
         self.awaiting_promotion = None
 
@@ -22,8 +33,103 @@ class GameController:
         self.replay_index = -1
         self.initial_fen = self.board.get_fen()
 
+        # Bumped whenever analysis_history shrinks; plies whose entry was
+        # replaced in place are listed in analysis_updates until taken
+        self.analysis_revision = 0
+        self.analysis_updates = []
+
+        # Clock: time_control is (base seconds, increment seconds) or None for untimed
+        self.clock = ChessClock(*time_control) if time_control else None
+        self.time_manager = TimeManager() if time_control else None
+        self.flagged = None   # color that lost on time
+
+        # Attack/threat overlay info memoised per ply
+        self._threats = {}
+
+        # Observers (game log, ...) notified via on_move/on_analysis/on_analysis_update/on_undo
+        self.listeners = []
+
+    def close(self):
+        """Stop the AI engines and the AI thread. The game state stays readable."""
+        # End a search in progress and wait for the AI thread before the engines quit under it
+        self.white_player.stop()
+        self.black_player.stop()
+        if self._ai_executor is not None:
+            self._ai_executor.shutdown(wait=True, cancel_futures=True)
+            self._ai_executor = None
+        self.white_player.close()
+        self.black_player.close()
+        self._ai_search = None
+        self.ai_move_pending = False
+        self.listeners.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        for listener in self.listeners:
+            handler = getattr(listener, "on_" + event, None)
+            if handler:
+                handler(*args)
+
+    def _record_move(self, move):
+        self.move_history.append(move)
+        self.game_over = self.board.is_game_over()
+        if self.clock:
+            self.clock.press(not self.board.board.turn)
+            if self.game_over:
+                self.clock.stop()
+        self._notify("move", move)
+
     def _save_analysis(self, analysis_result):
         self.analysis_history.append(copy.deepcopy(analysis_result))
+        self._notify("analysis", analysis_result)
+
+    def update_analysis(self, ply, analysis_result):
+        """Replace the analysis of an earlier ply (e.g. after a deeper search)."""
+        if 0 <= ply < len(self.analysis_history):
+            self.analysis_history[ply] = copy.deepcopy(analysis_result)
+            self.analysis_updates.append(ply)
+            self._notify("analysis_update", ply, analysis_result)
+
+    def take_analysis_updates(self):
+        """Plies whose analysis was replaced since the last call, oldest first."""
+        updates, self.analysis_updates = self.analysis_updates, []
+        return updates
+
+    def save_current_analysis(self, analysis_result):
+        """Store the analysis of the current position, replacing its entry if it has one (after an undo)."""
+        ply = len(self.move_history)
+        if ply < len(self.analysis_history):
+            self.update_analysis(ply, analysis_result)
+        else:
+            self._save_analysis(analysis_result)
+
+    def get_fen_at(self, ply):
+        """FEN of the position after `ply` moves."""
+        board = chess.Board(self.initial_fen)
+        for move in self.move_history[:ply]:
+            board.push(move)
+        return board.fen()
+
+    def load_history(self, move_history, analysis_history):
+        """Restore a saved game without replaying any engine work."""
+        for move in move_history:
+            self.board.board.push(move)
+        self.board.attack_maps.refresh()
+        self.move_history = list(move_history)
+        self.analysis_history = list(analysis_history)
+        self.game_over = self.board.is_game_over()
 
     def handle_click(self, square, input_handler):
         if self.replay_mode or self.game_over or self.awaiting_promotion:
@@ -58,8 +164,7 @@ class GameController:
 
             move = chess.Move(from_sq, to_sq)
             if self.board.make_move(move):
-                self.move_history.append(move)
-                self.game_over = self.board.is_game_over()
+                self._record_move(move)
                 return move
             else:
                 self.board.select_square(square)
@@ -72,42 +177,108 @@ class GameController:
         move = chess.Move(from_sq, to_sq, promotion=piece_type)
         if move in self.board.board.legal_moves:
             self.board.make_move(move)
-            self.move_history.append(move)
-            self.game_over = self.board.is_game_over()
+            self._record_move(move)
         self.awaiting_promotion = None
 
+    def apply_move(self, move):
+        """Play a move that comes from outside the board UI (network peer, server engine)."""
+        if self.game_over or self.awaiting_promotion:
+            return False
+        if not self.board.make_move(move):
+            return False
+        self._record_move(move)
+        return True
+
     def undo_last_move(self):
         if self.replay_mode or self.game_over or self.awaiting_promotion or not self.move_history:
             return False
-        self.board.board.pop()
+        self.board.undo_move()
         self.move_history.pop()
+        self._threats.pop(len(self.move_history) + 1, None)
         if self.analysis_history:
             self.analysis_history.pop()
+        self.analysis_revision += 1
         self.game_over = False
+        if self.clock:
+            self.clock.undo()
+        self._ai_search = None   # a pending AI move was for the undone position
+        self.ai_move_pending = False
         self.board.selected_square = None
         self.board.legal_moves = []
+        self._notify("undo")
         return True
 
+    def _check_clock(self):
+        """Start the clock with the first update and end the game on a flag."""
+        if not self.clock or self.game_over:
+            return False
+        self.clock.start(self.board.board.turn)
+        flagged = self.clock.flagged()
+        if flagged is None:
+            return False
+        self.flagged = flagged
+        self.game_over = True
+        self.clock.stop()
+        return True
+
+    @staticmethod
+    def _think(player, board, think_time, delay_s):
+        if think_time is None:
+            time.sleep(delay_s)  # Slight delay
+        return player.get_move(board, think_time)
+
+    def wait_for_ai(self, timeout=None):
+        """Block until the AI move being computed (if any) is ready."""
+        if self._ai_search is not None:
+            wait([self._ai_search[1]], timeout)
+
     def update(self):
+        """Advance the game: clock flags and AI moves. Returns True if the position changed.
+
+        AI moves are computed on a worker thread so the UI keeps running
+        (and the clock keeps ticking) while the engine thinks.
+        """
+        if self._check_clock():
+            return True
         if self.replay_mode or self.game_over or self.awaiting_promotion:
-            return
+            return False
 
         current_player = self.white_player if self.board.board.turn == chess.WHITE else self.black_player
-        if not current_player.is_human:
-            if not self.ai_move_pending:
-                self.ai_move_pending = True
-                time.sleep(0.2)  # Slight delay
-                move = current_player.get_move(self.board.board)
-                if move:
-                    # Handle promotion (auto-queen if needed)
-                    if (self.board.board.piece_at(move.from_square) and
-                        self.board.board.piece_at(move.from_square).piece_type == chess.PAWN and
-                        chess.square_rank(move.to_square) in (0, 7)):
-                        move = chess.Move(move.from_square, move.to_square, promotion=chess.QUEEN)
-                    self.board.make_move(move)
-                    self.move_history.append(move)
-                    self.game_over = self.board.is_game_over()
-                self.ai_move_pending = False
+        if current_player.is_human:
+            return False
+
+        ply = len(self.move_history)
+        if self._ai_search is None or self._ai_search[0] != ply:
+            if self._ai_executor is None:
+                self._ai_executor = ThreadPoolExecutor(max_workers=1)
+            think_time = None
+            if self.clock:
+                think_time = self.time_manager.allocate(
+                    self.board.board, self.clock.time_left(self.board.board.turn), self.clock.increment_s
+                )
+            future = self._ai_executor.submit(
+                self._think, current_player, self.board.board.copy(), think_time, self.ai_move_delay_s
+            )
+            self._ai_search = (ply, future)
+            self.ai_move_pending = True
+            return False
+
+        future = self._ai_search[1]
+        if not future.done() or (self.ai_move_gate is not None and not self.ai_move_gate(ply)):
+            return False
+        self._ai_search = None
+        self.ai_move_pending = False
+        move = future.result()
+        if move:
+            # Handle promotion (auto-queen if needed)
+            if (self.board.board.piece_at(move.from_square) and
+                self.board.board.piece_at(move.from_square).piece_type == chess.PAWN and
+                chess.square_rank(move.to_square) in (0, 7)):
+                move = chess.Move(move.from_square, move.to_square, promotion=chess.QUEEN)
+            if self.board.make_move(move):
+                self._record_move(move)
+                return True
+        return False
 
     def enter_replay_mode(self):
         self.replay_mode = True
@@ -125,12 +296,30 @@ class GameController:
         if 0 <= new_index <= len(self.move_history):
             self.replay_index = new_index
 
+    def jump_replay(self, ply):
+        """Enter replay at a given ply (e.g. clicked on the eval graph)."""
+        if not self.replay_mode:
+            self.enter_replay_mode()
+        self.replay_index = max(0, min(ply, len(self.move_history)))
+
     def get_replay_board(self):
         board = chess.Board(self.initial_fen)
         for i in range(self.replay_index):
             board.push(self.move_history[i])
         return board
 
+    def get_threats(self):
+        """ThreatInfo of the shown position (live or replay), memoised per ply."""
+        ply = self.replay_index if self.replay_mode else len(self.move_history)
+        info = self._threats.get(ply)
+        if info is None:
+            if ply == len(self.move_history):
+                info = self.board.attack_maps.threats()
+            else:
+                info = AttackMaps(self.get_replay_board()).threats()
+            self._threats[ply] = info
+        return info
+
     def get_replay_analysis(self):
         if self.replay_index < len(self.analysis_history):
             return self.analysis_history[self.replay_index]
@@ -147,6 +336,26 @@ class GameController:
                 best_move = chess.Move.from_uci(analysis["best_move"])
         return played_move, best_move
 
+    def get_candidate_moves(self):
+        """Engine candidate lines (after the best one) for the replayed move's position."""
+        if self.replay_index <= 0 or self.replay_index - 1 >= len(self.analysis_history):
+            return []
+        analysis = self.analysis_history[self.replay_index - 1]
+        if not analysis:
+            return []
+        return [chess.Move.from_uci(line["move"]) for line in analysis.get("lines", [])[1:]]
+
+    def get_move_quality(self):
+        """Centipawn loss / accuracy of the replayed move, or None if not analysed."""
+        if self.replay_index <= 0 or self.replay_index > len(self.move_history):
+            return None
+        ply = self.replay_index - 1
+        if ply >= len(self.analysis_history):
+            return None
+        after = self.analysis_history[ply + 1] if ply + 1 < len(self.analysis_history) else None
+        mover = chess.Board(self.initial_fen).turn ^ (ply % 2 == 1)
+        return move_quality(self.move_history[ply], self.analysis_history[ply], after, mover)
+
     def get_board(self):
         return self.get_replay_board() if self.replay_mode else self.board.board
 
@@ -168,8 +377,25 @@ class GameController:
                 return "Draw by insufficient material!"
             else:
                 return "Game over!"
+        if self.flagged is not None:
+            return self._time_result_text()
         return self.board.get_result() if self.game_over else None
 
+    def _time_result_text(self):
+        loser = "White" if self.flagged == chess.WHITE else "Black"
+        if self.get_result() == "1/2-1/2":
+            return f"{loser} ran out of time - draw (insufficient material)!"
+        winner = "Black" if self.flagged == chess.WHITE else "White"
+        return f"{loser} ran out of time! {winner} wins!"
+
+    def get_result(self):
+        """PGN result string, including losses on time."""
+        if self.flagged is not None:
+            if self.board.board.has_insufficient_material(not self.flagged):
+                return "1/2-1/2"
+            return "0-1" if self.flagged == chess.WHITE else "1-0"
+        return self.board.board.result()
+
     def get_fen(self):
         return self.get_replay_board().fen() if self.replay_mode else self.board.get_fen()
 
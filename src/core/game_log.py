@@ -0,0 +1,390 @@
+# src/core/game_log.py
+import os
+import struct
+import time
+from collections import namedtuple
+
+import chess
+
+from src.config.settings import SAVE_PATH, GAME_LOG_FSYNC_RECORDS, GAME_LOG_FSYNC_INTERVAL
+
+# Log file: header followed by tag-prefixed records (fixed size except 'L').
+#   header : magic, version, player flags, white/black difficulty, created, fen length, fen,
+#            then (v3+) time control: base seconds (f64, 0 when untimed), increment seconds (f64)
+#   'M'    : packed move (u16)
+#   'A'    : score kind (u8), score value (i32), packed best move (u16), depth (u8, v2+)
+#   'L'    : MultiPV lines of the preceding 'A' record: count (u8), then
+#            count x (score kind u8, score value i32, packed move u16)
+#   'R'    : ply (u16); the next 'A' (+'L') replaces that ply's analysis
+#   'U'    : undo (no payload)
+# A torn record at the tail (crash mid-write) is dropped on read.
+LOG_MAGIC = b"CHLG"
+LOG_VERSION = 3
+LOG_HEADER = struct.Struct("<4sBBBBdH")
+TIME_CONTROL = struct.Struct("<dd")
+MOVE_RECORD = struct.Struct("<cH")
+ANALYSIS_RECORD_V1 = struct.Struct("<cBiH")
+ANALYSIS_RECORD = struct.Struct("<cBiHB")
+LINES_RECORD = struct.Struct("<cB")
+LINE_ENTRY = struct.Struct("<BiH")
+REPLACE_RECORD = struct.Struct("<cH")
+UNDO_RECORD = struct.Struct("<c")
+ANALYSIS_RECORDS = {1: ANALYSIS_RECORD_V1, 2: ANALYSIS_RECORD, 3: ANALYSIS_RECORD}
+
+# Library index: header, then one fixed-size slot per game (slot number == game id)
+INDEX_MAGIC = b"CHIX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sB")
+INDEX_SLOT = struct.Struct("<ddHBBBBB5x")
+
+NO_MOVE = 0xFFFF
+SCORE_KINDS = {None: 0, "cp": 1, "mate": 2}
+SCORE_NAMES = {v: k for k, v in SCORE_KINDS.items()}
+RESULT_CODES = {"*": 0, "1-0": 1, "0-1": 2, "1/2-1/2": 3}
+RESULT_NAMES = {v: k for k, v in RESULT_CODES.items()}
+
+FLAG_WHITE_HUMAN = 1
+FLAG_BLACK_HUMAN = 2
+
+GameEntry = namedtuple(
+    "GameEntry",
+    "game_id created updated plies white_is_human black_is_human white_difficulty black_difficulty result"
+)
+
+
+def pack_move(move):
+    """Pack a move into 15 bits: from (6) | to (6) | promotion (3)."""
+    if move is None:
+        return NO_MOVE
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def unpack_move(value):
+    if value == NO_MOVE:
+        return None
+    promotion = (value >> 12) & 0x7
+    return chess.Move(value & 0x3F, (value >> 6) & 0x3F, promotion=promotion or None)
+
+
+def _log_header(flags, white_difficulty, black_difficulty, created, fen, time_control):
+    """Header bytes of a current-version log; `time_control` is (base_s, increment_s) or None."""
+    fen = fen.encode()
+    base_s, increment_s = time_control or (0.0, 0.0)
+    return (LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, flags, white_difficulty, black_difficulty, created, len(fen)) +
+            fen + TIME_CONTROL.pack(base_s, increment_s))
+
+
+def _player_flags(controller):
+    flags = 0
+    if controller.white_player.is_human:
+        flags |= FLAG_WHITE_HUMAN
+    if controller.black_player.is_human:
+        flags |= FLAG_BLACK_HUMAN
+    return flags
+
+
+class GameLog:
+    """Append-only writer for one game; attach it to a GameController as a listener."""
+
+    def __init__(self, path, library=None, game_id=None):
+        self.path = path
+        self.library = library
+        self.game_id = game_id
+        self.file = open(path, "ab")
+        self.plies = 0
+        self.result = "*"
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, path, controller, library=None, game_id=None):
+        clock = controller.clock
+        header = _log_header(
+            _player_flags(controller), controller.white_player.difficulty_level,
+            controller.black_player.difficulty_level, time.time(), controller.initial_fen,
+            (clock.base_s, clock.increment_s) if clock else None
+        )
+        with open(path, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        return cls(path, library, game_id)
+
+    def on_move(self, move):
+        self.plies += 1
+        self._append(MOVE_RECORD.pack(b"M", pack_move(move)))
+
+    def on_analysis(self, result):
+        self._append(self._analysis_record(result))
+
+    def on_analysis_update(self, ply, result):
+        self._append(REPLACE_RECORD.pack(b"R", ply) + self._analysis_record(result))
+
+    @staticmethod
+    def _analysis_record(result):
+        if result is None:
+            return ANALYSIS_RECORD.pack(b"A", 0, 0, NO_MOVE, 0)
+        best = chess.Move.from_uci(result["best_move"]) if result.get("best_move") else None
+        record = ANALYSIS_RECORD.pack(
+            b"A", SCORE_KINDS.get(result.get("type"), 0), int(result.get("value") or 0), pack_move(best),
+            min(255, result.get("depth", 0))
+        )
+        lines = result.get("lines")
+        if lines is not None:
+            record += LINES_RECORD.pack(b"L", len(lines)) + b"".join(
+                LINE_ENTRY.pack(
+                    SCORE_KINDS.get(line["type"], 0), int(line["value"]), pack_move(chess.Move.from_uci(line["move"]))
+                )
+                for line in lines
+            )
+        return record
+
+    def on_undo(self):
+        self.plies = max(0, self.plies - 1)
+        self._append(UNDO_RECORD.pack(b"U"))
+
+    def set_result(self, result):
+        if result != self.result:
+            self.result = result
+            self.sync()
+
+    def _append(self, record):
+        self.file.write(record)
+        # Hand every record to the OS right away (survives an app crash);
+        # the expensive fsync (survives power loss) is batched
+        self.file.flush()
+        self._unsynced += 1
+        if (self._unsynced >= GAME_LOG_FSYNC_RECORDS or
+                time.monotonic() - self._last_sync >= GAME_LOG_FSYNC_INTERVAL):
+            self.sync()
+
+    def sync(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        if self.library is not None and self.game_id is not None:
+            self.library.update_entry(self.game_id, self.plies, self.result)
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+
+def read_game_log(path):
+    """Parse a log file. Returns (header dict, move_history, analysis_history, valid_length)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, flags, white_diff, black_diff, created, fen_len = LOG_HEADER.unpack_from(data, 0)
+    if magic != LOG_MAGIC or version not in ANALYSIS_RECORDS:
+        raise ValueError(f"Not a game log: {path}")
+    analysis_record = ANALYSIS_RECORDS[version]
+    record_sizes = {
+        b"M": MOVE_RECORD.size, b"A": analysis_record.size,
+        b"R": REPLACE_RECORD.size, b"U": UNDO_RECORD.size
+    }
+    offset = LOG_HEADER.size
+    fen = data[offset:offset + fen_len].decode()
+    offset += fen_len
+    time_control = None
+    if version >= 3:
+        base_s, increment_s = TIME_CONTROL.unpack_from(data, offset)
+        offset += TIME_CONTROL.size
+        if base_s > 0:
+            time_control = [base_s, increment_s]
+    header = {
+        "initial_fen": fen,
+        "white_is_human": bool(flags & FLAG_WHITE_HUMAN),
+        "black_is_human": bool(flags & FLAG_BLACK_HUMAN),
+        "white_difficulty": white_diff,
+        "black_difficulty": black_diff,
+        "created": created,
+        "time_control": time_control,
+        "version": version,
+    }
+
+    moves, analyses = [], []
+    replace_ply = None
+    last_analysis = None
+    end = len(data)
+    while offset < end:
+        tag = data[offset:offset + 1]
+        if tag == b"L" and offset + LINES_RECORD.size <= end:
+            size = LINES_RECORD.size + data[offset + 1] * LINE_ENTRY.size
+        else:
+            size = record_sizes.get(tag)
+        if size is None or offset + size > end:
+            break  # torn or corrupt tail
+        if tag == b"M":
+            _, packed = MOVE_RECORD.unpack_from(data, offset)
+            moves.append(unpack_move(packed))
+        elif tag == b"A":
+            fields = analysis_record.unpack_from(data, offset)
+            kind, value, packed = fields[1:4]
+            if kind == 0:
+                last_analysis = None
+            else:
+                best = unpack_move(packed)
+                last_analysis = {
+                    "type": SCORE_NAMES[kind],
+                    "value": value,
+                    "best_move": best.uci() if best else None
+                }
+                if len(fields) > 4:
+                    last_analysis["depth"] = fields[4]
+            if replace_ply is None:
+                analyses.append(last_analysis)
+            elif replace_ply < len(analyses):
+                analyses[replace_ply] = last_analysis
+            replace_ply = None
+        elif tag == b"L":
+            lines = []
+            for kind, value, packed in LINE_ENTRY.iter_unpack(data[offset + LINES_RECORD.size:offset + size]):
+                lines.append({"move": unpack_move(packed).uci(), "type": SCORE_NAMES[kind], "value": value})
+            if last_analysis is not None:
+                last_analysis["lines"] = lines
+        elif tag == b"R":
+            _, replace_ply = REPLACE_RECORD.unpack_from(data, offset)
+        else:
+            # Mirrors GameController.undo_last_move
+            if moves:
+                moves.pop()
+            if analyses:
+                analyses.pop()
+        offset += size
+    return header, moves, analyses, offset
+
+
+def _rewrite_log(path, header, moves, analyses):
+    """Replace a log with a current-version log of the same game (undone moves are not kept)."""
+    flags = ((FLAG_WHITE_HUMAN if header["white_is_human"] else 0) |
+             (FLAG_BLACK_HUMAN if header["black_is_human"] else 0))
+    records = [_log_header(flags, header["white_difficulty"], header["black_difficulty"], header["created"],
+                           header["initial_fen"], header["time_control"])]
+    # Moves and analyses are separate sequences in a log, so their order only has to hold within each
+    for ply in range(max(len(moves), len(analyses))):
+        if ply < len(analyses):
+            records.append(GameLog._analysis_record(analyses[ply]))
+        if ply < len(moves):
+            records.append(MOVE_RECORD.pack(b"M", pack_move(moves[ply])))
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(b"".join(records))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class GameLibrary:
+    """Directory of game logs plus a fixed-slot index for instant listing."""
+
+    def __init__(self, root=SAVE_PATH):
+        self.root = root
+        self.index_path = os.path.join(root, "library.idx")
+        os.makedirs(root, exist_ok=True)
+        if not os.path.exists(self.index_path):
+            with open(self.index_path, "wb") as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION))
+
+    def log_path(self, game_id):
+        return os.path.join(self.root, f"{game_id:06d}.log")
+
+    def _slot_offset(self, game_id):
+        return INDEX_HEADER.size + game_id * INDEX_SLOT.size
+
+    def _write_slot(self, game_id, created, plies, flags, white_diff, black_diff, result):
+        slot = INDEX_SLOT.pack(
+            created, time.time(), plies, flags, white_diff, black_diff, RESULT_CODES.get(result, 0), 1
+        )
+        with open(self.index_path, "r+b") as f:
+            f.seek(self._slot_offset(game_id))
+            f.write(slot)
+
+    def list_games(self):
+        """All saved games, newest first. Reads only the index file."""
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+        entries = []
+        body = data[INDEX_HEADER.size:]
+        usable = len(body) - len(body) % INDEX_SLOT.size
+        for game_id, slot in enumerate(INDEX_SLOT.iter_unpack(body[:usable])):
+            created, updated, plies, flags, white_diff, black_diff, result, used = slot
+            if not used:
+                continue
+            entries.append(GameEntry(
+                game_id, created, updated, plies,
+                bool(flags & FLAG_WHITE_HUMAN), bool(flags & FLAG_BLACK_HUMAN),
+                white_diff, black_diff, RESULT_NAMES.get(result, "*")
+            ))
+        entries.reverse()
+        return entries
+
+    def get_entry(self, game_id):
+        """The index entry of one saved game, or None."""
+        with open(self.index_path, "rb") as f:
+            f.seek(self._slot_offset(game_id))
+            slot = f.read(INDEX_SLOT.size)
+        if len(slot) < INDEX_SLOT.size:
+            return None
+        created, updated, plies, flags, white_diff, black_diff, result, used = INDEX_SLOT.unpack(slot)
+        if not used:
+            return None
+        return GameEntry(
+            game_id, created, updated, plies,
+            bool(flags & FLAG_WHITE_HUMAN), bool(flags & FLAG_BLACK_HUMAN),
+            white_diff, black_diff, RESULT_NAMES.get(result, "*")
+        )
+
+    def create_game(self, controller):
+        """Allocate a new game id, write the log header and attach the log."""
+        size = os.path.getsize(self.index_path) - INDEX_HEADER.size
+        game_id = (size + INDEX_SLOT.size - 1) // INDEX_SLOT.size
+        log = GameLog.create(self.log_path(game_id), controller, self, game_id)
+        self._write_slot(
+            game_id, time.time(), 0, _player_flags(controller),
+            controller.white_player.difficulty_level, controller.black_player.difficulty_level, "*"
+        )
+        controller.add_listener(log)
+        return log
+
+    def update_entry(self, game_id, plies, result):
+        with open(self.index_path, "r+b") as f:
+            f.seek(self._slot_offset(game_id))
+            slot = f.read(INDEX_SLOT.size)
+            if len(slot) < INDEX_SLOT.size:
+                return
+            created, _, _, flags, white_diff, black_diff, _, used = INDEX_SLOT.unpack(slot)
+            f.seek(self._slot_offset(game_id))
+            f.write(INDEX_SLOT.pack(
+                created, time.time(), plies, flags, white_diff, black_diff, RESULT_CODES.get(result, 0), used
+            ))
+
+    def load_game(self, game_id):
+        """Read a saved game: (header, move_history, analysis_history)."""
+        header, moves, analyses, _ = read_game_log(self.log_path(game_id))
+        return header, moves, analyses
+
+    def resume_game(self, game_id, controller_factory):
+        """Rebuild a controller from its log and keep appending to the same log.
+
+        `controller_factory(header)` builds an empty GameController for the
+        saved players; history is restored without any engine work.
+        """
+        path = self.log_path(game_id)
+        header, moves, analyses, valid_length = read_game_log(path)
+        if header["version"] != LOG_VERSION:
+            # New records are written in the current format: convert the whole log first
+            _rewrite_log(path, header, moves, analyses)
+        elif valid_length < os.path.getsize(path):
+            # Drop a torn tail so new records start on a record boundary
+            with open(path, "r+b") as f:
+                f.truncate(valid_length)
+        controller = controller_factory(header)
+        controller.load_history(moves, analyses)
+        log = GameLog(path, self, game_id)
+        log.plies = len(moves)
+        controller.add_listener(log)
+        return controller, log
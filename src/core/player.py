@@ -4,23 +4,50 @@ import chess
 
 # src/core/player.py
 import random
+import threading
+import time
 import chess
 from src.core.stockfish_player import StockfishPlayer
 
 class Player:
-    def __init__(self, color, is_human=True, difficulty_level=1):
+    def __init__(self, color, is_human=True, difficulty_level=1, engine_options=None):
         self.color = color
         self.is_human = is_human
         self.difficulty_level = difficulty_level
         self.ai_engine = None
+        self._stopped = threading.Event()
         if not is_human:
-            self.ai_engine = StockfishPlayer(difficulty_level=difficulty_level)
+            self.ai_engine = StockfishPlayer(difficulty_level=difficulty_level, engine_options=engine_options)
 
-    def get_move(self, board: chess.Board):
-        """Get move from AI engine."""
+    def get_move(self, board: chess.Board, think_time=None):
+        """Get move from AI engine.
+
+        With a `think_time` (seconds, from the clock's time manager) the move
+        is not returned before that time has passed, like a human opponent.
+        """
         if self.is_human:
             return None
+        started = time.monotonic()
         if self.ai_engine:
-            return self.ai_engine.get_move(board)
+            move = self.ai_engine.get_move(board, think_time)
         else:
-            return random.choice(list(board.legal_moves)) if board.legal_moves else None
\ No newline at end of file
+            move = random.choice(list(board.legal_moves)) if board.legal_moves else None
+        if think_time is not None:
+            self._stopped.wait(max(0.0, think_time - (time.monotonic() - started)))
+        return move
+
+    def stop(self):
+        """Make a get_move in progress return early (the game is closing)."""
+        self._stopped.set()
+        if self.ai_engine is not None:
+            self.ai_engine.stop()
+
+    def close(self):
+        if self.ai_engine is not None:
+            self.ai_engine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
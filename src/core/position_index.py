@@ -0,0 +1,290 @@
+# src/core/position_index.py
+import os
+import sqlite3
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from src.config.settings import POSITION_INDEX_PATH
+
+# postings       : one row per (position, game, ply); the covering index on
+#                  (key, game_id, ply) answers lookups without touching the table
+# position_stats : per-position game counts by result, one primary-key probe
+#                  per lookup no matter how many games reached the position
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    source_ref TEXT NOT NULL UNIQUE,
+    white TEXT,
+    black TEXT,
+    result TEXT NOT NULL,
+    plies INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    key INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    ply INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS position_stats (
+    key INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL,
+    white_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    black_wins INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+POSTINGS_INDEX = "CREATE INDEX IF NOT EXISTS postings_key ON postings (key, game_id, ply)"
+
+BULK_BATCH_SIZE = 50000
+
+
+_HASHER = chess.polyglot.ZobristHasher(chess.polyglot.POLYGLOT_RANDOM_ARRAY)
+
+
+def _signed(key):
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+def position_key(board):
+    """Polyglot Zobrist hash folded into SQLite's signed 64-bit INTEGER range."""
+    return _signed(chess.polyglot.zobrist_hash(board))
+
+
+def _result_counts(result):
+    return (1 if result == "1-0" else 0, 1 if result == "1/2-1/2" else 0, 1 if result == "0-1" else 0)
+
+
+def _piece_hash(piece, square):
+    return chess.polyglot.POLYGLOT_RANDOM_ARRAY[64 * ((piece.piece_type - 1) * 2 + int(piece.color)) + square]
+
+
+def _game_keys(initial_fen, moves):
+    """Yield (ply, key) for every position of a game, starting position included.
+
+    The piece-placement part of the hash is updated incrementally from the
+    few squares each move touches instead of rehashing all 64 squares.
+    """
+    board = chess.Board(initial_fen)
+    board_hash = _HASHER.hash_board(board)
+    key = board_hash ^ _HASHER.hash_castling(board) ^ _HASHER.hash_ep_square(board) ^ _HASHER.hash_turn(board)
+    yield 0, _signed(key)
+    for ply, move in enumerate(moves, start=1):
+        if board.is_castling(move):
+            back_rank = chess.square_rank(move.from_square) * 8
+            touched = range(back_rank, back_rank + 8)
+        elif board.is_en_passant(move):
+            touched = (move.from_square, move.to_square, board.ep_square + (-8 if board.turn else 8))
+        else:
+            touched = (move.from_square, move.to_square)
+        before = [(square, board.piece_at(square)) for square in touched]
+        board.push(move)
+        for square, piece in before:
+            if piece:
+                board_hash ^= _piece_hash(piece, square)
+            after = board.piece_at(square)
+            if after:
+                board_hash ^= _piece_hash(after, square)
+        key = board_hash ^ _HASHER.hash_castling(board) ^ _HASHER.hash_ep_square(board) ^ _HASHER.hash_turn(board)
+        yield ply, _signed(key)
+
+
+class PositionIndex:
+    """Zobrist-keyed index of every position reached in saved and imported games."""
+
+    def __init__(self, path=POSITION_INDEX_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(POSTINGS_INDEX)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # Lookups
+
+    def lookup(self, board, limit=100):
+        """(game_id, ply) postings for a position, served from the covering index."""
+        rows = self.conn.execute(
+            "SELECT game_id, ply FROM postings WHERE key = ? ORDER BY game_id DESC, ply LIMIT ?",
+            (position_key(board), limit)
+        )
+        return rows.fetchall()
+
+    def stats(self, board):
+        """Game counts for a position: {'games', 'white_wins', 'draws', 'black_wins'}."""
+        row = self.conn.execute(
+            "SELECT games, white_wins, draws, black_wins FROM position_stats WHERE key = ?",
+            (position_key(board),)
+        ).fetchone()
+        if row is None:
+            return {"games": 0, "white_wins": 0, "draws": 0, "black_wins": 0}
+        return dict(zip(("games", "white_wins", "draws", "black_wins"), row))
+
+    def game_info(self, game_id):
+        row = self.conn.execute(
+            "SELECT source, source_ref, white, black, result, plies FROM games WHERE game_id = ?",
+            (game_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("source", "source_ref", "white", "black", "result", "plies"), row))
+
+    # Incremental updates (one game at a time, index stays live)
+
+    def add_game(self, source, source_ref, initial_fen, moves, result, white=None, black=None):
+        """Index one game, replacing any earlier version with the same source_ref."""
+        with self.conn:
+            existing = self.conn.execute(
+                "SELECT game_id, plies, result FROM games WHERE source_ref = ?", (source_ref,)
+            ).fetchone()
+            if existing is not None:
+                if existing[1] == len(moves) and existing[2] == result:
+                    return existing[0]
+                self._remove_game(existing[0], existing[2])
+
+            game_id = self.conn.execute(
+                "INSERT INTO games (source, source_ref, white, black, result, plies) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, source_ref, white, black, result, len(moves))
+            ).lastrowid
+            postings = [(key, game_id, ply) for ply, key in _game_keys(initial_fen, moves)]
+            self.conn.executemany("INSERT INTO postings (key, game_id, ply) VALUES (?, ?, ?)", postings)
+
+            white_wins, draws, black_wins = _result_counts(result)
+            self.conn.executemany(
+                "INSERT INTO position_stats (key, games, white_wins, draws, black_wins) VALUES (?, 1, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET games = games + 1, white_wins = white_wins + excluded.white_wins, "
+                "draws = draws + excluded.draws, black_wins = black_wins + excluded.black_wins",
+                [(key, white_wins, draws, black_wins) for key in {p[0] for p in postings}]
+            )
+        return game_id
+
+    def _remove_game(self, game_id, result):
+        white_wins, draws, black_wins = _result_counts(result)
+        keys = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT key FROM postings WHERE game_id = ?", (game_id,)
+        )]
+        self.conn.executemany(
+            "UPDATE position_stats SET games = games - 1, white_wins = white_wins - ?, "
+            "draws = draws - ?, black_wins = black_wins - ? WHERE key = ?",
+            [(white_wins, draws, black_wins, key) for key in keys]
+        )
+        self.conn.execute("DELETE FROM position_stats WHERE games <= 0")
+        self.conn.execute("DELETE FROM postings WHERE game_id = ?", (game_id,))
+        self.conn.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+
+    def add_saved_game(self, library, game_id):
+        """Index (or re-index) a game from the saved game library under its logged result.
+
+        Games without moves are skipped. Returns the index's game id, or None.
+        """
+        entry = library.get_entry(game_id)
+        if entry is None or not entry.plies:
+            return None
+        header, moves, _ = library.load_game(game_id)
+        if not moves:
+            return None
+        return self.add_game("saved", f"saved:{game_id}", header["initial_fen"], moves, entry.result)
+
+    # Bulk loading
+
+    def bulk_loader(self):
+        return BulkLoader(self)
+
+
+class BulkLoader:
+    """Streaming loader for large imports.
+
+    Drops the postings index, appends postings in large batches with
+    synchronous writes off, then rebuilds the covering index and the
+    per-position stats in one sorted pass each. Use as a context manager.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.conn = index.conn
+        self.known_refs = None
+        self.pending = []
+        self.games_added = 0
+
+    def __enter__(self):
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        self.conn.execute("DROP INDEX IF EXISTS postings_key")
+        self.known_refs = {row[0] for row in self.conn.execute("SELECT source_ref FROM games")}
+        self.conn.execute("BEGIN")
+        return self
+
+    def add_game(self, source, source_ref, initial_fen, moves, result, white=None, black=None):
+        """Queue one game; returns False if it was already indexed."""
+        if source_ref in self.known_refs:
+            return False
+        self.known_refs.add(source_ref)
+        game_id = self.conn.execute(
+            "INSERT INTO games (source, source_ref, white, black, result, plies) VALUES (?, ?, ?, ?, ?, ?)",
+            (source, source_ref, white, black, result, len(moves))
+        ).lastrowid
+        self.pending.extend((key, game_id, ply) for ply, key in _game_keys(initial_fen, moves))
+        if len(self.pending) >= BULK_BATCH_SIZE:
+            self._flush()
+        self.games_added += 1
+        return True
+
+    def add_pgn_file(self, path):
+        """Stream every game of a PGN file into the index. Returns games added."""
+        added = 0
+        with open(path, encoding="utf-8", errors="replace") as f:
+            while True:
+                offset = f.tell()
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                headers = game.headers
+                if self.add_game(
+                    "pgn", f"{os.path.abspath(path)}:{offset}", game.board().fen(),
+                    list(game.mainline_moves()), headers.get("Result", "*"),
+                    headers.get("White"), headers.get("Black")
+                ):
+                    added += 1
+        return added
+
+    def add_saved_games(self, library):
+        """Index every game of the saved game library not indexed yet."""
+        added = 0
+        for entry in library.list_games():
+            if not entry.plies or f"saved:{entry.game_id}" in self.known_refs:
+                continue
+            header, moves, _ = library.load_game(entry.game_id)
+            if moves and self.add_game("saved", f"saved:{entry.game_id}", header["initial_fen"], moves, entry.result):
+                added += 1
+        return added
+
+    def _flush(self):
+        self.conn.executemany("INSERT INTO postings (key, game_id, ply) VALUES (?, ?, ?)", self.pending)
+        self.pending = []
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.conn.rollback()
+            self.conn.execute(POSTINGS_INDEX)
+            return False
+        self._flush()
+        self.conn.execute(POSTINGS_INDEX)
+        # Rebuild stats from scratch: one grouped pass beats millions of upserts
+        self.conn.execute("DELETE FROM position_stats")
+        self.conn.execute("""
+            INSERT INTO position_stats (key, games, white_wins, draws, black_wins)
+            SELECT p.key, COUNT(*),
+                   SUM(g.result = '1-0'), SUM(g.result = '1/2-1/2'), SUM(g.result = '0-1')
+            FROM (SELECT DISTINCT key, game_id FROM postings) AS p
+            JOIN games AS g ON g.game_id = p.game_id
+            GROUP BY p.key
+        """)
+        self.conn.commit()
+        self.conn.execute("PRAGMA synchronous = FULL")
+        self.conn.execute("PRAGMA journal_mode = DELETE")
+        return False
@@ -0,0 +1,290 @@
+# src/core/puzzles.py
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import chess
+import chess.pgn
+
+from src.config.settings import (
+    PUZZLE_DB_PATH, PUZZLE_MIN_SWING, PUZZLE_UNIQUE_MARGIN, PUZZLE_MIN_MATERIAL,
+    PUZZLE_MAX_SOLVER_MOVES, PUZZLE_CHECK_DEPTH, PUZZLE_WORKERS, PUZZLE_PAGE_SIZE
+)
+from src.core.analysis import ChessAnalysis
+from src.core.analysis_policy import SearchBudget
+from src.core.engine_options import EngineOptions
+from src.core.position_index import position_key
+from src.core.scoring import analysis_cp, score_to_cp, win_percent
+
+# processed: every candidate position already checked by the engine, kept
+#            or not, so re-running the pipeline only pays for new positions
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    puzzle_id INTEGER PRIMARY KEY,
+    key INTEGER NOT NULL UNIQUE,
+    fen TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    swing INTEGER NOT NULL,
+    source_ref TEXT NOT NULL,
+    ply INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS processed (
+    key INTEGER PRIMARY KEY
+) WITHOUT ROWID;
+"""
+
+MATERIAL = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 300, chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+
+Puzzle = namedtuple("Puzzle", ["puzzle_id", "fen", "solution", "swing", "source_ref", "ply"])
+Candidate = namedtuple("Candidate", ["key", "fen", "swing", "source_ref", "ply"])
+
+
+class EngineFailed(Exception):
+    """The engine gave no result (missing binary, failed search): the candidate is not judged."""
+
+
+class PuzzleStore:
+    """SQLite store of extracted puzzles plus the set of positions already checked."""
+
+    def __init__(self, path=PUZZLE_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0]
+
+    def unprocessed(self, keys):
+        """The subset of position keys not checked yet."""
+        keys = list(keys)
+        if not keys:
+            return set()
+        placeholders = ",".join("?" * len(keys))
+        done = {row[0] for row in self.conn.execute(
+            f"SELECT key FROM processed WHERE key IN ({placeholders})", keys
+        )}
+        return set(keys) - done
+
+    def record(self, candidate, solution):
+        """Mark a candidate processed and store it as a puzzle if it has a solution."""
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO processed (key) VALUES (?)", (candidate.key,))
+            if solution:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO puzzles (key, fen, solution, swing, source_ref, ply) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (candidate.key, candidate.fen, " ".join(m.uci() for m in solution), candidate.swing,
+                     candidate.source_ref, candidate.ply)
+                )
+
+    def page(self, after_id=0, limit=PUZZLE_PAGE_SIZE):
+        rows = self.conn.execute(
+            "SELECT puzzle_id, fen, solution, swing, source_ref, ply FROM puzzles "
+            "WHERE puzzle_id > ? ORDER BY puzzle_id LIMIT ?",
+            (after_id, limit)
+        )
+        return [
+            Puzzle(pid, fen, [chess.Move.from_uci(m) for m in solution.split()], swing, ref, ply)
+            for pid, fen, solution, swing, ref, ply in rows
+        ]
+
+    def iter_puzzles(self, page_size=PUZZLE_PAGE_SIZE):
+        """All puzzles in id order, fetched one page at a time as they are consumed."""
+        after_id = 0
+        while True:
+            page = self.page(after_id, page_size)
+            if not page:
+                return
+            yield from page
+            after_id = page[-1].puzzle_id
+
+
+# Game sources: (source_ref, initial_fen, moves, analyses) where analyses[i]
+# is the evaluation of the position after i moves (None if unknown)
+
+def iter_saved_games(library):
+    for entry in library.list_games():
+        header, moves, analyses = library.load_game(entry.game_id)
+        if not len(moves) <= len(analyses) <= len(moves) + 1:
+            continue  # analysis was off for part of the game: plies can't be matched up
+        yield f"saved:{entry.game_id}", header["initial_fen"], moves, analyses
+
+
+def iter_pgn_games(path):
+    """Games of a PGN file that carry engine evals ([%eval ...] comments)."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            offset = f.tell()
+            game = chess.pgn.read_game(f)
+            if game is None:
+                return
+            moves, analyses = [], [None]
+            for node in game.mainline():
+                moves.append(node.move)
+                score = node.eval()
+                if score is None:
+                    analyses.append(None)
+                else:
+                    white = score.white()
+                    analyses.append({"type": "mate", "value": white.mate()} if white.is_mate()
+                                    else {"type": "cp", "value": white.score()})
+            if any(analyses):
+                yield f"{os.path.abspath(path)}:{offset}", game.board().fen(), moves, analyses
+
+
+def find_candidates(source_ref, initial_fen, moves, analyses, min_swing=PUZZLE_MIN_SWING):
+    """Positions right after a move that dropped the mover's winning chances by min_swing."""
+    board = chess.Board(initial_fen)
+    for ply, move in enumerate(moves):
+        mover = board.turn
+        board.push(move)
+        if ply + 1 >= len(analyses):
+            break
+        before, after = analysis_cp(analyses[ply], mover), analysis_cp(analyses[ply + 1], board.turn)
+        if before is None or after is None or board.is_game_over():
+            continue
+        sign = 1 if mover == chess.WHITE else -1
+        swing = win_percent(sign * before) - win_percent(sign * after)
+        if swing >= min_swing:
+            yield Candidate(position_key(board), board.fen(), int(swing), source_ref, ply + 1)
+
+
+def _material(board, color):
+    return sum(MATERIAL[p.piece_type] * (1 if p.color == color else -1) for p in board.piece_map().values())
+
+
+def _solver_cp(line, solver):
+    cp = score_to_cp(line["type"], line["value"], not solver)
+    return cp if solver == chess.WHITE else -cp
+
+
+def _unique(best, second, solver):
+    """Whether the best line is clearly the only good move: the only mate, or well ahead in win%."""
+    best_cp, second_cp = _solver_cp(best, solver), _solver_cp(second, solver)
+    if best["type"] == "mate" and best_cp > 0:
+        return not (second["type"] == "mate" and second_cp > 0)
+    return win_percent(best_cp) - win_percent(second_cp) >= PUZZLE_UNIQUE_MARGIN
+
+
+def solve(analysis, fen, budget):
+    """Engine-verified solution line for a candidate, or None when it has no unique solution.
+
+    Every solver move must be the only good one (the only mate, or
+    PUZZLE_UNIQUE_MARGIN win% ahead of the second MultiPV line); the line ends in mate or once the solver is
+    PUZZLE_MIN_MATERIAL up after the opponent's best reply (which is not
+    part of the puzzle). Raises EngineFailed when a search returns nothing.
+    """
+    board = chess.Board(fen)
+    solver = board.turn
+    start_material = _material(board, solver)
+    solution = []
+    for _ in range(PUZZLE_MAX_SOLVER_MOVES):
+        result = analysis.analyze_position(board.fen(), budget)
+        if result is None:
+            raise EngineFailed(board.fen())
+        if not result.get("lines"):
+            return None
+        lines = result["lines"]
+        if len(lines) > 1 and not _unique(lines[0], lines[1], solver):
+            return None
+        move = chess.Move.from_uci(lines[0]["move"])
+        board.push(move)
+        solution.append(move)
+        if board.is_checkmate():
+            return solution
+        if board.is_game_over():
+            return None
+
+        reply = analysis.analyze_position(board.fen(), budget)
+        if reply is None:
+            raise EngineFailed(board.fen())
+        if not reply.get("best_move"):
+            return None
+        board.push(chess.Move.from_uci(reply["best_move"]))
+        if _material(board, solver) - start_material >= PUZZLE_MIN_MATERIAL:
+            return solution
+        solution.append(board.peek())
+    return None
+
+
+class PuzzlePipeline:
+    """Streams games through candidate detection and parallel engine checks.
+
+    Candidate detection is pure Python on the stored analysis; only
+    positions not in the store's processed set reach the engines, each
+    worker thread driving its own MultiPV 2 engine. Results are written
+    from the calling thread.
+    """
+
+    def __init__(self, store, workers=PUZZLE_WORKERS, depth=PUZZLE_CHECK_DEPTH, analysis_factory=None):
+        self.store = store
+        self.workers = max(1, workers)
+        self.budget = SearchBudget(depth=depth)
+        self.analysis_factory = analysis_factory or (
+            lambda: ChessAnalysis(options=EngineOptions(threads=1, hash_mb=64, multipv=2))
+        )
+        self.stats = {"games": 0, "candidates": 0, "skipped": 0, "checked": 0, "failed": 0, "puzzles": 0}
+        self._local = threading.local()
+        self._engines = []
+        self._engines_lock = threading.Lock()
+
+    def _engine(self):
+        analysis = getattr(self._local, "analysis", None)
+        if analysis is None:
+            analysis = self.analysis_factory()
+            analysis.enabled = analysis.stockfish is not None
+            self._local.analysis = analysis
+            with self._engines_lock:
+                self._engines.append(analysis)
+        return analysis
+
+    def _check(self, candidate):
+        """(candidate, solution, judged); an engine failure is not a verdict and is retried on the next run."""
+        try:
+            return candidate, solve(self._engine(), candidate.fen, self.budget), True
+        except EngineFailed:
+            return candidate, None, False
+
+    def _collect(self, futures):
+        for future in futures:
+            candidate, solution, judged = future.result()
+            if not judged:
+                self.stats["failed"] += 1
+                continue
+            self.store.record(candidate, solution)
+            self.stats["checked"] += 1
+            self.stats["puzzles"] += bool(solution)
+
+    def run(self, games):
+        """Process an iterable of games (see iter_saved_games/iter_pgn_games); returns stats."""
+        seen = set()
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for game in games:
+                self.stats["games"] += 1
+                candidates = [c for c in find_candidates(*game) if c.key not in seen]
+                self.stats["candidates"] += len(candidates)
+                fresh = self.store.unprocessed(c.key for c in candidates)
+                for candidate in candidates:
+                    seen.add(candidate.key)
+                    if candidate.key not in fresh:
+                        self.stats["skipped"] += 1
+                        continue
+                    pending.add(pool.submit(self._check, candidate))
+                    # Bounded in-flight work keeps memory flat on huge inputs
+                    if len(pending) >= 2 * self.workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._collect(done)
+            self._collect(pending)
+        for analysis in self._engines:
+            analysis.close()
+        self._engines.clear()
+        self._local = threading.local()
+        return self.stats
@@ -0,0 +1,70 @@
+# src/core/scoring.py
+import math
+
+import chess
+
+MATE_SCORE = 10000   # centipawn stand-in for a forced mate
+CP_CLAMP = 1000      # evaluations beyond +-10 pawns are treated as decided
+
+
+def score_to_cp(score_type, value, turn):
+    """Engine score (White's view) as centipawns; mates map to +-MATE_SCORE.
+
+    `turn` is the side to move in the scored position: mate 0 means it is checkmated.
+    """
+    if score_type == "mate":
+        if value == 0:
+            return -MATE_SCORE if turn == chess.WHITE else MATE_SCORE
+        return MATE_SCORE - abs(value) if value > 0 else -MATE_SCORE + abs(value)
+    return value
+
+
+def analysis_cp(analysis, turn):
+    """Centipawn score (White's view) of an analysis result for a position with `turn` to move, or None."""
+    if not analysis or analysis.get("type") is None:
+        return None
+    return score_to_cp(analysis["type"], analysis["value"], turn)
+
+
+def win_percent(cp):
+    """Expected score (0-100) for a centipawn advantage, as used by lichess accuracy."""
+    cp = max(-CP_CLAMP, min(CP_CLAMP, cp))
+    return 50 + 50 * (2 / (1 + math.exp(-0.00368208 * cp)) - 1)
+
+
+def move_accuracy(cp_before, cp_after):
+    """Accuracy (0-100) of a move from the mover's centipawns before and after."""
+    drop = win_percent(cp_before) - win_percent(cp_after)
+    return max(0.0, min(100.0, 103.1668 * math.exp(-0.04354 * drop) - 3.1669))
+
+
+def move_quality(played_move, before, after, mover):
+    """Centipawn loss and accuracy of `played_move`.
+
+    `before` is the analysis of the position the move was played from,
+    `after` the analysis of the resulting position (may be None). If the
+    played move is one of the MultiPV lines of `before`, its score comes
+    from that same search; otherwise `after` is used.
+    Returns {"cpl", "accuracy"} or None when there is not enough data.
+    """
+    best_cp = analysis_cp(before, mover)
+    if best_cp is None:
+        return None
+
+    played_cp = None
+    for line in before.get("lines") or []:
+        if line["move"] == played_move.uci():
+            played_cp = score_to_cp(line["type"], line["value"], not mover)
+            break
+    if played_cp is None:
+        played_cp = analysis_cp(after, not mover)
+    if played_cp is None:
+        return None
+
+    sign = 1 if mover == chess.WHITE else -1
+    best_cp, played_cp = sign * best_cp, sign * played_cp
+    clamp = lambda cp: max(-CP_CLAMP, min(CP_CLAMP, cp))
+    return {
+        "cpl": max(0, clamp(best_cp) - clamp(played_cp)),
+        "accuracy": move_accuracy(best_cp, played_cp)
+    }
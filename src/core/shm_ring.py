@@ -0,0 +1,120 @@
+# src/core/shm_ring.py
+import struct
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+from src.config.settings import SHM_RING_CAPACITY, SHM_RING_PV_MOVES
+
+# Layout: header <QIHxx (records published, slot count, PV moves per slot),
+# then fixed-size slots: <Q sequence, then the record <qBBBBi position key,
+# depth, score kind, line, PV length, score, then PV_MOVES x <H packed moves.
+# A slot's sequence is odd while it is written and 2 * (n + 1) once record
+# n is in it, so readers detect records torn or overwritten under them.
+HEADER = struct.Struct("<QIHxx")
+SEQUENCE = struct.Struct("<Q")
+PUBLISHED = struct.Struct("<Q")
+
+Record = namedtuple("Record", "key depth kind line value pv")
+
+
+class ShmRing:
+    """Fixed-layout ring of analysis records in shared memory.
+
+    One process writes (publish), any number read (RingReader). Writers
+    never wait: a reader that falls a full ring behind loses the oldest
+    records, which suits results where only the newest one matters.
+    """
+
+    def __init__(self, capacity=SHM_RING_CAPACITY, pv_moves=SHM_RING_PV_MOVES, name=None):
+        if name is None:
+            self.record = struct.Struct(f"<qBBBBi{pv_moves}H")
+            self.slot_size = SEQUENCE.size + self.record.size
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER.size + capacity * self.slot_size)
+            HEADER.pack_into(self.shm.buf, 0, 0, capacity, pv_moves)
+        else:
+            self.shm = _attach(name)
+            _, capacity, pv_moves = HEADER.unpack_from(self.shm.buf, 0)
+            self.record = struct.Struct(f"<qBBBBi{pv_moves}H")
+            self.slot_size = SEQUENCE.size + self.record.size
+        self.name = self.shm.name
+        self.capacity = capacity
+        self.pv_moves = pv_moves
+        self.buf = self.shm.buf
+        self._count = self.published
+
+    @classmethod
+    def attach(cls, name):
+        """The ring created by another process under `name`."""
+        return cls(name=name)
+
+    @property
+    def published(self):
+        """Records published so far."""
+        return PUBLISHED.unpack_from(self.buf, 0)[0]
+
+    def publish(self, key, depth, kind, value, line=1, pv=()):
+        """Write one record; `pv` holds packed moves (game_log.pack_move), cut to the slot's PV_MOVES."""
+        pv = tuple(pv[:self.pv_moves])
+        n = self._count
+        offset = HEADER.size + (n % self.capacity) * self.slot_size
+        SEQUENCE.pack_into(self.buf, offset, 2 * n + 1)
+        self.record.pack_into(self.buf, offset + SEQUENCE.size, key, min(255, depth), kind, line, len(pv), value,
+                              *pv, *([0] * (self.pv_moves - len(pv))))
+        SEQUENCE.pack_into(self.buf, offset, 2 * n + 2)
+        self._count = n + 1
+        PUBLISHED.pack_into(self.buf, 0, self._count)
+
+    def close(self):
+        """Detach from the shared memory (every process does this)."""
+        if self.buf is not None:
+            self.buf = None
+            self.shm.close()
+
+    def unlink(self):
+        """Free the shared memory (the creating process does this, after close)."""
+        self.shm.unlink()
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers the segment with the
+        # resource tracker; processes started by multiprocessing share the
+        # creator's tracker, where it is registered already
+        return shared_memory.SharedMemory(name=name)
+
+
+class RingReader:
+    """Cursor over a ShmRing; records are unpacked straight from the shared buffer."""
+
+    def __init__(self, ring, from_start=False):
+        self.ring = ring
+        self.cursor = 0 if from_start else ring.published
+        self.dropped = 0    # records overwritten before this reader got to them
+
+    def poll(self, limit=None):
+        """Records published since the last poll (at most `limit`), oldest first."""
+        ring = self.ring
+        buf, record, capacity, slot_size = ring.buf, ring.record, ring.capacity, ring.slot_size
+        end = ring.published
+        if end - self.cursor > capacity:
+            self.dropped += end - self.cursor - capacity
+            self.cursor = end - capacity
+        if limit is not None:
+            end = min(end, self.cursor + limit)
+        records = []
+        for n in range(self.cursor, end):
+            offset = HEADER.size + (n % capacity) * slot_size
+            expected = 2 * n + 2
+            if SEQUENCE.unpack_from(buf, offset)[0] != expected:
+                self.dropped += 1
+                continue
+            fields = record.unpack_from(buf, offset + SEQUENCE.size)
+            if SEQUENCE.unpack_from(buf, offset)[0] != expected:
+                self.dropped += 1   # overwritten while being read
+                continue
+            key, depth, kind, line, length, value = fields[:6]
+            records.append(Record(key, depth, kind, line, value, fields[6:6 + length]))
+        self.cursor = end
+        return records
@@ -0,0 +1,122 @@
+# src/core/stockfish_player.py
+import os
+import random
+import threading
+
+import chess
+from stockfish import Stockfish
+
+from src.config.settings import STOCKFISH_PATH
+from src.core.engine_options import EngineOptions
+from src.core.analysis_policy import SearchBudget
+
+
+def close_engine(stockfish, timeout=2.0):
+    """Quit the engine process of a Stockfish wrapper and release its pipes."""
+    process = stockfish._stockfish
+    try:
+        if process.poll() is None:
+            stockfish._put("quit")
+            process.wait(timeout)
+    except Exception:   # dead pipe, or no exit within the timeout
+        process.kill()
+        process.wait()
+    finally:
+        for pipe in (process.stdin, process.stdout, process.stderr):
+            if pipe is not None:
+                pipe.close()
+
+
+class StockfishPlayer:
+    """Stockfish AI whose strength scales smoothly with difficulty (1-20).
+
+    Depth, Elo and Skill Level rise with the level; beginner levels also
+    play a share of random moves (50% at level 1 down to 6% at level 8).
+    """
+
+    MIN_UCI_ELO = 1350   # lowest UCI_Elo Stockfish accepts
+
+    def __init__(self, difficulty_level=1, engine_options=None):
+        self.difficulty_level = max(1, min(20, difficulty_level))
+        self.engine_options = engine_options or EngineOptions()
+        level = self.difficulty_level
+
+        self.depth = level + 1
+        self.skill_level = self.engine_options.skill_level or level
+        if level <= 8:
+            self.elo = 800 + (level - 1) * 600 // 7
+            self.random_move_chance = 0.50 - (level - 1) * (0.44 / 7)
+        elif level <= 16:
+            self.elo = 1400 + (level - 9) * 850 // 7
+            self.random_move_chance = 0.0
+        else:
+            self.elo = None   # full strength, only Skill Level applies
+            self.random_move_chance = 0.0
+
+        self.stockfish = None
+        self._stopped = False
+        self._lock = threading.Lock()   # search setup vs. stop(): both write to the engine
+        if os.path.exists(STOCKFISH_PATH):
+            params = self.engine_options.uci_parameters()
+            params["Skill Level"] = self.skill_level
+            if self.elo is not None and self.elo >= self.MIN_UCI_ELO:
+                params["UCI_LimitStrength"] = "true"
+                params["UCI_Elo"] = self.elo
+            try:
+                self.stockfish = Stockfish(path=STOCKFISH_PATH, depth=self.depth, parameters=params)
+            except Exception as e:
+                print(f"[WARNING] Failed to initialize Stockfish AI: {e}")
+        else:
+            print(f"[WARNING] Stockfish executable not found at: {STOCKFISH_PATH}")
+
+    def get_move(self, board: chess.Board, think_time=None):
+        """Best move at this level; `think_time` (seconds) caps the search on a clock."""
+        legal_moves = list(board.legal_moves)
+        if not legal_moves:
+            return None
+        if self.stockfish is None or random.random() < self.random_move_chance:
+            return random.choice(legal_moves)
+        # The level's depth always applies, so weak levels stay weak given more time
+        if think_time is None:
+            budget = SearchBudget(depth=self.depth)
+        else:
+            budget = SearchBudget(depth=self.depth, movetime=max(1, int(think_time * 1000)))
+        try:
+            with self._lock:
+                if self._stopped:
+                    return None
+                self.stockfish.set_fen_position(board.fen(), send_ucinewgame_token=False)
+                self.stockfish._put(budget.go_command())
+            best = self._read_best_move()
+        except Exception as e:
+            print(f"[ERROR] Stockfish AI failed: {e}")
+            return random.choice(legal_moves)
+        return chess.Move.from_uci(best) if best else None
+
+    def _read_best_move(self):
+        while True:
+            parts = self.stockfish._read_line().split(" ")
+            if parts[0] == "bestmove":
+                return parts[1] if len(parts) > 1 and parts[1] != "(none)" else None
+
+    def stop(self):
+        """End a search in progress at once; later get_move calls return None. Call before close()."""
+        with self._lock:
+            self._stopped = True
+            if self.stockfish is not None:
+                try:
+                    self.stockfish._put("stop")   # ignored by an idle engine
+                except Exception as e:
+                    print(f"[WARNING] Could not stop the Stockfish AI: {e}")
+
+    def close(self):
+        """Stop the engine process; get_move falls back to random moves afterwards."""
+        if self.stockfish is not None:
+            close_engine(self.stockfish)
+            self.stockfish = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
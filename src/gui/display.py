@@ -1,14 +1,16 @@
 # src/gui/display.py
 import pygame
 import chess
-import os
 
 from src.config.settings import (
-    BOARD_SIZE, SQUARE_SIZE, WINDOW_SIZE,
+    BOARD_SIZE, WINDOW_SIZE,
     WHITE, BLACK, LIGHT_SQUARE, DARK_SQUARE, HIGHLIGHT,
-    ASSET_PATH, PIECE_IMAGES, FONT_PATH,
-    COORD_MARGIN, BOARD_WIDTH, BOARD_HEIGHT
+    FONT_PATH, COORD_MARGIN,
+    RESIZABLE_WINDOW, RESIZE_THROTTLE_MS
 )
+from src.gui.eval_graph import EvalGraph
+from src.gui.layout import BoardLayout
+from src.gui.sprite_atlas import SpriteAtlas
 
 
 class Display:
@@ -17,6 +19,7 @@ class Display:
     LEGAL_MOVE_COLOR = (0, 200, 0)
     PLAYED_MOVE_COLOR = (255, 255, 0, 180)
     BEST_MOVE_COLOR = (0, 255, 255, 180)
+    CANDIDATE_ARROW_COLORS = [(0, 150, 255), (140, 100, 255), (200, 90, 220)]
     COORD_BG = (220, 190, 150)
     COORD_TEXT = (0, 0, 0)
     PANEL_BG = WHITE
@@ -25,11 +28,20 @@ class Display:
     CONFIRM_YES_COLOR = (60, 180, 75)
     CONFIRM_NO_COLOR = (200, 60, 60)
     DIALOG_BG = (240, 240, 240)
-
-    def __init__(self, view_color=chess.WHITE):
+    WHITE_ATTACK_COLOR = (40, 120, 255, 200)
+    BLACK_ATTACK_COLOR = (255, 120, 0, 200)
+    HANGING_COLOR = (230, 30, 30)
+    CHECK_COLOR = (255, 0, 0, 110)
+    CLOCK_BG = (225, 225, 225)
+    CLOCK_ACTIVE_BG = (170, 220, 170)
+    CLOCK_LOW_BG = (240, 140, 140)
+
+    def __init__(self, view_color=chess.WHITE, ticks=pygame.time.get_ticks):
         pygame.init()
+        self._ticks = ticks   # ms clock for resize throttling (recorded time in trace replays)
+        flags = pygame.RESIZABLE if RESIZABLE_WINDOW else 0
         try:
-            self.screen = pygame.display.set_mode(WINDOW_SIZE)
+            self.screen = pygame.display.set_mode(WINDOW_SIZE, flags)
         except pygame.error as e:
             print(f"[FATAL] Failed to create display: {e}")
             pygame.quit()
@@ -37,28 +49,44 @@ class Display:
 
         pygame.display.set_caption("Chess App")
         self.view_color = view_color
-        self.piece_images = self.load_piece_images()
+        self.atlas = SpriteAtlas()
         self.font = self.load_font()
         self.coord_font = pygame.font.SysFont("Arial", 16)
 
-        # Pre-create surfaces for highlights (reusable)
-        self.selected_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-        self.selected_surface.fill(self.SELECTED_HIGHLIGHT)
-
-        self.played_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-        self.played_surface.fill(self.PLAYED_MOVE_COLOR)
-
-        self.best_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-        self.best_surface.fill(self.BEST_MOVE_COLOR)
-
         # Cache coordinate labels
         self._cache_coordinate_labels()
 
+        # Resize state: window events only record the size, the rebuild of
+        # size-dependent layers happens at most once per RESIZE_THROTTLE_MS
+        self._pending_size = None
+        self._last_rebuild_ms = 0
+        self.eval_graph = None
+        self._rebuild_layout(self.screen.get_size())
+
         # Button rects (will be set when drawn)
         self.back_button_rect = None
         self.confirm_yes_rect = None
         self.confirm_no_rect = None
 
+    def close(self):
+        """Release the cached layers, sprites and fonts; the window itself is left to the next screen."""
+        self.atlas.clear()
+        self.piece_images = {}
+        self._board_layer = None
+        self._dim_overlays = {}
+        self._threat_layer = None
+        self._threat_layer_key = None
+        self.selected_surface = self.played_surface = self.best_surface = None
+        self.eval_graph = None
+        self.coord_labels = {}
+        self.font = self.coord_font = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def load_font(self):
         try:
             return pygame.font.Font(FONT_PATH, 20)
@@ -66,15 +94,63 @@ class Display:
             return pygame.font.SysFont("Arial", 20)
 
     def load_piece_images(self):
-        images = {}
-        for piece, path in PIECE_IMAGES.items():
-            full_path = os.path.join(ASSET_PATH, path.lstrip('/'))
-            try:
-                img = pygame.image.load(full_path).convert_alpha()
-                images[piece] = pygame.transform.scale(img, (SQUARE_SIZE, SQUARE_SIZE))
-            except Exception as e:
-                print(f"[ERROR] Failed to load {full_path}: {e}")
-        return images
+        """Piece sprites are subsurfaces of the cached atlas for the current square size."""
+        return self.atlas.get_sprites(self.layout.square_size)
+
+    def request_resize(self, size):
+        """Record a new window size; applied by apply_pending_resize()."""
+        if tuple(size) != self.layout.window_size:
+            self._pending_size = tuple(size)
+
+    def apply_pending_resize(self):
+        """Rebuild size-dependent layers if a resize is due. Returns True if rebuilt."""
+        if self._pending_size is None:
+            return False
+        now = self._ticks()
+        if now - self._last_rebuild_ms < RESIZE_THROTTLE_MS:
+            return False
+        size, self._pending_size = self._pending_size, None
+        self._rebuild_layout(size)
+        return True
+
+    def has_pending_resize(self):
+        return self._pending_size is not None
+
+    def _rebuild_layout(self, size):
+        """Recompute the layout and every cached layer that depends on it."""
+        self._last_rebuild_ms = self._ticks()
+        self.screen = pygame.display.get_surface() or self.screen
+        self.layout = BoardLayout(size)
+        self.piece_images = self.load_piece_images()
+        square = self.layout.square_size
+
+        # Pre-create surfaces for highlights (reusable)
+        self.selected_surface = pygame.Surface((square, square), pygame.SRCALPHA)
+        self.selected_surface.fill(self.SELECTED_HIGHLIGHT)
+
+        self.played_surface = pygame.Surface((square, square), pygame.SRCALPHA)
+        self.played_surface.fill(self.PLAYED_MOVE_COLOR)
+
+        self.best_surface = pygame.Surface((square, square), pygame.SRCALPHA)
+        self.best_surface.fill(self.BEST_MOVE_COLOR)
+
+        self._board_layer = self._render_board_layer()
+        self._dim_overlays = {}
+        self._threat_layer = None
+        self._threat_layer_key = None
+
+        if self.eval_graph is None:
+            self.eval_graph = EvalGraph(self.layout.graph_rect)
+        else:
+            self.eval_graph.set_rect(self.layout.graph_rect)
+
+    def set_view_color(self, color):
+        """Change the board orientation (puzzles are shown from the solver's side)."""
+        if color != self.view_color:
+            self.view_color = color
+            self._board_layer = self._render_board_layer()
+            self._threat_layer = None
+            self._threat_layer_key = None
 
     def _cache_coordinate_labels(self):
         """Pre-render coordinate labels for better performance."""
@@ -106,34 +182,56 @@ class Display:
 
     def _get_square_rect(self, col, row):
         """Get screen rectangle for a board square."""
-        return pygame.Rect(
-            COORD_MARGIN + col * SQUARE_SIZE,
-            row * SQUARE_SIZE,
-            SQUARE_SIZE,
-            SQUARE_SIZE
-        )
+        return self.layout.square_rect(col, row)
 
     def _get_square_center(self, col, row):
         """Get center coordinates of a board square."""
-        return (
-            COORD_MARGIN + col * SQUARE_SIZE + SQUARE_SIZE // 2,
-            row * SQUARE_SIZE + SQUARE_SIZE // 2
+        return self.layout.square_center(col, row)
+
+    def _render_board_layer(self):
+        """Render squares, coordinates and border once per layout."""
+        layout = self.layout
+        is_flipped = (self.view_color == chess.BLACK)
+        layer = pygame.Surface(
+            (layout.board_x + layout.board_width, layout.board_y + layout.board_height + COORD_MARGIN)
         )
+        layer.fill((30, 30, 30))
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                # Checkerboard pattern
+                color = LIGHT_SQUARE if (row + col) % 2 == 0 else DARK_SQUARE
+                pygame.draw.rect(layer, color, layout.square_rect(col, row))
+
+        self._draw_coordinates(layer, is_flipped)
 
-    def draw_board(self, board, selected_square, legal_moves, highlight_moves=None):
+        # Board border
+        pygame.draw.rect(layer, (0, 0, 0), layout.board_rect, 2)
+        return layer
+
+    def _get_dim_overlay(self, alpha):
+        """Full-window translucent overlay, cached per layout."""
+        overlay = self._dim_overlays.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface(self.layout.window_size, pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))
+            self._dim_overlays[alpha] = overlay
+        return overlay
+
+    def draw_board(self, board, selected_square, legal_moves, highlight_moves=None, threats=None):
         if highlight_moves is None:
             highlight_moves = []
 
         self.screen.fill((30, 30, 30))
         is_flipped = (self.view_color == chess.BLACK)
+        square_size = self.layout.square_size
 
-        # Draw squares and pieces
+        # Squares, coordinates and border come from the cached board layer
+        self.screen.blit(self._board_layer, (0, 0))
+
+        # Draw pieces
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
-                # Checkerboard pattern
-                color = LIGHT_SQUARE if (row + col) % 2 == 0 else DARK_SQUARE
                 rect = self._get_square_rect(col, row)
-                pygame.draw.rect(self.screen, color, rect)
 
                 # Determine which square this is
                 square = chess.square(col, row if is_flipped else 7 - row)
@@ -147,6 +245,10 @@ class Display:
                     if key in self.piece_images:
                         self.screen.blit(self.piece_images[key], rect.topleft)
 
+        # Attack/threat overlay (cached layer, rebuilt only when the threats change)
+        if threats is not None:
+            self.screen.blit(self._get_threat_layer(threats, is_flipped), (self.layout.board_x, self.layout.board_y))
+
         # Highlight selected square
         if selected_square is not None:
             col, row = self._square_to_screen(selected_square, is_flipped)
@@ -156,13 +258,20 @@ class Display:
         for move in legal_moves:
             col, row = self._square_to_screen(move.to_square, is_flipped)
             center = self._get_square_center(col, row)
-            pygame.draw.circle(self.screen, self.LEGAL_MOVE_COLOR, center, SQUARE_SIZE // 6)
+            pygame.draw.circle(self.screen, self.LEGAL_MOVE_COLOR, center, square_size // 6)
 
-        # Highlight played/best moves (for replay)
+        # Highlight played/best moves (for replay), other engine candidates as arrows
+        candidate_index = 0
         for move_type, move in highlight_moves:
             from_col, from_row = self._square_to_screen(move.from_square, is_flipped)
             to_col, to_row = self._square_to_screen(move.to_square, is_flipped)
 
+            if move_type == "candidate":
+                color = self.CANDIDATE_ARROW_COLORS[candidate_index % len(self.CANDIDATE_ARROW_COLORS)]
+                self._draw_arrow((from_col, from_row), (to_col, to_row), color, max(3, square_size // 14))
+                candidate_index += 1
+                continue
+
             # Highlight FROM square
             surface = self.played_surface if move_type == "played" else self.best_surface
             self.screen.blit(surface, self._get_square_rect(from_col, from_row).topleft)
@@ -170,55 +279,95 @@ class Display:
             # Draw circle on TO square
             center = self._get_square_center(to_col, to_row)
             color = (255, 255, 0) if move_type == "played" else (0, 255, 255)
-            pygame.draw.circle(self.screen, color, center, SQUARE_SIZE // 3, 4)
-
-        # Draw coordinates
-        self._draw_coordinates(is_flipped)
-
-        # Board border
-        pygame.draw.rect(self.screen, (0, 0, 0), (COORD_MARGIN, 0, BOARD_WIDTH, BOARD_HEIGHT), 2)
-
-    def _draw_coordinates(self, is_flipped):
+            pygame.draw.circle(self.screen, color, center, square_size // 3, 4)
+            if move_type == "best":
+                self._draw_arrow((from_col, from_row), (to_col, to_row), color, max(4, square_size // 10))
+
+    def _get_threat_layer(self, threats, is_flipped):
+        key = (threats, self.layout.square_size, is_flipped)
+        if self._threat_layer_key == key:
+            return self._threat_layer
+        size = self.layout.square_size
+        layer = pygame.Surface((self.layout.board_width, self.layout.board_height), pygame.SRCALPHA)
+        dot = max(3, size // 12)
+        for square in chess.SQUARES:
+            col, row = self._square_to_screen(square, is_flipped)
+            x, y = col * size, row * size
+            bit = chess.BB_SQUARES[square]
+            if square == threats.king_square:
+                layer.fill(self.CHECK_COLOR, (x, y, size, size))
+            if threats.attacked[chess.WHITE] & bit:
+                pygame.draw.circle(layer, self.WHITE_ATTACK_COLOR, (x + dot + 2, y + size - dot - 2), dot)
+            if threats.attacked[chess.BLACK] & bit:
+                pygame.draw.circle(layer, self.BLACK_ATTACK_COLOR, (x + size - dot - 2, y + dot + 2), dot)
+            if threats.hanging & bit:
+                pygame.draw.circle(layer, self.HANGING_COLOR, (x + size // 2, y + size // 2), size // 2 - 3, 3)
+            if threats.checkers & bit:
+                pygame.draw.rect(layer, self.HANGING_COLOR, (x + 1, y + 1, size - 2, size - 2), 3)
+        self._threat_layer, self._threat_layer_key = layer, key
+        return layer
+
+    def _draw_arrow(self, from_cell, to_cell, color, width):
+        """Draw an arrow between two screen cells (col, row)."""
+        start = pygame.math.Vector2(self._get_square_center(*from_cell))
+        end = pygame.math.Vector2(self._get_square_center(*to_cell))
+        if start == end:
+            return
+        direction = (end - start).normalize()
+        head_len = self.layout.square_size * 0.35
+        base = end - direction * head_len
+        normal = pygame.math.Vector2(-direction.y, direction.x) * head_len * 0.55
+        pygame.draw.line(self.screen, color, start, base, width)
+        pygame.draw.polygon(self.screen, color, [end, base + normal, base - normal])
+
+    @staticmethod
+    def _format_score(score_type, value):
+        if score_type == "mate":
+            return f"#{value}"
+        return f"{value / 100:+.2f}"
+
+    def _draw_coordinates(self, surface, is_flipped):
         """Draw file and rank labels around the board."""
+        layout = self.layout
         # Files (bottom)
         for col in range(8):
             label_key = f'file_flipped_{col}' if is_flipped else f'file_{col}'
             label = self.coord_labels[label_key]
 
             bg_rect = pygame.Rect(
-                COORD_MARGIN + col * SQUARE_SIZE,
-                BOARD_HEIGHT,
-                SQUARE_SIZE,
+                layout.board_x + col * layout.square_size,
+                layout.board_y + layout.board_height,
+                layout.square_size,
                 COORD_MARGIN
             )
-            pygame.draw.rect(self.screen, self.COORD_BG, bg_rect)
+            pygame.draw.rect(surface, self.COORD_BG, bg_rect)
 
             text_x = bg_rect.centerx - label.get_width() // 2
             text_y = bg_rect.centery - label.get_height() // 2
-            self.screen.blit(label, (text_x, text_y))
+            surface.blit(label, (text_x, text_y))
 
         # Ranks (left side)
         for row in range(8):
             label_key = f'rank_{row}' if is_flipped else f'rank_flipped_{row}'
             label = self.coord_labels[label_key]
 
-            bg_rect = pygame.Rect(0, row * SQUARE_SIZE, COORD_MARGIN, SQUARE_SIZE)
-            pygame.draw.rect(self.screen, self.COORD_BG, bg_rect)
+            bg_rect = pygame.Rect(
+                0, layout.board_y + row * layout.square_size, layout.board_x, layout.square_size
+            )
+            pygame.draw.rect(surface, self.COORD_BG, bg_rect)
 
-            text_x = COORD_MARGIN - label.get_width() - 4
+            text_x = layout.board_x - label.get_width() - 4
             text_y = bg_rect.centery - label.get_height() // 2
-            self.screen.blit(label, (text_x, text_y))
+            surface.blit(label, (text_x, text_y))
 
     def draw_promotion_dialog(self, color_is_white):
         """Draw piece selection dialog for pawn promotion."""
-        dialog_width = SQUARE_SIZE * 4
-        dialog_height = SQUARE_SIZE
-        x = COORD_MARGIN + (BOARD_WIDTH - dialog_width) // 2
-        y = (BOARD_HEIGHT - dialog_height) // 2
+        rect = self.layout.promotion_rect
+        x, y = rect.topleft
 
         # Background
-        pygame.draw.rect(self.screen, (50, 50, 50), (x, y, dialog_width, dialog_height))
-        pygame.draw.rect(self.screen, (200, 200, 200), (x, y, dialog_width, dialog_height), 2)
+        pygame.draw.rect(self.screen, (50, 50, 50), rect)
+        pygame.draw.rect(self.screen, (200, 200, 200), rect, 2)
 
         # Draw pieces
         pieces = ['Q', 'R', 'B', 'N']
@@ -226,12 +375,38 @@ class Display:
         for i, p in enumerate(pieces):
             piece_key = color_prefix + p
             if piece_key in self.piece_images:
-                self.screen.blit(self.piece_images[piece_key], (x + i * SQUARE_SIZE, y))
+                self.screen.blit(self.piece_images[piece_key], (x + i * self.layout.square_size, y))
+
+    def draw_eval_graph(self, analysis_history, current_ply, initial_turn=chess.WHITE, revision=None, updates=()):
+        """Draw the whole-game evaluation graph; only new or updated plies are rendered."""
+        self.eval_graph.sync(analysis_history, initial_turn, revision, updates)
+        self.eval_graph.draw(self.screen, current_ply)
+
+    def draw_clocks(self, clock, turn):
+        """White and Black clocks side by side; the running one is highlighted."""
+        rect = self.layout.clock_rect
+        half = rect.width // 2
+        for i, color in enumerate((chess.WHITE, chess.BLACK)):
+            box = pygame.Rect(rect.x + i * half, rect.y, half - (4 if i == 0 else 0), rect.height)
+            left = clock.time_left(color)
+            if left < 10:
+                bg = self.CLOCK_LOW_BG
+            else:
+                bg = self.CLOCK_ACTIVE_BG if clock.running == color else self.CLOCK_BG
+            pygame.draw.rect(self.screen, bg, box, border_radius=5)
+            pygame.draw.rect(self.screen, (0, 0, 0), box, 2 if color == turn else 1, border_radius=5)
+            label = f"{'White' if color == chess.WHITE else 'Black'}  {clock.format(left)}"
+            text = self.font.render(label, True, self.PANEL_TEXT)
+            self.screen.blit(text, text.get_rect(center=box.center))
+
+    def get_graph_ply(self, pos):
+        """Ply clicked on the evaluation graph, or None."""
+        return self.eval_graph.ply_at(pos)
 
     def draw_back_button(self):
         """Draw back button in the right panel."""
-        panel_x = BOARD_WIDTH + COORD_MARGIN
-        self.back_button_rect = pygame.Rect(panel_x + 10, WINDOW_SIZE[1] - 40, 100, 30)
+        panel_x = self.layout.panel_x
+        self.back_button_rect = pygame.Rect(panel_x + 10, self.layout.window_size[1] - 40, 100, 30)
 
         pygame.draw.rect(self.screen, self.BACK_BUTTON_COLOR, self.back_button_rect, border_radius=5)
         pygame.draw.rect(self.screen, (0, 0, 0), self.back_button_rect, 2, border_radius=5)
@@ -247,14 +422,13 @@ class Display:
     def draw_confirm_exit(self):
         """Draw confirmation dialog for exiting to menu."""
         # Semi-transparent overlay
-        overlay = pygame.Surface(WINDOW_SIZE, pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._get_dim_overlay(150), (0, 0))
 
         # Dialog box
+        window_w, window_h = self.layout.window_size
         dialog_w, dialog_h = 300, 140
-        x = WINDOW_SIZE[0] // 2 - dialog_w // 2
-        y = WINDOW_SIZE[1] // 2 - dialog_h // 2
+        x = window_w // 2 - dialog_w // 2
+        y = window_h // 2 - dialog_h // 2
 
         pygame.draw.rect(self.screen, self.DIALOG_BG, (x, y, dialog_w, dialog_h), border_radius=8)
         pygame.draw.rect(self.screen, (0, 0, 0), (x, y, dialog_w, dialog_h), 2, border_radius=8)
@@ -286,13 +460,13 @@ class Display:
         """Check if 'No' was clicked in confirmation dialog."""
         return self.confirm_no_rect is not None and self.confirm_no_rect.collidepoint(pos)
 
-    def draw_analysis(self, analysis_result, turn, analysis_enabled):
+    def draw_analysis(self, analysis_result, turn, analysis_enabled, position_stats=None, move_quality=None):
         """Draw analysis panel on the right side."""
-        panel_x = BOARD_WIDTH + COORD_MARGIN
-        panel_width = WINDOW_SIZE[0] - panel_x
+        panel_x = self.layout.panel_x
+        panel_width = self.layout.panel_width
 
         # Panel background
-        pygame.draw.rect(self.screen, self.PANEL_BG, (panel_x, 0, panel_width, WINDOW_SIZE[1]))
+        pygame.draw.rect(self.screen, self.PANEL_BG, (panel_x, 0, panel_width, self.layout.window_size[1]))
 
         y = 10
 
@@ -302,7 +476,13 @@ class Display:
             move_text = f"Best Move: {analysis_result['best_move']}"
             self.screen.blit(self.font.render(eval_text, True, self.PANEL_TEXT), (panel_x + 10, y))
             self.screen.blit(self.font.render(move_text, True, self.PANEL_TEXT), (panel_x + 10, y + 30))
-            y += 70
+            y += 60
+            # MultiPV candidate lines from the same search
+            for i, line in enumerate(analysis_result.get("lines", []), start=1):
+                line_text = f"{i}. {line['move']}  {self._format_score(line['type'], line['value'])}"
+                self.screen.blit(self.font.render(line_text, True, self.PANEL_TEXT), (panel_x + 20, y))
+                y += 26
+            y += 10
         elif not analysis_enabled:
             self.screen.blit(self.font.render("Analysis: OFF", True, self.PANEL_TEXT), (panel_x + 10, y))
             y += 40
@@ -312,18 +492,50 @@ class Display:
         self.screen.blit(self.font.render(turn_text, True, self.PANEL_TEXT), (panel_x + 10, y))
         y += 30
 
+        # Quality of the replayed move
+        if move_quality is not None:
+            quality_text = f"Accuracy: {move_quality['accuracy']:.0f}%  (CPL {move_quality['cpl']})"
+            self.screen.blit(self.font.render(quality_text, True, self.PANEL_TEXT), (panel_x + 10, y))
+            y += 30
+
+        # Games from the position index that reached this position
+        if position_stats and position_stats["games"]:
+            stats_text = (f"In {position_stats['games']} games: +{position_stats['white_wins']} "
+                          f"={position_stats['draws']} -{position_stats['black_wins']}")
+            self.screen.blit(self.font.render(stats_text, True, self.PANEL_TEXT), (panel_x + 10, y))
+            y += 30
+
         # Instructions
         self.screen.blit(self.font.render("Press 'A' to toggle analysis", True, self.PANEL_TEXT), (panel_x + 10, y))
         self.screen.blit(self.font.render("← → to navigate moves", True, self.PANEL_TEXT), (panel_x + 10, y + 30))
+        self.screen.blit(self.font.render("Press 'T' to show threats", True, self.PANEL_TEXT), (panel_x + 10, y + 60))
+
+    def draw_puzzle_panel(self, puzzle, status, solved, attempted):
+        """Side panel for puzzle mode: task, progress and controls."""
+        panel_x = self.layout.panel_x
+        pygame.draw.rect(self.screen, self.PANEL_BG, (panel_x, 0, self.layout.panel_width, self.layout.window_size[1]))
+
+        to_move = "White" if chess.Board(puzzle.fen).turn == chess.WHITE else "Black"
+        lines = [
+            f"Puzzle #{puzzle.puzzle_id}",
+            f"{to_move} to play and win",
+            status,
+            f"Solved: {solved} / {attempted}",
+            "",
+            "Press 'N' for the next puzzle",
+        ]
+        y = 10
+        for line in lines:
+            self.screen.blit(self.font.render(line, True, self.PANEL_TEXT), (panel_x + 10, y))
+            y += 30
 
     def draw_game_over(self, result):
         """Draw game over overlay."""
-        overlay = pygame.Surface(WINDOW_SIZE, pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._get_dim_overlay(180), (0, 0))
 
+        window_w, window_h = self.layout.window_size
         text = self.font.render(result, True, WHITE)
-        text_rect = text.get_rect(center=(WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2))
+        text_rect = text.get_rect(center=(window_w // 2, window_h // 2))
         self.screen.blit(text, text_rect)
 
     def update(self):
@@ -0,0 +1,166 @@
+# src/gui/eval_graph.py
+import chess
+import pygame
+
+from src.config.settings import EVAL_GRAPH_MIN_PLIES
+from src.core.scoring import analysis_cp, win_percent
+
+
+def _graph_value(analysis, turn):
+    """White's winning chances (0-100) for an analysis entry with `turn` to move, None if missing."""
+    cp = analysis_cp(analysis, turn)
+    return None if cp is None else win_percent(cp)
+
+
+class EvalGraph:
+    """Whole-game evaluation graph drawn to a cached surface.
+
+    New analysis entries only append their segment (and blunder marker) to
+    the cached surface, and an entry replaced by a deeper search redraws
+    just the columns around its ply. A full redraw happens only when the
+    history shrinks (undo), the graph is resized, or the game outgrows the
+    current x-scale, whose capacity doubles each time.
+    """
+
+    BG_COLOR = (60, 60, 60)
+    WHITE_FILL = (225, 225, 225)
+    LINE_COLOR = (255, 140, 0)
+    MIDLINE_COLOR = (120, 120, 120)
+    CURSOR_COLOR = (0, 200, 255)
+    MISTAKE_COLOR = (255, 170, 0)
+    BLUNDER_COLOR = (230, 40, 40)
+    MARKER_RADIUS = 4
+
+    # Drop in the mover's winning chances (percentage points)
+    MISTAKE_DROP = 20
+    BLUNDER_DROP = 30
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.surface = None
+        self.initial_turn = chess.WHITE
+        self.capacity = EVAL_GRAPH_MIN_PLIES
+        self.values = []   # win% (White's view) per drawn ply, None if not analysed
+        self.revision = None
+
+    def set_rect(self, rect):
+        rect = pygame.Rect(rect)
+        if rect.size != self.rect.size:
+            self.surface = None
+        self.rect = rect
+
+    def _x(self, ply):
+        return int(ply * (self.rect.width - 1) / self.capacity)
+
+    def _y(self, value):
+        return int((self.rect.height - 1) * (1 - value / 100))
+
+    def _reset(self, plies):
+        self.capacity = EVAL_GRAPH_MIN_PLIES
+        while self.capacity < plies - 1:
+            self.capacity *= 2
+        self.surface = pygame.Surface(self.rect.size)
+        self.surface.fill(self.BG_COLOR)
+        mid = self._y(50)
+        pygame.draw.line(self.surface, self.MIDLINE_COLOR, (0, mid), (self.rect.width, mid))
+        self.values = []
+
+    def sync(self, analysis_history, initial_turn=chess.WHITE, revision=None, updates=()):
+        """Bring the cached surface up to date with analysis_history.
+
+        `revision` changes whenever entries were removed rather than appended
+        (GameController.analysis_revision); `updates` lists the plies whose
+        entry was replaced since the last sync, oldest first
+        (GameController.take_analysis_updates).
+        """
+        n = len(analysis_history)
+        drawn = len(self.values)
+        stale = (
+            self.surface is None or
+            revision != self.revision or
+            initial_turn != self.initial_turn or
+            n < drawn or
+            n - 1 > self.capacity
+        )
+        if not stale:
+            for ply in updates:
+                if ply < drawn:
+                    self._redraw(ply, _graph_value(analysis_history[ply], initial_turn ^ (ply % 2 == 1)))
+            stale = drawn and _graph_value(analysis_history[drawn - 1],
+                                           initial_turn ^ ((drawn - 1) % 2 == 1)) != self.values[-1]
+        if stale:
+            self.initial_turn = initial_turn
+            self.revision = revision
+            self._reset(n)
+            drawn = 0
+        for ply in range(drawn, n):
+            self._append(ply, _graph_value(analysis_history[ply], initial_turn ^ (ply % 2 == 1)))
+
+    def _append(self, ply, value):
+        self.values.append(value)
+        self._draw_segment(ply)
+
+    def _redraw(self, ply, value):
+        """Redraw the columns of the segments into and out of `ply` after its value changed."""
+        if value == self.values[ply]:
+            return
+        self.values[ply] = value
+        radius = self.MARKER_RADIUS    # markers (and the 2px lines) reach past their end columns
+        left = max(0, self._x(max(0, ply - 1)) - radius)
+        right = self._x(min(len(self.values) - 1, ply + 1)) + radius
+        # Neighbouring segments and markers reaching into those columns are drawn
+        # again on a scratch surface (clipped drawing rasterises edges differently)
+        first = ply
+        while first > 1 and self._x(first - 1) >= left - radius:
+            first -= 1
+        last = ply + 1
+        while last < len(self.values) - 1 and self._x(last) <= right + radius:
+            last += 1
+        surface = self.surface
+        self.surface = pygame.Surface(self.rect.size)
+        self.surface.fill(self.BG_COLOR)
+        mid = self._y(50)
+        pygame.draw.line(self.surface, self.MIDLINE_COLOR, (0, mid), (self.rect.width, mid))
+        for segment in range(first, min(last, len(self.values) - 1) + 1):
+            self._draw_segment(segment)
+        columns = pygame.Rect(left, 0, right - left + 1, self.rect.height)
+        surface.blit(self.surface, columns.topleft, columns)
+        self.surface = surface
+
+    def _draw_segment(self, ply):
+        """The segment from ply - 1 to `ply`, with the marker of the move that led to `ply`."""
+        value = self.values[ply]
+        prev = self.values[ply - 1] if ply > 0 else None
+        if value is None or prev is None:
+            return
+        x0, x1 = self._x(ply - 1), self._x(ply)
+        y0, y1 = self._y(prev), self._y(value)
+        bottom, mid = self.rect.height - 1, self._y(50)
+        # White's share fills from the curve down, like the lichess graph
+        pygame.draw.polygon(self.surface, self.WHITE_FILL, [(x0, bottom), (x0, y0), (x1, y1), (x1, bottom)])
+        pygame.draw.line(self.surface, self.MIDLINE_COLOR, (x0, mid), (x1, mid))
+        pygame.draw.line(self.surface, self.LINE_COLOR, (x0, y0), (x1, y1), 2)
+
+        # Marker on the move that led here (played from ply - 1)
+        mover = self.initial_turn ^ ((ply - 1) % 2 == 1)
+        drop = (prev - value) if mover == chess.WHITE else (value - prev)
+        if drop >= self.MISTAKE_DROP:
+            color = self.BLUNDER_COLOR if drop >= self.BLUNDER_DROP else self.MISTAKE_COLOR
+            pygame.draw.circle(self.surface, color, (x1, y1), self.MARKER_RADIUS)
+
+    def draw(self, screen, current_ply=None):
+        """Blit the cached graph and the current-ply cursor."""
+        if self.surface is None:
+            return
+        screen.blit(self.surface, self.rect.topleft)
+        if current_ply is not None and current_ply <= self.capacity:
+            x = self.rect.x + self._x(current_ply)
+            pygame.draw.line(screen, self.CURSOR_COLOR, (x, self.rect.top), (x, self.rect.bottom - 1), 2)
+        pygame.draw.rect(screen, (0, 0, 0), self.rect, 1)
+
+    def ply_at(self, pos):
+        """Ply under a click on the graph, or None."""
+        if not self.rect.collidepoint(pos) or not self.values:
+            return None
+        ply = round((pos[0] - self.rect.x) * self.capacity / max(1, self.rect.width - 1))
+        return max(0, min(len(self.values) - 1, ply))
@@ -1,28 +1,24 @@
 # src/gui/input_handler.py
 import pygame
 import chess
-from src.config.settings import SQUARE_SIZE, BOARD_SIZE, COORD_MARGIN
+from src.config.settings import WINDOW_SIZE
+from src.gui.layout import BoardLayout
 
 
 class InputHandler:
-    def __init__(self, view_color=chess.WHITE):
+    def __init__(self, view_color=chess.WHITE, layout=None):
         self.view_color = view_color
-        self.board_x_start = COORD_MARGIN
-        self.board_x_end = COORD_MARGIN + (BOARD_SIZE * SQUARE_SIZE)
-        self.board_y_end = BOARD_SIZE * SQUARE_SIZE
+        self.layout = layout or BoardLayout(WINDOW_SIZE)
 
     def set_view_color(self, color):
         self.view_color = color
 
-    def get_square(self, pos):
-        x, y = pos
-
-        if not (self.board_x_start <= x < self.board_x_end and 0 <= y < self.board_y_end):
-            return None
+    def set_layout(self, layout):
+        self.layout = layout
 
-        col = (x - self.board_x_start) // SQUARE_SIZE
-        row_from_top = y // SQUARE_SIZE
-
-        row = (7 - row_from_top) if self.view_color == chess.WHITE else row_from_top
+    def get_square(self, pos):
+        return self.layout.square_at(pos, self.view_color)
 
-        return chess.square(col, row)
\ No newline at end of file
+    def get_promotion_choice(self, pos):
+        """Piece type clicked in the promotion dialog, or None."""
+        return self.layout.promotion_choice(pos)
\ No newline at end of file
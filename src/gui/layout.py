@@ -0,0 +1,92 @@
+# src/gui/layout.py
+import chess
+import pygame
+
+from src.config.settings import (
+    BOARD_SIZE, COORD_MARGIN, BOARD_OFFSET_Y,
+    MIN_SQUARE_SIZE, MIN_PANEL_WIDTH, EVAL_GRAPH_HEIGHT, CLOCK_HEIGHT
+)
+
+
+class BoardLayout:
+    """Screen geometry for a given window size.
+
+    Computed once per (throttled) resize and shared by Display and
+    InputHandler so drawing and hit-testing always agree.
+    """
+
+    PROMOTION_PIECES = [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]
+
+    def __init__(self, window_size):
+        width, height = window_size
+        self.window_size = (width, height)
+
+        fit_w = (width - COORD_MARGIN - MIN_PANEL_WIDTH) // BOARD_SIZE
+        fit_h = (height - BOARD_OFFSET_Y - COORD_MARGIN) // BOARD_SIZE
+        self.square_size = max(MIN_SQUARE_SIZE, min(fit_w, fit_h))
+
+        self.board_x = COORD_MARGIN
+        self.board_y = BOARD_OFFSET_Y
+        self.board_width = BOARD_SIZE * self.square_size
+        self.board_height = BOARD_SIZE * self.square_size
+
+        self.panel_x = self.board_x + self.board_width
+        self.panel_width = max(0, width - self.panel_x)
+
+        # Eval graph sits at the bottom of the panel, above the back button
+        self.graph_rect = pygame.Rect(
+            self.panel_x + 10, height - 50 - EVAL_GRAPH_HEIGHT,
+            max(1, self.panel_width - 20), EVAL_GRAPH_HEIGHT
+        )
+        # Clocks sit in one row right above the graph
+        self.clock_rect = pygame.Rect(
+            self.graph_rect.x, self.graph_rect.top - 10 - CLOCK_HEIGHT, self.graph_rect.width, CLOCK_HEIGHT
+        )
+
+    @property
+    def board_rect(self):
+        return pygame.Rect(self.board_x, self.board_y, self.board_width, self.board_height)
+
+    def square_rect(self, col, row):
+        """Screen rectangle for a board square (screen col/row)."""
+        return pygame.Rect(
+            self.board_x + col * self.square_size,
+            self.board_y + row * self.square_size,
+            self.square_size,
+            self.square_size
+        )
+
+    def square_center(self, col, row):
+        """Center of a board square (screen col/row)."""
+        half = self.square_size // 2
+        return (
+            self.board_x + col * self.square_size + half,
+            self.board_y + row * self.square_size + half
+        )
+
+    def square_at(self, pos, view_color):
+        """Chess square under a screen position, or None if off the board."""
+        x, y = pos
+        if not self.board_rect.collidepoint(x, y):
+            return None
+        col = (x - self.board_x) // self.square_size
+        row_from_top = (y - self.board_y) // self.square_size
+        row = (7 - row_from_top) if view_color == chess.WHITE else row_from_top
+        return chess.square(col, row)
+
+    @property
+    def promotion_rect(self):
+        width = self.square_size * len(self.PROMOTION_PIECES)
+        return pygame.Rect(
+            self.board_x + (self.board_width - width) // 2,
+            self.board_y + (self.board_height - self.square_size) // 2,
+            width,
+            self.square_size
+        )
+
+    def promotion_choice(self, pos):
+        """Piece type picked in the promotion dialog, or None."""
+        rect = self.promotion_rect
+        if not rect.collidepoint(pos):
+            return None
+        return self.PROMOTION_PIECES[(pos[0] - rect.x) // self.square_size]
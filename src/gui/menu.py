@@ -1,6 +1,8 @@
 # src/gui/menu.py
+import time
 import pygame
 from src.config.settings import WINDOW_SIZE, FONT_PATH
+from src.core.game_log import GameLibrary
 import chess
 
 
@@ -15,6 +17,8 @@ class Menu:
     SLIDER_BG_COLOR = (100, 100, 100)
     TEXT_COLOR = (255, 255, 255)
 
+    DIFFICULTY_SLIDER_Y = 250
+
     def __init__(self):
         pygame.init()
         self.screen = pygame.display.set_mode(WINDOW_SIZE)
@@ -24,13 +28,25 @@ class Menu:
             self.font_large = pygame.font.Font(FONT_PATH, 48)
             self.font_btn = pygame.font.Font(FONT_PATH, 32)
             self.font_medium = pygame.font.Font(FONT_PATH, 28)
+            self.font_small = pygame.font.Font(FONT_PATH, 20)
         except (FileNotFoundError, OSError):
             self.font_large = pygame.font.SysFont("Arial", 48)
             self.font_btn = pygame.font.SysFont("Arial", 32)
             self.font_medium = pygame.font.SysFont("Arial", 28)
+            self.font_small = pygame.font.SysFont("Arial", 20)
 
         self.clock = pygame.time.Clock()
 
+    def close(self):
+        """Release the fonts; the window is reused by the game screen."""
+        self.font_large = self.font_btn = self.font_medium = self.font_small = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def draw_button(self, text, rect, hover=False, font=None):
         """Draw a button with text centered."""
         if font is None:
@@ -60,7 +76,7 @@ class Menu:
         slider_width = 400
         slider_height = 20
         slider_x = WINDOW_SIZE[0] // 2 - slider_width // 2
-        slider_y = 250
+        slider_y = self.DIFFICULTY_SLIDER_Y
         handle_radius = 15
 
         # Slider interaction area (expanded for easier clicking)
@@ -76,7 +92,7 @@ class Menu:
         needs_redraw = True
 
         # Confirm button
-        btn_rect = pygame.Rect(WINDOW_SIZE[0] // 2 - 100, slider_y + 100, 200, 50)
+        btn_rect = self.difficulty_confirm_rect()
 
         running = True
         while running:
@@ -154,17 +170,27 @@ class Menu:
 
         return None
 
-    def show_start_screen(self):
-        """Show main menu with game mode options."""
+    def difficulty_confirm_rect(self):
+        """The "Start Game" button of the difficulty screen."""
+        return pygame.Rect(WINDOW_SIZE[0] // 2 - 100, self.DIFFICULTY_SLIDER_Y + 100, 200, 50)
+
+    def start_buttons(self):
+        """(label, rect) of the main menu buttons."""
         btn_width, btn_height = 420, 55
         center_x = WINDOW_SIZE[0] // 2
 
-        buttons = [
+        return [
             ("Human vs Human", pygame.Rect(center_x - btn_width // 2, 180, btn_width, btn_height)),
             ("Human vs AI (Play as White)", pygame.Rect(center_x - btn_width // 2, 250, btn_width, btn_height)),
-            ("Human vs AI (Play as Black)", pygame.Rect(center_x - btn_width // 2, 320, btn_width, btn_height))
+            ("Human vs AI (Play as Black)", pygame.Rect(center_x - btn_width // 2, 320, btn_width, btn_height)),
+            ("Saved Games", pygame.Rect(center_x - btn_width // 2, 390, btn_width, btn_height)),
+            ("Puzzles", pygame.Rect(center_x - btn_width // 2, 460, btn_width, btn_height))
         ]
 
+    def show_start_screen(self):
+        """Show main menu with game mode options."""
+        buttons = self.start_buttons()
+
         needs_redraw = True
         last_hover = None
 
@@ -216,4 +242,83 @@ class Menu:
                             return None
                         return ("human_vs_ai", chess.BLACK, diff)
 
-        return None
\ No newline at end of file
+                    # Saved games
+                    elif buttons[3][1].collidepoint(event.pos):
+                        game_id = self.show_saved_games_screen()
+                        if game_id is not None:
+                            return ("resume", game_id)
+                        needs_redraw = True
+
+                    # Puzzles extracted from analysed games
+                    elif buttons[4][1].collidepoint(event.pos):
+                        return ("puzzles",)
+
+        return None
+
+    def _describe_game(self, entry):
+        """One-line summary of a GameEntry for the saved games list."""
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.created))
+        if entry.white_is_human and entry.black_is_human:
+            mode = "Human vs Human"
+        elif entry.white_is_human:
+            mode = f"White vs AI {entry.black_difficulty}"
+        else:
+            mode = f"AI {entry.white_difficulty} vs Black"
+        return f"#{entry.game_id}  {when}  {mode}  {entry.plies} plies  {entry.result}"
+
+    def show_saved_games_screen(self):
+        """List saved games from the library index. Returns a game id or None."""
+        entries = GameLibrary().list_games()
+        row_height = 36
+        top = 140
+        rows_visible = max(1, (WINDOW_SIZE[1] - top - 80) // row_height)
+        row_width = WINDOW_SIZE[0] - 80
+        back_rect = pygame.Rect(WINDOW_SIZE[0] // 2 - 100, WINDOW_SIZE[1] - 65, 200, 50)
+
+        scroll = 0
+        needs_redraw = True
+        last_hover = None
+        while True:
+            mouse_pos = pygame.mouse.get_pos()
+            current_hover = None
+            if 40 <= mouse_pos[0] < 40 + row_width and mouse_pos[1] >= top:
+                index = scroll + (mouse_pos[1] - top) // row_height
+                if (mouse_pos[1] - top) // row_height < rows_visible and index < len(entries):
+                    current_hover = index
+
+            if needs_redraw or current_hover != last_hover:
+                self.screen.fill(self.BG_COLOR)
+                self.draw_centered_text("Saved Games", 60, self.font_large, self.TITLE_COLOR)
+                if not entries:
+                    self.draw_centered_text("No saved games yet", top, self.font_btn, self.SUBTITLE_COLOR)
+                for i, entry in enumerate(entries[scroll:scroll + rows_visible]):
+                    rect = pygame.Rect(40, top + i * row_height, row_width, row_height - 4)
+                    color = self.BUTTON_HOVER_COLOR if scroll + i == current_hover else self.SLIDER_BG_COLOR
+                    pygame.draw.rect(self.screen, color, rect, border_radius=5)
+                    text = self.font_small.render(self._describe_game(entry), True, self.TEXT_COLOR)
+                    self.screen.blit(text, (rect.x + 10, rect.centery - text.get_height() // 2))
+                self.draw_button("Back", back_rect, hover=back_rect.collidepoint(mouse_pos))
+                pygame.display.flip()
+                needs_redraw = False
+                last_hover = current_hover
+
+            self.clock.tick(60)
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return None
+
+                elif event.type == pygame.MOUSEWHEEL:
+                    max_scroll = max(0, len(entries) - rows_visible)
+                    scroll = max(0, min(max_scroll, scroll - event.y))
+                    needs_redraw = True
+
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if back_rect.collidepoint(event.pos):
+                        return None
+                    if current_hover is not None:
+                        return entries[current_hover].game_id
+
+                elif event.type == pygame.MOUSEMOTION:
+                    if back_rect.collidepoint(event.pos) != back_rect.collidepoint(mouse_pos):
+                        needs_redraw = True
\ No newline at end of file
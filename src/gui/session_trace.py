@@ -0,0 +1,333 @@
+# src/gui/session_trace.py
+import copy
+import json
+import time
+from collections import defaultdict, deque
+
+import chess
+import pygame
+
+from src.config.settings import FPS
+from src.core.analysis import ChessAnalysis
+from src.core.analysis_process import ProcessAnalysis
+from src.core.analysis_policy import AdaptiveAnalysisPolicy
+from src.core.clock import ChessClock
+
+# Only the events the game loop reacts to are recorded, with the attributes it reads
+TRACED_EVENTS = {
+    pygame.QUIT: (),
+    pygame.VIDEORESIZE: ("size",),
+    pygame.KEYDOWN: ("key", "mod"),
+    pygame.MOUSEBUTTONDOWN: ("pos", "button"),
+}
+
+# Trace file: JSON lines. The first line is {"header": ...}, then one line per
+# frame {"t": frame start ticks, "e": [[type, attrs], ...], "a": [analysis calls],
+# "m": [AI moves played]}, with empty keys left out.
+
+
+class LiveFrames:
+    """Frame source of the game loop: real pygame input and time."""
+
+    def __init__(self, analysis_process=False):
+        self.clock = pygame.time.Clock()
+        self.now_ms = 0
+        self.analysis_process = analysis_process
+
+    def make_analysis(self, options):
+        if self.analysis_process:
+            return ProcessAnalysis(options=options)
+        return ChessAnalysis(options=options)
+
+    def attach(self, controller, display):
+        pass
+
+    def next_frame(self, controller):
+        """Events of the next frame, or None when there are no more frames."""
+        self.now_ms = pygame.time.get_ticks()
+        return pygame.event.get()
+
+    def ticks(self):
+        """Milliseconds at the start of the current frame."""
+        return self.now_ms
+
+    def end_frame(self, controller, rendered):
+        self.clock.tick(FPS)
+
+    def close(self):
+        pass
+
+
+class _RecordingAnalysis:
+    """ChessAnalysis proxy that logs every search result for the trace."""
+
+    def __init__(self, analysis, log):
+        self._analysis = analysis
+        self._log = log
+
+    def __getattr__(self, name):
+        return getattr(self._analysis, name)
+
+    def analyze_position(self, fen, budget=None):
+        result = self._analysis.analyze_position(fen, budget)
+        self._log.append(["analyze", fen, copy.deepcopy(result), self._analysis.engine_seconds])
+        return result
+
+    def deepen(self, fen, known_depth=0):
+        result = self._analysis.deepen(fen, known_depth)
+        self._log.append(["deepen", fen, copy.deepcopy(result), self._analysis.engine_seconds])
+        return result
+
+    def poll(self):
+        updates = self._analysis.poll()
+        if updates:
+            self._log.append(["poll", None, copy.deepcopy([list(update) for update in updates]),
+                              self._analysis.engine_seconds])
+        return updates
+
+
+class TraceRecorder(LiveFrames):
+    """Live frames that also write the session (input, engine results) to a trace file."""
+
+    def __init__(self, path, controller, analysis_process=False):
+        super().__init__(analysis_process)
+        self.file = open(path, "w", encoding="utf-8")
+        self._analysis_log = []
+        self._plies = len(controller.move_history)
+        self._frame = {}
+        header = {
+            "initial_fen": controller.initial_fen,
+            "white_is_human": controller.white_player.is_human,
+            "black_is_human": controller.black_player.is_human,
+            "white_difficulty": controller.white_player.difficulty_level,
+            "black_difficulty": controller.black_player.difficulty_level,
+            "time_control": [controller.clock.base_s, controller.clock.increment_s] if controller.clock else None,
+            "moves": [move.uci() for move in controller.move_history],
+            "analyses": controller.analysis_history,
+        }
+        self.file.write(json.dumps({"header": header}) + "\n")
+
+    def make_analysis(self, options):
+        analysis = super().make_analysis(options)
+        self._engine_available = analysis.stockfish is not None
+        self.file.write(json.dumps({"engine": self._engine_available, "enabled": analysis.enabled}) + "\n")
+        return _RecordingAnalysis(analysis, self._analysis_log)
+
+    def next_frame(self, controller):
+        events = super().next_frame(controller)
+        self._frame = {"t": self.now_ms}
+        traced = [
+            [event.type, {name: getattr(event, name) for name in TRACED_EVENTS[event.type]}]
+            for event in events if event.type in TRACED_EVENTS
+        ]
+        if traced:
+            self._frame["e"] = traced
+        return events
+
+    def end_frame(self, controller, rendered):
+        if self._analysis_log:
+            self._frame["a"], self._analysis_log[:] = list(self._analysis_log), []
+        # AI moves played this frame, so a replay plays them on the same frame
+        history = controller.move_history
+        if len(history) < self._plies:
+            self._plies = len(history)
+        if len(history) > self._plies:
+            initial_turn = chess.Board(controller.initial_fen).turn
+            ai_moves = []
+            for ply in range(self._plies, len(history)):
+                mover = initial_turn if ply % 2 == 0 else not initial_turn
+                player = controller.white_player if mover == chess.WHITE else controller.black_player
+                if not player.is_human:
+                    ai_moves.append([controller.get_fen_at(ply), history[ply].uci()])
+            if ai_moves:
+                self._frame["m"] = ai_moves
+            self._plies = len(history)
+        self.file.write(json.dumps(self._frame) + "\n")
+        super().end_frame(controller, rendered)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_trace(path):
+    """(header, engine info, frames) of a trace file."""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())["header"]
+        engine = json.loads(f.readline())
+        frames = [json.loads(line) for line in f if line.strip()]
+    return header, engine, frames
+
+
+class _ReplayAnalysis:
+    """Stands in for ChessAnalysis: returns the results recorded for each position."""
+
+    def __init__(self, engine_available, enabled, results):
+        self.stockfish = object() if engine_available else None
+        self.enabled = enabled
+        self.policy = AdaptiveAnalysisPolicy()
+        self.engine_seconds = 0.0
+        self.results = results      # (call, fen) -> deque of (result, engine seconds)
+        self.divergences = 0
+        self.deepen_due = False     # the recorded frame asked for a deepening slice
+        self.polled = ()            # results an analysis process streamed in on the recorded frame
+
+    def toggle_analysis(self):
+        if self.stockfish is not None:
+            self.enabled = not self.enabled
+
+    def _recorded(self, call, fen):
+        queue = self.results.get((call, fen))
+        if not queue:
+            self.divergences += 1
+            return None
+        result, self.engine_seconds = queue.popleft()
+        return copy.deepcopy(result)
+
+    def analyze_position(self, fen, budget=None):
+        return self._recorded("analyze", fen) if self.enabled else None
+
+    def deepen(self, fen, known_depth=0):
+        self.deepen_due = False
+        return self._recorded("deepen", fen) if self.enabled else None
+
+    def poll(self):
+        polled, self.polled = self.polled, ()
+        return polled
+
+    def pending(self):
+        # Slices ran in the background: the recorded session was free to start one on these frames only
+        return 0 if self.deepen_due else 1
+
+    def close(self):
+        self.enabled = False
+
+
+class _ReplayPlayer:
+    """AI seat that answers instantly with the moves recorded for each position."""
+
+    def __init__(self, color, difficulty_level, moves):
+        self.color = color
+        self.is_human = False
+        self.difficulty_level = difficulty_level
+        self.moves = moves          # fen -> deque of moves
+        self.divergences = 0
+
+    def get_move(self, board, think_time=None):
+        queue = self.moves.get(board.fen())
+        if queue:
+            return queue.popleft()
+        self.divergences += 1
+        return next(iter(board.legal_moves), None)
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ReplayFrames(LiveFrames):
+    """Feeds a recorded trace through the game loop headlessly and times each frame.
+
+    Frames run back to back with the recorded clock readings; engine
+    results and AI moves come from the trace, and each AI move is released
+    on the frame it was played in the recorded session.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.header, engine, self.frames = read_trace(path)
+        self.engine_available = engine["engine"]
+        self.analysis_enabled = engine["enabled"]
+        self.index = -1
+        self.now_ms = self.frames[0]["t"] if self.frames else 0
+        self.frame_times = []       # (seconds, rendered) per frame
+        self._frame_started = None
+        self._ai_frames = deque()   # frame of each recorded AI move, in order
+        self._ai_moves = defaultdict(deque)
+        self.analysis = None
+        self.players = []
+
+    def make_analysis(self, options):
+        results = defaultdict(deque)
+        for frame in self.frames:
+            for call, fen, result, engine_seconds in frame.get("a", ()):
+                if call != "poll":
+                    results[(call, fen)].append((result, engine_seconds))
+        self.analysis = _ReplayAnalysis(self.engine_available, self.analysis_enabled, results)
+        return self.analysis
+
+    def build_controller(self, controller_factory):
+        """The recorded game's controller; AI seats play the recorded moves (no engines are started).
+
+        `controller_factory(header)` builds a GameController with both seats
+        human for the trace header.
+        """
+        header = self.header
+        controller = controller_factory(header)
+        if header["moves"]:
+            controller.load_history([chess.Move.from_uci(m) for m in header["moves"]], header["analyses"])
+        for frame in self.frames:
+            for fen, uci in frame.get("m", ()):
+                self._ai_moves[fen].append(chess.Move.from_uci(uci))
+        for color, name in ((chess.WHITE, "white"), (chess.BLACK, "black")):
+            if not header[f"{name}_is_human"]:
+                player = _ReplayPlayer(color, header[f"{name}_difficulty"], self._ai_moves)
+                setattr(controller, f"{name}_player", player)
+                self.players.append(player)
+        return controller
+
+    def attach(self, controller, display):
+        # Frame each AI move was played on, in order
+        self._ai_frames = deque(index for index, frame in enumerate(self.frames) for _ in frame.get("m", ()))
+        controller.ai_move_delay_s = 0.0
+        controller.ai_move_gate = self._ai_gate
+        if controller.clock:
+            controller.clock = ChessClock(controller.clock.base_s, controller.clock.increment_s,
+                                          now=lambda: self.now_ms / 1000)
+
+    def _ai_gate(self, ply):
+        if self._ai_frames and self._ai_frames[0] <= self.index:
+            self._ai_frames.popleft()
+            return True
+        return False
+
+    def next_frame(self, controller):
+        self.index += 1
+        if self.index >= len(self.frames):
+            return None
+        frame = self.frames[self.index]
+        self.now_ms = frame["t"]
+        self.analysis.deepen_due = any(call[0] == "deepen" for call in frame.get("a", ()))
+        for call, _, updates, engine_seconds in frame.get("a", ()):
+            if call == "poll":
+                self.analysis.polled = [tuple(update) for update in updates]
+                self.analysis.engine_seconds = engine_seconds
+        if self._ai_frames and self._ai_frames[0] == self.index:
+            controller.wait_for_ai(timeout=5.0)   # not timed: the recorded move is due this frame
+        self._frame_started = time.perf_counter()
+        return [
+            pygame.event.Event(event_type, {name: tuple(value) if isinstance(value, list) else value
+                                            for name, value in attrs.items()})
+            for event_type, attrs in frame.get("e", ())
+        ]
+
+    def end_frame(self, controller, rendered):
+        self.frame_times.append((time.perf_counter() - self._frame_started, rendered))
+
+    def divergences(self):
+        """Engine calls or AI moves the replay asked for that the trace does not have."""
+        return self.analysis.divergences + sum(player.divergences for player in self.players)
+
+
+class NullGameLog:
+    """Game log stand-in for replays: nothing is saved."""
+
+    game_id = None
+
+    def set_result(self, result):
+        pass
+
+    def close(self):
+        pass
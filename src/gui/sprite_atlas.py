@@ -0,0 +1,129 @@
+# src/gui/sprite_atlas.py
+import hashlib
+import os
+
+import pygame
+
+from src.config.settings import ASSET_PATH, PIECE_IMAGES, ATLAS_CACHE_PATH, ATLAS_CACHE_LIMIT
+
+
+class SpriteAtlas:
+    """Packs all piece images into one surface per square size.
+
+    Each size is built once with smoothscale and written to disk as raw RGBA
+    pixels, keyed by size and a hash of the source PNGs. Later starts (and
+    window resizes back to a known size) load the raw pixels directly instead
+    of decoding and rescaling every PNG.
+    """
+
+    FORMAT_VERSION = 1
+    PIXEL_FORMAT = "RGBA"
+
+    def __init__(self, cache_dir=ATLAS_CACHE_PATH, limit=ATLAS_CACHE_LIMIT):
+        self.cache_dir = cache_dir
+        self.limit = limit
+        self.keys = list(PIECE_IMAGES.keys())
+        self.asset_hash = self._hash_assets()
+        self._atlases = {}   # square_size -> atlas surface
+        self._sprites = {}   # square_size -> {piece_key: subsurface}
+
+    def _asset_path(self, key):
+        return os.path.join(ASSET_PATH, PIECE_IMAGES[key].lstrip('/'))
+
+    def _hash_assets(self):
+        """Hash the raw PNG bytes so edited assets invalidate old atlases."""
+        digest = hashlib.sha1(str(self.FORMAT_VERSION).encode())
+        for key in self.keys:
+            digest.update(key.encode())
+            try:
+                with open(self._asset_path(key), "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b"missing")
+        return digest.hexdigest()[:16]
+
+    def _cache_file(self, square_size):
+        return os.path.join(self.cache_dir, f"pieces_{square_size}_{self.asset_hash}.rgba")
+
+    def get_sprites(self, square_size):
+        """Return {piece_key: surface} for the given square size."""
+        sprites = self._sprites.pop(square_size, None)
+        if sprites is None:
+            atlas = self._load_or_build(square_size)
+            sprites = {
+                key: atlas.subsurface((i * square_size, 0, square_size, square_size))
+                for i, key in enumerate(self.keys)
+            }
+            self._atlases[square_size] = atlas
+        # Re-insert so dict order is least- to most-recently used
+        self._sprites[square_size] = sprites
+        while len(self._sprites) > self.limit:
+            oldest = next(iter(self._sprites))
+            del self._sprites[oldest]
+            del self._atlases[oldest]
+        return sprites
+
+    def clear(self):
+        """Drop the in-memory atlases (the disk cache stays)."""
+        self._sprites.clear()
+        self._atlases.clear()
+
+    def _load_or_build(self, square_size):
+        atlas = self._load_cached(square_size)
+        if atlas is None:
+            atlas = self._build(square_size)
+            self._save_cached(square_size, atlas)
+        return atlas.convert_alpha() if pygame.display.get_surface() else atlas
+
+    def _load_cached(self, square_size):
+        size = (square_size * len(self.keys), square_size)
+        path = self._cache_file(square_size)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if len(raw) != size[0] * size[1] * 4:
+            return None
+        return pygame.image.frombuffer(raw, size, self.PIXEL_FORMAT)
+
+    def _build(self, square_size):
+        atlas = pygame.Surface((square_size * len(self.keys), square_size), pygame.SRCALPHA)
+        for i, key in enumerate(self.keys):
+            full_path = self._asset_path(key)
+            try:
+                img = pygame.image.load(full_path)
+                if img.get_bitsize() != 32:
+                    img = img.convert_alpha() if pygame.display.get_surface() else img.convert(32, pygame.SRCALPHA)
+                img = pygame.transform.smoothscale(img, (square_size, square_size))
+                atlas.blit(img, (i * square_size, 0))
+            except Exception as e:
+                print(f"[ERROR] Failed to load {full_path}: {e}")
+        return atlas
+
+    def _save_cached(self, square_size, atlas):
+        path = self._cache_file(square_size)
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tostring(atlas, self.PIXEL_FORMAT))
+            os.replace(tmp_path, path)
+            self._prune_disk_cache()
+        except OSError as e:
+            print(f"[WARNING] Failed to write atlas cache {path}: {e}")
+
+    def _prune_disk_cache(self):
+        """Keep only the most recently written atlases (window drags create many sizes)."""
+        files = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith(".rgba")
+        ]
+        if len(files) <= self.limit:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:-self.limit]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
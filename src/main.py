@@ -1,66 +1,191 @@
 # src/main.py
+import argparse
+import os
+import time
 import pygame
 import chess
 from src.gui.menu import Menu
 from src.gui.display import Display
 from src.gui.input_handler import InputHandler
+from src.gui.session_trace import LiveFrames, TraceRecorder
 from src.core.game_controller import GameController
-from src.core.analysis import ChessAnalysis
-from src.config.settings import FPS, COORD_MARGIN, BOARD_WIDTH, SQUARE_SIZE
-
-
-def run_game(white_human=True, black_human=True, white_difficulty=1, black_difficulty=1):
-    controller = GameController(
-        white_is_human=white_human,
-        black_is_human=black_human,
-        white_difficulty=white_difficulty,
-        black_difficulty=black_difficulty
-    )
-
-    # Determine view orientation
-    if white_human and not black_human:
-        view_color = chess.WHITE
-    elif black_human and not white_human:
-        view_color = chess.BLACK
+from src.core.game_log import GameLibrary
+from src.core.position_index import PositionIndex
+from src.core.analysis import position_cache_key
+from src.core.engine_options import EngineConfig
+from src.net.client import NetworkClient
+from src.core.clock import parse_time_control
+from src.core.puzzles import PuzzleStore
+from src.config.settings import FPS, DEFAULT_TIME_CONTROL
+
+
+def _ai_options(engine_config, white_human, black_human):
+    return engine_config.for_game((not white_human) + (not black_human))[1]
+
+
+def run_game(white_human=True, black_human=True, white_difficulty=1, black_difficulty=1, resume_id=None,
+             engine_config=None, remote=None, time_control=None, trace_dir=None, frames=None):
+    """Play one game; `frames` overrides the frame source (see _game_loop)."""
+    engine_config = engine_config or EngineConfig()
+    library = GameLibrary()
+    if resume_id is not None:
+        controller, game_log = library.resume_game(
+            resume_id,
+            lambda header: GameController(
+                white_is_human=header["white_is_human"],
+                black_is_human=header["black_is_human"],
+                white_difficulty=header["white_difficulty"],
+                black_difficulty=header["black_difficulty"],
+                engine_options=_ai_options(engine_config, header["white_is_human"], header["black_is_human"]),
+                time_control=header["time_control"],
+                initial_fen=header["initial_fen"]
+            )
+        )
+        white_human = controller.white_player.is_human
+        black_human = controller.black_player.is_human
     else:
-        view_color = chess.WHITE
-
-    analysis = ChessAnalysis()
-    display = Display(view_color=view_color)
-    input_handler = InputHandler(view_color=view_color)
-    clock = pygame.time.Clock()
-
-    # Initial analysis
-    initial_analysis = analysis.analyze_position(controller.get_fen()) if analysis.enabled else None
-    controller._save_analysis(initial_analysis)
+        controller = GameController(
+            white_is_human=white_human,
+            black_is_human=black_human,
+            white_difficulty=white_difficulty,
+            black_difficulty=black_difficulty,
+            engine_options=_ai_options(engine_config, white_human, black_human),
+            time_control=time_control
+        )
+        game_log = library.create_game(controller)
+        if remote is not None:
+            remote.attach(controller)
+    analysis_options = engine_config.for_game((not white_human) + (not black_human))[0]
+
+    position_index = PositionIndex()
+    if frames is None and trace_dir is not None and remote is None:
+        os.makedirs(trace_dir, exist_ok=True)
+        path = os.path.join(trace_dir, f"game-{game_log.game_id:06d}-{time.strftime('%Y%m%d-%H%M%S')}.trace")
+        frames = TraceRecorder(path, controller, analysis_process=engine_config.analysis_process)
+    elif frames is None and engine_config.analysis_process:
+        frames = LiveFrames(analysis_process=True)
+    try:
+        return _game_loop(controller, white_human, black_human, game_log, position_index, analysis_options, remote,
+                          frames)
+    finally:
+        if frames is not None:
+            frames.close()
+        if remote is not None:
+            remote.close()
+        controller.close()
+        game_log.close()
+        position_index.add_saved_game(library, game_log.game_id)
+        position_index.close()
+
+
+def _view_color(white_human, black_human, remote=None):
+    if remote is not None:
+        return remote.color
+    if black_human and not white_human:
+        return chess.BLACK
+    return chess.WHITE
+
+
+def _fen_ply(fen):
+    """Plies played since the start of the game, from a FEN's move counters."""
+    fields = fen.split()
+    return 2 * (int(fields[5]) - 1) + (fields[1] == "b")
+
+
+def _game_loop(controller, white_human, black_human, game_log, position_index, analysis_options=None, remote=None,
+               frames=None):
+    """Run one game until the window closes or the user goes back to the menu.
+
+    `frames` supplies input and time per frame (session_trace.LiveFrames by
+    default; a TraceRecorder records the session, ReplayFrames replays one).
+    """
+    frames = frames or LiveFrames()
+    view_color = _view_color(white_human, black_human, remote)
+
+    analysis = frames.make_analysis(analysis_options)
+    display = Display(view_color=view_color, ticks=frames.ticks)
+    input_handler = InputHandler(view_color=view_color, layout=display.layout)
+    frames.attach(controller, display)
+    try:
+        return _run_frames(controller, game_log, position_index, remote, frames, analysis, display, input_handler)
+    finally:
+        analysis.close()
+        display.close()
+
+
+def _run_frames(controller, game_log, position_index, remote, frames, analysis, display, input_handler):
+
+    # Initial analysis (a resumed game already has its analysis history)
+    if controller.analysis_history:
+        initial_analysis = controller.analysis_history[-1]
+    else:
+        initial_analysis = analysis.analyze_position(controller.get_fen()) if analysis.enabled else None
+        controller._save_analysis(initial_analysis)
 
     # State tracking
     last_fen = controller.get_fen()
+    last_clock = None
     analysis_result = initial_analysis
+    position_stats = position_index.stats(controller.get_board())
     show_confirm_exit = False
+    show_threats = False
     needs_rerender = True  # Flag to track when display needs updating
 
     running = True
     while running:
+        events = frames.next_frame(controller)
+        if events is None:
+            return "trace_end"
+
+        # Moves from the other player of a network game
+        if remote is not None and remote.apply_incoming():
+            needs_rerender = True
+
         # Only analyze if position changed
         current_fen = controller.get_fen()
         if current_fen != last_fen:
-            if analysis.enabled and not controller.replay_mode:
-                analysis_result = analysis.analyze_position(current_fen)
-                controller._save_analysis(analysis_result)
+            if not controller.replay_mode:
+                if analysis.enabled:
+                    analysis_result = analysis.analyze_position(current_fen)
+                # One entry per position: None while analysis is off; leaving the
+                # replay keeps the entry stored already (it may have been deepened)
+                if len(controller.analysis_history) <= len(controller.move_history):
+                    controller.save_current_analysis(analysis_result if analysis.enabled else None)
+            position_stats = position_index.stats(controller.get_board())
             last_fen = current_fen
             needs_rerender = True
 
+        # Results streamed in by an analysis process; a finished search goes into the history
+        for fen, streamed, final in analysis.poll():
+            if position_cache_key(fen) == position_cache_key(current_fen) and not controller.replay_mode:
+                analysis_result = streamed
+                needs_rerender = True
+            ply = _fen_ply(fen) - _fen_ply(controller.initial_fen)
+            if final and 0 <= ply < len(controller.analysis_history) and controller.get_fen_at(ply) == fen:
+                controller.update_analysis(ply, streamed)
+
         # Update game state (AI moves, etc.)
         state_changed = controller.update()
         if state_changed:
             needs_rerender = True
+        if controller.game_over:
+            game_log.set_result(controller.get_result())
+        if controller.clock and controller.clock.display_key() != last_clock:
+            last_clock = controller.clock.display_key()
+            needs_rerender = True
 
         # Event handling
-        for event in pygame.event.get():
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                analysis.policy.note_input(frames.ticks())
+
             if event.type == pygame.QUIT:
                 return "quit"
 
+            elif event.type == pygame.VIDEORESIZE:
+                display.request_resize(event.size)
+                needs_rerender = True
+
             elif event.type == pygame.KEYDOWN:
                 needs_rerender = True
                 if event.key == pygame.K_a:
@@ -68,15 +193,18 @@ def run_game(white_human=True, black_human=True, white_difficulty=1, black_diffi
                     # Re-analyze current position if just enabled
                     if new_state and not controller.replay_mode:
                         analysis_result = analysis.analyze_position(controller.get_fen())
-                        controller._save_analysis(analysis_result)
+                        controller.save_current_analysis(analysis_result)
 
-                elif event.key == pygame.K_z and pygame.key.get_mods() & pygame.KMOD_CTRL:
-                    if not controller.replay_mode:
+                elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                    if not controller.replay_mode and remote is None:
                         controller.undo_last_move()
                         last_fen = controller.get_fen()
                         if analysis.enabled:
                             analysis_result = analysis.analyze_position(last_fen)
-                            controller._save_analysis(analysis_result)
+                            controller.save_current_analysis(analysis_result)
+
+                elif event.key == pygame.K_t:
+                    show_threats = not show_threats
 
                 elif event.key == pygame.K_LEFT:
                     controller.navigate_replay(-1)
@@ -101,15 +229,9 @@ def run_game(white_human=True, black_human=True, white_difficulty=1, black_diffi
 
                 # Handle promotion dialog
                 if controller.is_awaiting_promotion():
-                    x, y = mouse_pos
-                    dialog_x = COORD_MARGIN + (BOARD_WIDTH - SQUARE_SIZE * 4) // 2
-                    dialog_y = (8 * SQUARE_SIZE - SQUARE_SIZE) // 2
-
-                    if dialog_x <= x < dialog_x + SQUARE_SIZE * 4 and dialog_y <= y < dialog_y + SQUARE_SIZE:
-                        piece_index = (x - dialog_x) // SQUARE_SIZE
-                        promo_map = [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]
-                        if 0 <= piece_index < 4:
-                            controller.handle_promotion_choice(promo_map[piece_index])
+                    piece_type = input_handler.get_promotion_choice(mouse_pos)
+                    if piece_type is not None:
+                        controller.handle_promotion_choice(piece_type)
                     continue
 
                 # Handle back button
@@ -117,14 +239,44 @@ def run_game(white_human=True, black_human=True, white_difficulty=1, black_diffi
                     show_confirm_exit = True
                     continue
 
+                # Click on the eval graph jumps to that ply
+                graph_ply = display.get_graph_ply(mouse_pos)
+                if graph_ply is not None:
+                    controller.jump_replay(graph_ply)
+                    continue
+
                 # Handle board clicks
                 square = input_handler.get_square(mouse_pos)
-                if square is not None:
+                if square is not None and (remote is None or remote.can_move(controller.get_board())):
                     controller.handle_click(square, input_handler)
 
+        # Adaptive analysis: short deepening slices run in the background on the
+        # replay position being studied, or on past positions when the user is
+        # idle; a slice's result is picked up by asking again once it finished
+        now_ms = frames.ticks()
+        analysis.policy.note_view(controller, now_ms)
+        if analysis.enabled and not show_confirm_exit and not analysis.pending():
+            ply = analysis.policy.next_deepening(controller, analysis.engine_seconds, now_ms)
+            if ply is not None:
+                known = controller.analysis_history[ply]
+                deeper = analysis.deepen(controller.get_fen_at(ply), known.get("depth", 0) if known else 0)
+                analysis.policy.note_result(ply, deeper is not None)
+                if deeper is not None:
+                    controller.update_analysis(ply, deeper)
+                    if ply == len(controller.move_history):
+                        analysis_result = deeper
+                    needs_rerender = True
+
+        # Apply window resizes (throttled); keep rendering until the last one lands
+        if display.apply_pending_resize():
+            input_handler.set_layout(display.layout)
+            needs_rerender = True
+        if display.has_pending_resize():
+            needs_rerender = True
+
         # Only render if something changed
         if not needs_rerender:
-            clock.tick(FPS)
+            frames.end_frame(controller, False)
             continue
 
         # Determine what to display
@@ -142,19 +294,30 @@ def run_game(white_human=True, black_human=True, white_difficulty=1, black_diffi
             highlight_moves.append(("played", played_move))
         if best_move:
             highlight_moves.append(("best", best_move))
+        for candidate in controller.get_candidate_moves():
+            highlight_moves.append(("candidate", candidate))
 
         # Render everything
         display.draw_board(
             controller.get_board(),
             controller.get_selected_square() if not controller.replay_mode else None,
             controller.get_legal_moves() if not controller.replay_mode else [],
-            highlight_moves=highlight_moves
+            highlight_moves=highlight_moves,
+            threats=controller.get_threats() if show_threats else None
         )
 
         if controller.is_awaiting_promotion():
             display.draw_promotion_dialog(color_is_white=turn)
 
-        display.draw_analysis(display_analysis, turn, analysis.enabled)
+        move_quality = controller.get_move_quality() if controller.replay_mode else None
+        display.draw_analysis(display_analysis, turn, analysis.enabled, position_stats, move_quality)
+        current_ply = controller.replay_index if controller.replay_mode else len(controller.move_history)
+        display.draw_eval_graph(
+            controller.analysis_history, current_ply, chess.Board(controller.initial_fen).turn,
+            controller.analysis_revision, controller.take_analysis_updates()
+        )
+        if controller.clock:
+            display.draw_clocks(controller.clock, controller.board.board.turn)
         display.draw_back_button()
 
         if show_confirm_exit:
@@ -165,18 +328,169 @@ def run_game(white_human=True, black_human=True, white_difficulty=1, black_diffi
 
         display.update()
         needs_rerender = False
-        clock.tick(FPS)
+        frames.end_frame(controller, True)
 
     return "quit"
 
 
+def run_puzzles():
+    """Solve stored puzzles one after another; returns "quit" or "back_to_menu"."""
+    store = PuzzleStore()
+    try:
+        if not store.count():
+            print("[WARNING] No puzzles yet: extract some with python -m src.tools.extract_puzzles")
+            return "back_to_menu"
+        with Display() as display:
+            input_handler = InputHandler(layout=display.layout)
+            score = {"solved": 0, "attempted": 0}
+            # Puzzles are paged in from the store as the user works through them
+            for puzzle in store.iter_puzzles():
+                result = _puzzle_loop(puzzle, display, input_handler, score)
+                if result != "next":
+                    return result
+        return "back_to_menu"
+    finally:
+        store.close()
+
+
+def _puzzle_loop(puzzle, display, input_handler, score):
+    solver = chess.Board(puzzle.fen).turn
+    display.set_view_color(solver)
+    input_handler.set_view_color(solver)
+
+    def start_at(step):
+        controller = GameController(initial_fen=puzzle.fen)
+        for move in puzzle.solution[:step]:
+            controller.apply_move(move)
+        return controller
+
+    step = 0           # index in puzzle.solution of the next solver move
+    controller = start_at(step)
+    status = "Find the best move"
+    finished = False
+    clean = True
+    clock = pygame.time.Clock()
+    needs_rerender = True
+
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return "quit"
+
+                elif event.type == pygame.VIDEORESIZE:
+                    display.request_resize(event.size)
+                    needs_rerender = True
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_n:
+                    score["attempted"] += not finished
+                    return "next"
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    needs_rerender = True
+                    if display.is_back_button_clicked(event.pos):
+                        return "back_to_menu"
+                    if finished:
+                        continue
+                    if controller.is_awaiting_promotion():
+                        piece_type = input_handler.get_promotion_choice(event.pos)
+                        if piece_type is not None:
+                            controller.handle_promotion_choice(piece_type)
+                    else:
+                        square = input_handler.get_square(event.pos)
+                        if square is not None:
+                            controller.handle_click(square, input_handler)
+
+                    # Check a completed solver move against the solution
+                    if len(controller.move_history) > step:
+                        played = controller.move_history[step]
+                        if played == puzzle.solution[step] or controller.get_board().is_checkmate():
+                            step += 1
+                            if step >= len(puzzle.solution) or controller.get_board().is_checkmate():
+                                finished = True
+                                score["attempted"] += 1
+                                score["solved"] += clean
+                                status = "Solved!" if clean else "Solved (with mistakes)"
+                            else:
+                                controller.apply_move(puzzle.solution[step])
+                                step += 1
+                                status = "Correct, keep going"
+                        else:
+                            clean = False
+                            status = f"{played.uci()} is not it, try again"
+                            controller.close()
+                            controller = start_at(step)
+
+            if display.apply_pending_resize():
+                input_handler.set_layout(display.layout)
+                needs_rerender = True
+            if display.has_pending_resize():
+                needs_rerender = True
+
+            if not needs_rerender:
+                clock.tick(FPS)
+                continue
+
+            last = controller.move_history[-1] if controller.move_history else None
+            display.draw_board(
+                controller.get_board(),
+                controller.get_selected_square(),
+                controller.get_legal_moves(),
+                highlight_moves=[("played", last)] if last else []
+            )
+            if controller.is_awaiting_promotion():
+                display.draw_promotion_dialog(color_is_white=controller.get_board().turn)
+            display.draw_puzzle_panel(puzzle, status, score["solved"], score["attempted"])
+            display.draw_back_button()
+            display.update()
+            needs_rerender = False
+            clock.tick(FPS)
+    finally:
+        controller.close()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Chess game with Stockfish AI and analysis")
+    EngineConfig.add_arguments(parser)
+    parser.add_argument("--connect", metavar="HOST[:PORT]", help="play on a LAN server (python -m src.net.server)")
+    parser.add_argument("--join", type=int, metavar="GAME_ID", help="join this server game instead of creating one")
+    parser.add_argument("--time-control", default=DEFAULT_TIME_CONTROL, metavar="MIN+INC",
+                        help="clock for new games, e.g. 5+3 (default: untimed)")
+    parser.add_argument("--color", choices=["white", "black"], default="white", help="color when creating a server game")
+    parser.add_argument("--record-traces", metavar="DIR",
+                        help="record every game's input and engine results for python -m src.tools.replay_trace")
+    args = parser.parse_args()
+    engine_config = EngineConfig.from_args(args)
+    time_control = parse_time_control(args.time_control) if args.time_control else None
+
+    if args.connect:
+        remote = NetworkClient(*NetworkClient.parse_address(args.connect))
+        if args.join is not None:
+            remote.join_game(args.join)
+        else:
+            remote.create_game(chess.WHITE if args.color == "white" else chess.BLACK)
+        print(f"Playing server game {remote.game_id} as {'White' if remote.color == chess.WHITE else 'Black'}")
+        run_game(engine_config=engine_config, remote=remote)
+        pygame.quit()
+        return
+
     while True:
-        menu = Menu()
-        menu_result = menu.show_start_screen()
+        with Menu() as menu:
+            menu_result = menu.show_start_screen()
         if menu_result is None:  # User closed window
             break
 
+        if menu_result[0] == "puzzles":
+            if run_puzzles() == "quit":
+                break
+            continue
+
+        if menu_result[0] == "resume":
+            result = run_game(resume_id=menu_result[1], engine_config=engine_config, trace_dir=args.record_traces)
+            if result == "quit":
+                break
+            continue
+
         if menu_result[0] == "human_vs_human":
             white_human, black_human = True, True
             white_diff, black_diff = 1, 1
@@ -191,7 +505,10 @@ def main():
             white_human=white_human,
             black_human=black_human,
             white_difficulty=white_diff,
-            black_difficulty=black_diff
+            black_difficulty=black_diff,
+            engine_config=engine_config,
+            time_control=time_control,
+            trace_dir=args.record_traces
         )
 
         if result == "quit":
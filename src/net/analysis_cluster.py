@@ -0,0 +1,340 @@
+# src/net/analysis_cluster.py
+import asyncio
+import itertools
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from src.config.settings import (
+    CLUSTER_HOST, CLUSTER_PORT, CLUSTER_BATCH_SIZE, CLUSTER_BATCH_TIMEOUT_S, CLUSTER_BACKUP_AFTER_S,
+    CLUSTER_MAX_ATTEMPTS
+)
+from src.core.analysis import position_cache_key
+from src.net import protocol
+
+
+class Batch:
+    """Positions searched together; runs on one worker, or two after a retry or backup."""
+
+    def __init__(self, batch_id, keys, fens, budget, multipv):
+        self.batch_id = batch_id
+        self.keys = keys
+        self.fens = fens
+        self.budget = budget
+        self.multipv = multipv
+        self.attempts = 0
+        self.sent_at = None      # first dispatch of the current attempt
+        self.owners = set()      # workers running it right now
+
+
+class WorkerLink:
+    """Coordinator side of one connected worker process."""
+
+    def __init__(self, name, writer, engines):
+        self.name = name
+        self.writer = writer
+        self.engines = engines
+        self.queue = deque()     # batches assigned but not sent yet; other workers may steal them
+        self.in_flight = {}      # batch id -> (Batch, sent at)
+        self.completed = 0
+
+    def has_idle_engines(self):
+        return sum(len(batch.keys) for batch, _ in self.in_flight.values()) < self.engines
+
+    def load(self):
+        return (len(self.queue) + len(self.in_flight)) / self.engines
+
+
+class AnalysisCoordinator:
+    """Hands batches of positions to remote analysis workers over TCP.
+
+    Submitted positions are de-duplicated against the same position in
+    flight under the same budget and MultiPV (callers check their own
+    analysis cache first), cut into
+    batches and spread over the workers' queues by load. A worker that runs
+    dry steals half of the longest queue, then runs a backup copy of a
+    straggling batch; the first answer wins. Batches of a worker that
+    disconnects or times out are retried on the others.
+
+    The coordinator runs on its own event loop thread so that the
+    synchronous ChessAnalysis can use it; submit() returns
+    concurrent.futures.Future objects.
+    """
+
+    def __init__(self, host=CLUSTER_HOST, port=CLUSTER_PORT, batch_size=CLUSTER_BATCH_SIZE):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.workers = []
+        self.unassigned = deque()    # batches waiting for a first worker
+        self.batches = {}            # batch id -> Batch without a result yet
+        self.stats = {"positions": 0, "deduplicated": 0, "batches": 0, "stolen": 0, "retried": 0,
+                      "backups": 0, "failed": 0}
+        self.loop = None
+        self._pending = {}           # (position key, limits, multipv) -> Future shared by every submit of it
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_error = None
+        self._workers_changed = threading.Condition()
+
+    def start(self):
+        """Start listening for workers on a background thread; returns self."""
+        self._thread = threading.Thread(target=self._run, name="analysis-coordinator", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            raise self._start_error
+        return self
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            server = self.loop.run_until_complete(asyncio.start_server(self._handle_worker, self.host, self.port))
+        except OSError as e:
+            self._start_error = e
+            self._ready.set()
+            self.loop.close()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        watchdog = self.loop.create_task(self._watchdog())
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            watchdog.cancel()
+            server.close()
+            for worker in self.workers:
+                worker.writer.close()
+            self.loop.run_until_complete(server.wait_closed())
+            self.loop.close()
+
+    def close(self):
+        """Stop the coordinator; positions still pending resolve to None."""
+        if self._thread is None:
+            return
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_result(None)
+
+    def wait_for_workers(self, count, timeout=None):
+        """Block until at least `count` workers are connected; returns whether they are."""
+        with self._workers_changed:
+            return self._workers_changed.wait_for(lambda: len(self.workers) >= count, timeout)
+
+    def _notify_workers_changed(self):
+        with self._workers_changed:
+            self._workers_changed.notify_all()
+
+    # -- Submitting work (any thread) --
+
+    def submit(self, fens, budget, multipv=1):
+        """A Future per FEN resolving to its ChessAnalysis-style result (None if it failed)."""
+        if self.loop is None or self.loop.is_closed():
+            raise RuntimeError("AnalysisCoordinator is not running: call start() before submit()")
+        futures = []
+        new_keys, new_fens = [], []
+        limits = (budget.depth, budget.movetime, budget.nodes)
+        with self._lock:
+            for fen in fens:
+                # A deeper or wider search of the same position is a different request
+                key = (position_cache_key(fen), limits, multipv)
+                future = self._pending.get(key)
+                if future is None:
+                    future = self._pending[key] = Future()
+                    new_keys.append(key)
+                    new_fens.append(fen)
+                else:
+                    self.stats["deduplicated"] += 1
+                futures.append(future)
+            self.stats["positions"] += len(new_keys)
+        if new_keys:
+            self.loop.call_soon_threadsafe(self._enqueue, new_keys, new_fens, budget, multipv)
+        return futures
+
+    def analyze_many(self, fens, budget, multipv=1):
+        """Blocking submit(): results in the order of `fens`."""
+        return [future.result() for future in self.submit(fens, budget, multipv)]
+
+    # -- Scheduling (event loop thread) --
+
+    def _enqueue(self, keys, fens, budget, multipv):
+        # Smaller batches when the job is small for the cluster, so the last
+        # round does not leave most engines idle
+        engines = sum(worker.engines for worker in self.workers) or 1
+        size = max(1, min(self.batch_size, -(-len(keys) // (4 * engines))))
+        for start in range(0, len(keys), size):
+            batch = Batch(next(self._ids), keys[start:start + size], fens[start:start + size], budget, multipv)
+            self.batches[batch.batch_id] = batch
+            self.stats["batches"] += 1
+            self._assign(batch)
+        self._pump_all()
+
+    def _assign(self, batch, exclude=None):
+        """Queue `batch` on the least loaded worker other than `exclude` (the one that lost it)."""
+        workers = [worker for worker in self.workers if worker is not exclude]
+        if workers:
+            min(workers, key=WorkerLink.load).queue.append(batch)
+        else:
+            self.unassigned.append(batch)
+
+    def _pump_all(self):
+        for worker in list(self.workers):
+            self._pump(worker)
+
+    def _pump(self, worker):
+        while worker.has_idle_engines() and not worker.writer.is_closing():
+            batch = self._next_batch(worker)
+            if batch is None:
+                return
+            if not batch.owners:
+                batch.sent_at = time.monotonic()
+            batch.owners.add(worker)
+            worker.in_flight[batch.batch_id] = (batch, time.monotonic())
+            worker.writer.write(protocol.batch_frame(batch.batch_id, batch.budget, batch.multipv, batch.fens))
+
+    def _next_batch(self, worker):
+        for queue in (worker.queue, self.unassigned):
+            kept = []   # batches that timed out on this worker and still hold its slot: left for another
+            found = None
+            while queue and found is None:
+                batch = queue.popleft()
+                if batch.batch_id in worker.in_flight:
+                    kept.append(batch)
+                elif batch.batch_id in self.batches:
+                    found = batch
+            queue.extendleft(reversed(kept))
+            if found is not None:
+                return found
+        return self._steal(worker) or self._backup(worker)
+
+    def _steal(self, thief):
+        victims = [w for w in self.workers if w is not thief and w.queue]
+        if not victims:
+            return None
+        victim = max(victims, key=lambda w: len(w.queue))
+        count = (len(victim.queue) + 1) // 2
+        stolen = [victim.queue.pop() for _ in range(count)]
+        stolen.reverse()
+        # A batch that timed out on the thief stays with the victim
+        victim.queue.extend(batch for batch in stolen if batch.batch_id in thief.in_flight)
+        stolen = [batch for batch in stolen if batch.batch_id not in thief.in_flight]
+        if not stolen:
+            return None
+        thief.queue.extend(stolen)
+        self.stats["stolen"] += len(stolen)
+        return self._next_batch(thief)
+
+    def _backup(self, worker):
+        """Oldest batch running on a single other worker for at least CLUSTER_BACKUP_AFTER_S."""
+        now = time.monotonic()
+        candidates = [
+            batch for batch in self.batches.values()
+            if len(batch.owners) == 1 and worker not in batch.owners and batch.batch_id not in worker.in_flight
+            and now - batch.sent_at >= CLUSTER_BACKUP_AFTER_S
+        ]
+        if not candidates:
+            return None
+        self.stats["backups"] += 1
+        return min(candidates, key=lambda batch: batch.sent_at)
+
+    def _on_results(self, worker, batch_id, results):
+        worker.in_flight.pop(batch_id, None)
+        batch = self.batches.pop(batch_id, None)
+        if batch is not None and len(results) == len(batch.keys):
+            worker.completed += 1
+            batch.owners.clear()
+            self._resolve(batch.keys, results)
+        elif batch is not None:
+            print(f"[WARNING] Worker {worker.name} sent {len(results)} results for a batch of {len(batch.keys)}")
+            self.batches[batch_id] = batch
+            self._retry(batch, worker)
+        self._pump_all()
+
+    def _resolve(self, keys, results):
+        with self._lock:
+            futures = [self._pending.pop(key, None) for key in keys]
+        for future, result in zip(futures, results):
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    def _retry(self, batch, worker):
+        """`worker` lost `batch`: queue it again unless another worker is still on it."""
+        batch.owners.discard(worker)
+        if batch.batch_id not in self.batches or batch.owners:
+            return
+        batch.attempts += 1
+        if batch.attempts >= CLUSTER_MAX_ATTEMPTS:
+            self._give_up(batch)
+            return
+        self.stats["retried"] += 1
+        self._assign(batch, exclude=worker)
+
+    def _give_up(self, batch):
+        print(f"[ERROR] Giving up on batch {batch.batch_id} after {batch.attempts} attempts")
+        del self.batches[batch.batch_id]
+        for worker in self.workers:
+            worker.in_flight.pop(batch.batch_id, None)   # a late answer is ignored
+        self.stats["failed"] += len(batch.keys)
+        self._resolve(batch.keys, [None] * len(batch.keys))
+
+    async def _watchdog(self):
+        while True:
+            await asyncio.sleep(1.0)
+            now = time.monotonic()
+            for worker in list(self.workers):
+                for batch, sent_at in list(worker.in_flight.values()):
+                    if worker in batch.owners and now - sent_at > CLUSTER_BATCH_TIMEOUT_S:
+                        print(f"[WARNING] Batch {batch.batch_id} timed out on worker {worker.name}")
+                        # Stays in in_flight (holding a slot) until the worker answers or drops
+                        self._retry(batch, worker)
+                    elif (not batch.owners and batch.batch_id in self.batches and
+                          now - sent_at > CLUSTER_BATCH_TIMEOUT_S * CLUSTER_MAX_ATTEMPTS):
+                        self._give_up(batch)    # no other worker took it over
+            self._pump_all()
+
+    async def _handle_worker(self, reader, writer):
+        worker = None
+        try:
+            msg_type, payload = await protocol.read_frame(reader)
+            if msg_type != protocol.MSG_HELLO:
+                return
+            engines = max(1, protocol.BYTE_PAYLOAD.unpack(payload)[0])
+            worker = WorkerLink(writer.get_extra_info("peername"), writer, engines)
+            self.workers.append(worker)
+            self._notify_workers_changed()
+            self._pump(worker)
+            while True:
+                msg_type, payload = await protocol.read_frame(reader)
+                if msg_type == protocol.MSG_RESULTS:
+                    self._on_results(worker, *protocol.decode_results(payload))
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error, ValueError, KeyError):
+            pass
+        finally:
+            writer.close()
+            if worker is not None:
+                self._drop_worker(worker)
+
+    def _drop_worker(self, worker):
+        if worker not in self.workers:
+            return
+        self.workers.remove(worker)
+        self._notify_workers_changed()
+        if worker.in_flight:
+            print(f"[WARNING] Worker {worker.name} dropped with {len(worker.in_flight)} batches in flight")
+        queued, worker.queue = list(worker.queue), deque()
+        for batch in queued:
+            self._assign(batch)
+        for batch, _ in worker.in_flight.values():
+            self._retry(batch, worker)
+        worker.in_flight.clear()
+        self._pump_all()
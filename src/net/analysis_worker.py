@@ -0,0 +1,91 @@
+# src/net/analysis_worker.py
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import CLUSTER_PORT, CLUSTER_WORKER_ENGINES, CLUSTER_WORKER_HASH_MB
+from src.core.analysis import ChessAnalysis
+from src.core.analysis_policy import SearchBudget
+from src.core.engine_options import EngineOptions
+from src.net import protocol
+from src.net.engine_pool import EnginePool
+
+
+class AnalysisWorker:
+    """Searches the batches an AnalysisCoordinator sends on a pool of local engines.
+
+    Every engine runs one thread; the positions of a batch are spread over
+    the pool and the batch is answered once all of them are done.
+    """
+
+    def __init__(self, host, port=CLUSTER_PORT, engines=CLUSTER_WORKER_ENGINES, hash_mb=CLUSTER_WORKER_HASH_MB):
+        self.host = host
+        self.port = port
+        self.engines = max(1, min(255, engines))
+        self.hash_mb = hash_mb
+        self.executor = ThreadPoolExecutor(max_workers=self.engines)
+        self.pools = {}     # multipv -> EnginePool
+        self.batches_done = 0
+
+    def _pool(self, multipv):
+        pool = self.pools.get(multipv)
+        if pool is None:
+            options = EngineOptions(threads=1, hash_mb=self.hash_mb, multipv=multipv)
+            pool = self.pools[multipv] = EnginePool(lambda: ChessAnalysis(options=options), self.engines,
+                                                    self.executor)
+        return pool
+
+    async def run(self):
+        """Serve batches until the coordinator closes the connection."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(protocol.hello_frame(self.engines))
+        tasks = set()
+        try:
+            while True:
+                msg_type, payload = await protocol.read_frame(reader)
+                if msg_type == protocol.MSG_BATCH:
+                    task = asyncio.create_task(self._run_batch(writer, *protocol.decode_batch(payload)))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            print("[WARNING] Coordinator closed the connection")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            for pool in self.pools.values():
+                for engine in pool.engines:
+                    engine.close()
+
+    async def _run_batch(self, writer, batch_id, limits, multipv, fens):
+        budget = SearchBudget(*limits)
+        pool = self._pool(multipv)
+        results = await asyncio.gather(*(
+            pool.run(lambda analysis, fen=fen: analysis.analyze_position(fen, budget)) for fen in fens
+        ))
+        if not writer.is_closing():
+            writer.write(protocol.results_frame(batch_id, results))
+            self.batches_done += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remote analysis worker for an AnalysisCoordinator.")
+    parser.add_argument("--connect", required=True, metavar="HOST[:PORT]", help="coordinator address")
+    parser.add_argument("--engines", type=int, default=CLUSTER_WORKER_ENGINES, help="engine processes (1 thread each)")
+    parser.add_argument("--hash-mb", type=int, default=CLUSTER_WORKER_HASH_MB, help="hash per engine")
+    args = parser.parse_args()
+
+    host, _, port = args.connect.partition(":")
+    worker = AnalysisWorker(host, int(port) if port else CLUSTER_PORT, args.engines, args.hash_mb)
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"[FATAL] Cannot reach coordinator at {args.connect}: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
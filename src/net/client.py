@@ -0,0 +1,114 @@
+# src/net/client.py
+import queue
+import socket
+import threading
+
+from src.config.settings import SERVER_PORT
+from src.net import protocol
+
+
+class NetworkClient:
+    """Connects the pygame game loop to a ChessServer game.
+
+    A reader thread queues incoming frames; the game loop applies them with
+    apply_incoming() once per frame. Attached as a GameController listener,
+    it sends the local player's moves to the server.
+    """
+
+    def __init__(self, host, port=SERVER_PORT):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.game_id = None
+        self.color = None
+        self.initial_moves = []
+        self.controller = None
+        self.synced_plies = 0
+        self.result = None
+        self.last_error = None
+        self.incoming = queue.Queue()
+        self._reader = None
+
+    @classmethod
+    def parse_address(cls, address):
+        host, _, port = address.partition(":")
+        return host, int(port) if port else SERVER_PORT
+
+    def create_game(self, color, mode=protocol.MODE_HUMAN, difficulty=1):
+        self.sock.sendall(protocol.new_game_frame(mode, color, difficulty))
+        return self._await_game()
+
+    def join_game(self, game_id):
+        self.sock.sendall(protocol.join_frame(game_id))
+        return self._await_game()
+
+    def _await_game(self):
+        msg_type, payload = protocol.recv_frame(self.sock)
+        if msg_type == protocol.MSG_ERROR:
+            raise ConnectionError(f"server refused the game (error {payload[0]})")
+        self.game_id, self.color, self.initial_moves = protocol.decode_game(payload)
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        return self.game_id
+
+    def _read_loop(self):
+        try:
+            while True:
+                self.incoming.put(protocol.recv_frame(self.sock))
+        except (ConnectionError, OSError):
+            self.incoming.put((None, b""))
+
+    def attach(self, controller):
+        """Replay the server's moves so far and start mirroring moves."""
+        self.controller = controller
+        for move in self.initial_moves:
+            controller.apply_move(move)
+        self.synced_plies = len(controller.move_history)
+        controller.add_listener(self)
+
+    def on_move(self, move):
+        ply = len(self.controller.move_history) - 1
+        if ply >= self.synced_plies:   # a local move, not one we just applied from the server
+            self.synced_plies = ply + 1
+            self.sock.sendall(protocol.move_frame(ply, move))
+
+    def request_analysis(self):
+        self.sock.sendall(protocol.frame(protocol.MSG_ANALYSE))
+
+    def apply_incoming(self):
+        """Apply queued server messages to the controller; True if anything changed."""
+        changed = False
+        while True:
+            try:
+                msg_type, payload = self.incoming.get_nowait()
+            except queue.Empty:
+                return changed
+            if msg_type == protocol.MSG_MOVE:
+                ply, move = protocol.decode_move(payload)
+                if ply == len(self.controller.move_history):   # our own moves come back as echoes
+                    self.synced_plies = ply + 1
+                    changed |= self.controller.apply_move(move)
+            elif msg_type == protocol.MSG_ANALYSIS:
+                ply, result = protocol.decode_analysis(payload)
+                if ply < len(self.controller.analysis_history):
+                    self.controller.update_analysis(ply, result)
+                    changed = True
+            elif msg_type == protocol.MSG_OVER:
+                self.result = payload[0]
+                changed = True
+            elif msg_type == protocol.MSG_ERROR:
+                self.last_error = payload[0]
+                print(f"[WARNING] Server error {self.last_error}")
+            elif msg_type is None:
+                print("[WARNING] Lost connection to the server")
+                return changed
+
+    def can_move(self, board):
+        return board.turn == self.color
+
+    def close(self):
+        if self.controller is not None:
+            self.controller.remove_listener(self)
+        try:
+            self.sock.close()
+        except OSError:
+            pass
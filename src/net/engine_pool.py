@@ -0,0 +1,38 @@
+# src/net/engine_pool.py
+import asyncio
+
+
+class EnginePool:
+    """Up to `size` engine objects shared by many games, used from asyncio.
+
+    Engines are created lazily by `factory`; each call borrows one engine
+    and runs the blocking work on `executor`, so the event loop never waits
+    on an engine process.
+    """
+
+    def __init__(self, factory, size, executor):
+        self.factory = factory
+        self.size = size
+        self.executor = executor
+        self.engines = []
+        self._created = 0
+        self._idle = asyncio.Queue()
+
+    async def run(self, work):
+        """Result of `work(engine)` run on a pooled engine in the executor."""
+        loop = asyncio.get_running_loop()
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1   # reserve the slot before awaiting the engine start
+            engine = await loop.run_in_executor(self.executor, self._create)
+        else:
+            engine = await self._idle.get()
+        try:
+            return await loop.run_in_executor(self.executor, work, engine)
+        finally:
+            self._idle.put_nowait(engine)
+
+    def _create(self):
+        # Listed from the executor thread, so an engine whose caller was cancelled still gets closed
+        engine = self.factory()
+        self.engines.append(engine)
+        return engine
@@ -0,0 +1,208 @@
+# src/net/protocol.py
+import struct
+
+import chess
+
+from src.core.game_log import pack_move, unpack_move, SCORE_KINDS, SCORE_NAMES, RESULT_CODES
+
+# Every frame: <H payload length, <B message type, payload
+FRAME_HEADER = struct.Struct("<HB")
+
+# Client -> server
+MSG_NEW = ord("N")        # <BBB mode, color, difficulty
+MSG_JOIN = ord("J")       # <I game id
+MSG_WATCH = ord("S")      # <I game id: follow a game as a spectator
+MSG_ANALYSE = ord("Q")    # (empty) analyse the current position
+# Both directions
+MSG_MOVE = ord("M")       # <HH ply, packed move
+# Server -> client
+MSG_GAME = ord("G")       # <IBH game id, color (COLOR_SPECTATOR when watching), n moves; then n x <H packed moves
+MSG_ANALYSIS = ord("A")   # <HBiHB ply, score kind, value, packed best move, depth
+MSG_OVER = ord("O")       # <B result code (game_log.RESULT_CODES)
+MSG_ERROR = ord("E")      # <B error code
+# Analysis workers (src/net/analysis_cluster.py)
+MSG_HELLO = ord("W")      # worker -> coordinator: <B engines
+MSG_BATCH = ord("B")      # coordinator -> worker: <IHIIBB batch id, depth, movetime, nodes, multipv, n;
+                          #   then n x (<B length, FEN)
+MSG_RESULTS = ord("R")    # worker -> coordinator: <IB batch id, n; then n x (<BiBB kind, value, depth,
+                          #   n lines; then n lines x <BiH kind, value, packed move)
+
+NEW_PAYLOAD = struct.Struct("<BBB")
+JOIN_PAYLOAD = struct.Struct("<I")
+MOVE_PAYLOAD = struct.Struct("<HH")
+GAME_PAYLOAD = struct.Struct("<IBH")
+ANALYSIS_PAYLOAD = struct.Struct("<HBiHB")
+BYTE_PAYLOAD = struct.Struct("<B")
+BATCH_PAYLOAD = struct.Struct("<IHIIBB")
+RESULTS_PAYLOAD = struct.Struct("<IB")
+RESULT_ENTRY = struct.Struct("<BiBB")
+LINE_ENTRY = struct.Struct("<BiH")
+
+MODE_HUMAN = 0
+MODE_AI = 1
+
+ERR_BAD_MESSAGE = 1
+ERR_NO_GAME = 2
+ERR_GAME_FULL = 3
+ERR_NOT_YOUR_TURN = 4
+ERR_ILLEGAL_MOVE = 5
+ERR_NO_ENGINE = 6
+
+COLOR_CODES = {chess.WHITE: 0, chess.BLACK: 1, None: 2}
+COLOR_NAMES = {v: k for k, v in COLOR_CODES.items()}
+COLOR_SPECTATOR = COLOR_CODES[None]
+
+
+def frame(msg_type, payload=b""):
+    return FRAME_HEADER.pack(len(payload), msg_type) + payload
+
+
+def new_game_frame(mode, color, difficulty=1):
+    return frame(MSG_NEW, NEW_PAYLOAD.pack(mode, COLOR_CODES[color], difficulty))
+
+
+def join_frame(game_id):
+    return frame(MSG_JOIN, JOIN_PAYLOAD.pack(game_id))
+
+
+def watch_frame(game_id):
+    return frame(MSG_WATCH, JOIN_PAYLOAD.pack(game_id))
+
+
+def move_frame(ply, move):
+    return frame(MSG_MOVE, MOVE_PAYLOAD.pack(ply, pack_move(move)))
+
+
+def game_frame(game_id, color, moves):
+    payload = GAME_PAYLOAD.pack(game_id, COLOR_CODES[color], len(moves))
+    return frame(MSG_GAME, payload + struct.pack(f"<{len(moves)}H", *map(pack_move, moves)))
+
+
+def analysis_frame(ply, result):
+    best = chess.Move.from_uci(result["best_move"]) if result.get("best_move") else None
+    return frame(MSG_ANALYSIS, ANALYSIS_PAYLOAD.pack(
+        ply, SCORE_KINDS.get(result.get("type"), 0), int(result.get("value") or 0), pack_move(best),
+        min(255, result.get("depth", 0))
+    ))
+
+
+def over_frame(result):
+    return frame(MSG_OVER, BYTE_PAYLOAD.pack(RESULT_CODES.get(result, 0)))
+
+
+def error_frame(code):
+    return frame(MSG_ERROR, BYTE_PAYLOAD.pack(code))
+
+
+def hello_frame(engines):
+    return frame(MSG_HELLO, BYTE_PAYLOAD.pack(engines))
+
+
+def batch_frame(batch_id, budget, multipv, fens):
+    """A batch of positions to search with the same SearchBudget (limits of 0 are unset)."""
+    payload = BATCH_PAYLOAD.pack(
+        batch_id, budget.depth or 0, budget.movetime or 0, budget.nodes or 0, multipv, len(fens)
+    )
+    for fen in fens:
+        data = fen.encode()
+        payload += bytes([len(data)]) + data
+    return frame(MSG_BATCH, payload)
+
+
+def results_frame(batch_id, results):
+    """Analysis results (ChessAnalysis form, None for a failed search) of a batch, in order."""
+    payload = RESULTS_PAYLOAD.pack(batch_id, len(results))
+    for result in results:
+        if result is None:
+            payload += RESULT_ENTRY.pack(0, 0, 0, 0)
+            continue
+        lines = result.get("lines", [])
+        payload += RESULT_ENTRY.pack(
+            SCORE_KINDS.get(result["type"], 0), int(result["value"]), min(255, result.get("depth", 0)), len(lines)
+        )
+        payload += b"".join(
+            LINE_ENTRY.pack(SCORE_KINDS.get(line["type"], 0), int(line["value"]),
+                            pack_move(chess.Move.from_uci(line["move"])))
+            for line in lines
+        )
+    return frame(MSG_RESULTS, payload)
+
+
+def decode_move(payload):
+    ply, packed = MOVE_PAYLOAD.unpack(payload)
+    return ply, unpack_move(packed)
+
+
+def decode_game(payload):
+    """(game id, color, moves)"""
+    game_id, color, count = GAME_PAYLOAD.unpack_from(payload)
+    packed = struct.unpack_from(f"<{count}H", payload, GAME_PAYLOAD.size)
+    return game_id, COLOR_NAMES[color], [unpack_move(value) for value in packed]
+
+
+def decode_analysis(payload):
+    """(ply, analysis dict in ChessAnalysis form without lines)"""
+    ply, kind, value, best, depth = ANALYSIS_PAYLOAD.unpack(payload)
+    best_move = unpack_move(best)
+    return ply, {
+        "type": SCORE_NAMES.get(kind), "value": value,
+        "best_move": best_move.uci() if best_move else None, "depth": depth
+    }
+
+
+def decode_batch(payload):
+    """(batch id, (depth, movetime, nodes) with None for unset limits, multipv, FENs)"""
+    batch_id, depth, movetime, nodes, multipv, count = BATCH_PAYLOAD.unpack_from(payload)
+    offset = BATCH_PAYLOAD.size
+    fens = []
+    for _ in range(count):
+        length = payload[offset]
+        fens.append(payload[offset + 1:offset + 1 + length].decode())
+        offset += 1 + length
+    return batch_id, (depth or None, movetime or None, nodes or None), multipv, fens
+
+
+def decode_results(payload):
+    """(batch id, list of analysis dicts or None)"""
+    batch_id, count = RESULTS_PAYLOAD.unpack_from(payload)
+    offset = RESULTS_PAYLOAD.size
+    results = []
+    for _ in range(count):
+        kind, value, depth, n_lines = RESULT_ENTRY.unpack_from(payload, offset)
+        offset += RESULT_ENTRY.size
+        lines = []
+        for _ in range(n_lines):
+            line_kind, line_value, packed = LINE_ENTRY.unpack_from(payload, offset)
+            offset += LINE_ENTRY.size
+            lines.append({"move": unpack_move(packed).uci(), "type": SCORE_NAMES[line_kind], "value": line_value})
+        if kind == 0:
+            results.append(None)
+            continue
+        results.append({
+            "type": SCORE_NAMES[kind], "value": value,
+            "best_move": lines[0]["move"] if lines else None,
+            "lines": lines, "depth": depth
+        })
+    return batch_id, results
+
+
+async def read_frame(reader):
+    """(message type, payload) from an asyncio StreamReader; raises IncompleteReadError on EOF."""
+    length, msg_type = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    return msg_type, await reader.readexactly(length) if length else b""
+
+
+def recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def recv_frame(sock):
+    """(message type, payload) from a blocking socket."""
+    length, msg_type = FRAME_HEADER.unpack(recv_exactly(sock, FRAME_HEADER.size))
+    return msg_type, recv_exactly(sock, length) if length else b""
@@ -0,0 +1,336 @@
+# src/net/server.py
+import argparse
+import asyncio
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+
+from src.config.settings import (
+    SERVER_HOST, SERVER_PORT, SERVER_ENGINE_WORKERS, SERVER_ENGINES_PER_LEVEL, SERVER_MAX_WRITE_BUFFER,
+    AI_HASH_MB, ANALYSIS_HASH_MB
+)
+from src.core.analysis import ChessAnalysis
+from src.core.broadcast import BroadcastChannel
+from src.core.engine_options import EngineOptions
+from src.core.game_controller import GameController
+from src.core.stockfish_player import StockfishPlayer
+from src.net import protocol
+from src.net.engine_pool import EnginePool
+
+
+class Connection:
+    """One TCP client; writes are buffered and never awaited by game logic."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.session = None
+        self.color = None
+
+    def send(self, data):
+        if self.writer.is_closing():
+            return
+        self.writer.write(data)
+        if self.writer.transport.get_write_buffer_size() > SERVER_MAX_WRITE_BUFFER:
+            print("[WARNING] Dropping client that stopped reading")
+            self.writer.close()
+
+
+class GameSession:
+    """A GameController plus the connections seated at it and its spectators.
+
+    Both controller seats are human; the server itself plays `ai_color`
+    through the shared engine pool, so the controller never blocks.
+    Spectators follow the game through a BroadcastChannel: each is a
+    cursor into its shared delta log, and a late joiner starts from the
+    channel's snapshot. The controller keeps one analysis entry per
+    position (None until a client asks for it), so analyses reach the
+    spectators as deltas too.
+    """
+
+    def __init__(self, game_id, ai_color=None, difficulty=1):
+        self.game_id = game_id
+        self.controller = GameController()
+        self.controller.save_current_analysis(None)
+        self.seats = {chess.WHITE: None, chess.BLACK: None}
+        self.ai_color = ai_color
+        self.difficulty = difficulty
+        self.channel = BroadcastChannel(self.controller)
+        self.spectators = {}    # Connection -> Subscription
+
+    def broadcast(self, data, spectators=False):
+        for conn in self.seats.values():
+            if conn is not None:
+                conn.send(data)
+        if spectators:
+            for conn in self.spectators:
+                conn.send(data)
+
+    def update_spectators(self):
+        """Send every spectator what it has not seen; each delta is encoded once for all of them."""
+        encoded = {}
+        for conn, subscription in self.spectators.items():
+            snapshot, deltas = subscription.poll()
+            if snapshot is None and any(delta.kind == "undo" for delta in deltas):
+                snapshot = self.channel.snapshot()   # the protocol has no undo: resend the game
+                subscription.cursor = snapshot.seq
+            if snapshot is not None:
+                conn.send(self._snapshot_frames(snapshot))
+                continue
+            for delta in deltas:
+                data = encoded.get(delta.seq)
+                if data is None:
+                    data = encoded[delta.seq] = _delta_frame(delta)
+                conn.send(data)
+
+    def _snapshot_frames(self, snapshot):
+        data = protocol.game_frame(self.game_id, None, snapshot.moves)
+        for ply, result in enumerate(snapshot.analyses):
+            if result is not None:
+                data += protocol.analysis_frame(ply, result)
+        return data
+
+    def close(self):
+        """Tell the remaining spectators the game is gone and stop broadcasting."""
+        for conn in self.spectators:
+            conn.send(protocol.over_frame("*"))
+            conn.session = None
+        self.spectators.clear()
+        self.channel.close()
+
+    def free_color(self, preferred):
+        for color in (preferred, not preferred):
+            if self.seats[color] is None and color != self.ai_color:
+                return color
+        return None
+
+    def is_empty(self):
+        return all(conn is None for conn in self.seats.values())
+
+
+def _delta_frame(delta):
+    if delta.kind == "move":
+        return protocol.move_frame(delta.ply, delta.data)
+    return protocol.analysis_frame(delta.ply, delta.data) if delta.data is not None else b""
+
+
+class ChessServer:
+    """Hosts many games on one asyncio event loop."""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, engine_workers=SERVER_ENGINE_WORKERS):
+        self.host = host
+        self.port = port
+        self.games = {}
+        self.next_game_id = 1
+        self.server = None
+        # Engines share the worker threads, one search thread each
+        self.executor = ThreadPoolExecutor(max_workers=max(1, engine_workers))
+        self.ai_pools = {}
+        self.analysis_pool = EnginePool(
+            lambda: ChessAnalysis(options=EngineOptions(1, ANALYSIS_HASH_MB // 4, 1)),
+            max(1, engine_workers), self.executor
+        )
+        self.ai_tasks = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in list(self.ai_tasks):
+            task.cancel()
+        # Cancelled tasks leave their searches running on the executor: stop
+        # them and wait for the threads before the engines quit under them
+        pools = list(self.ai_pools.values()) + [self.analysis_pool]
+        for pool in self.ai_pools.values():
+            for engine in pool.engines:
+                engine.stop()
+        await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
+        for pool in pools:
+            for engine in pool.engines:
+                engine.close()
+
+    def _ai_pool(self, difficulty):
+        pool = self.ai_pools.get(difficulty)
+        if pool is None:
+            pool = EnginePool(
+                lambda: StockfishPlayer(difficulty, EngineOptions(1, AI_HASH_MB)),
+                SERVER_ENGINES_PER_LEVEL, self.executor
+            )
+            self.ai_pools[difficulty] = pool
+        return pool
+
+    async def _handle_connection(self, reader, writer):
+        conn = Connection(reader, writer)
+        try:
+            while True:
+                msg_type, payload = await protocol.read_frame(reader)
+                try:
+                    await self._dispatch(conn, msg_type, payload)
+                except struct.error:
+                    conn.send(protocol.error_frame(protocol.ERR_BAD_MESSAGE))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._leave(conn)
+            writer.close()
+
+    async def _dispatch(self, conn, msg_type, payload):
+        if msg_type == protocol.MSG_NEW:
+            mode, color, difficulty = protocol.NEW_PAYLOAD.unpack(payload)
+            self._new_game(conn, mode, chess.BLACK if color == protocol.COLOR_CODES[chess.BLACK] else chess.WHITE,
+                           difficulty)
+        elif msg_type == protocol.MSG_JOIN:
+            self._join_game(conn, protocol.JOIN_PAYLOAD.unpack(payload)[0])
+        elif msg_type == protocol.MSG_WATCH:
+            self._watch_game(conn, protocol.JOIN_PAYLOAD.unpack(payload)[0])
+        elif msg_type == protocol.MSG_MOVE:
+            self._client_move(conn, *protocol.decode_move(payload))
+        elif msg_type == protocol.MSG_ANALYSE:
+            await self._analyse(conn)
+        else:
+            conn.send(protocol.error_frame(protocol.ERR_BAD_MESSAGE))
+
+    def _new_game(self, conn, mode, color, difficulty):
+        self._leave(conn)
+        ai_color = (not color) if mode == protocol.MODE_AI else None
+        session = GameSession(self.next_game_id, ai_color, max(1, min(20, difficulty)))
+        self.games[session.game_id] = session
+        self.next_game_id += 1
+        self._seat(conn, session, color)
+        self._schedule_ai(session)
+
+    def _join_game(self, conn, game_id):
+        session = self.games.get(game_id)
+        if session is None:
+            conn.send(protocol.error_frame(protocol.ERR_NO_GAME))
+            return
+        color = session.free_color(chess.BLACK)
+        if color is None:
+            conn.send(protocol.error_frame(protocol.ERR_GAME_FULL))
+            return
+        self._leave(conn)
+        self._seat(conn, session, color)
+
+    def _watch_game(self, conn, game_id):
+        session = self.games.get(game_id)
+        if session is None:
+            conn.send(protocol.error_frame(protocol.ERR_NO_GAME))
+            return
+        self._leave(conn)
+        conn.session, conn.color = session, None
+        session.spectators[conn] = session.channel.subscribe()
+        session.update_spectators()
+        if session.controller.game_over:
+            conn.send(protocol.over_frame(session.controller.get_board().result()))
+
+    def _seat(self, conn, session, color):
+        session.seats[color] = conn
+        conn.session, conn.color = session, color
+        conn.send(protocol.game_frame(session.game_id, color, session.controller.move_history))
+
+    def _leave(self, conn):
+        session = conn.session
+        if session is None:
+            return
+        if conn in session.spectators:
+            del session.spectators[conn]
+            conn.session = None
+            return
+        session.seats[conn.color] = None
+        conn.session = conn.color = None
+        if session.is_empty():
+            self.games.pop(session.game_id, None)
+            session.close()
+
+    def _client_move(self, conn, ply, move):
+        session = conn.session
+        if session is None:
+            conn.send(protocol.error_frame(protocol.ERR_NO_GAME))
+            return
+        controller = session.controller
+        if conn.color != controller.get_board().turn or ply != len(controller.move_history):
+            conn.send(protocol.error_frame(protocol.ERR_NOT_YOUR_TURN))
+            return
+        if move is None or not controller.apply_move(move):
+            conn.send(protocol.error_frame(protocol.ERR_ILLEGAL_MOVE))
+            return
+        self._after_move(session, ply, move)
+
+    def _after_move(self, session, ply, move):
+        session.controller.save_current_analysis(None)
+        session.broadcast(protocol.move_frame(ply, move))
+        session.update_spectators()
+        if session.controller.game_over:
+            session.broadcast(protocol.over_frame(session.controller.get_board().result()), spectators=True)
+        else:
+            self._schedule_ai(session)
+
+    def _schedule_ai(self, session):
+        controller = session.controller
+        if session.ai_color is None or controller.game_over or controller.get_board().turn != session.ai_color:
+            return
+        task = asyncio.get_running_loop().create_task(self._play_ai(session))
+        self.ai_tasks.add(task)
+        task.add_done_callback(self.ai_tasks.discard)
+
+    async def _play_ai(self, session):
+        controller = session.controller
+        ply = len(controller.move_history)
+        board = controller.get_board().copy()
+        move = await self._ai_pool(session.difficulty).run(lambda engine: engine.get_move(board))
+        if self.games.get(session.game_id) is not session or len(controller.move_history) != ply:
+            return  # game closed or moved on while the engine was thinking
+        if move and move.promotion is None and board.piece_type_at(move.from_square) == chess.PAWN and \
+                chess.square_rank(move.to_square) in (0, 7):
+            move = chess.Move(move.from_square, move.to_square, promotion=chess.QUEEN)
+        if move and controller.apply_move(move):
+            self._after_move(session, ply, move)
+
+    async def _analyse(self, conn):
+        session = conn.session
+        if session is None:
+            conn.send(protocol.error_frame(protocol.ERR_NO_GAME))
+            return
+        ply = len(session.controller.move_history)
+        fen = session.controller.get_fen()
+        result = await self.analysis_pool.run(lambda analysis: analysis.analyze_position(fen))
+        if result is None:
+            conn.send(protocol.error_frame(protocol.ERR_NO_ENGINE))
+            return
+        conn.send(protocol.analysis_frame(ply, result))
+        controller = session.controller
+        if (self.games.get(session.game_id) is session and ply < len(controller.analysis_history) and
+                controller.get_fen_at(ply) == fen):
+            controller.update_analysis(ply, result)
+            session.update_spectators()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LAN chess server.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--engine-workers", type=int, default=SERVER_ENGINE_WORKERS)
+    args = parser.parse_args()
+
+    server = ChessServer(args.host, args.port, args.engine_workers)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
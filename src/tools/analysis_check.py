@@ -0,0 +1,98 @@
+# src/tools/analysis_check.py
+import argparse
+import sys
+
+import chess
+
+from src.core.analysis import terminal_result
+from src.core.game_controller import GameController
+from src.core.scoring import analysis_cp, move_quality, win_percent
+
+# (name, moves from the start, White's expected win% in the final position, within 5)
+TERMINAL_GAMES = [
+    ("White checkmated (fool's mate)", ["f2f3", "e7e5", "g2g4", "d8h4"], 0),
+    ("Black checkmated (scholar's mate)", ["e2e4", "e7e5", "f1c4", "b8c6", "d1h5", "g8f6", "h5f7"], 100),
+    ("stalemate", None, 50),
+]
+STALEMATE_FEN = "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"
+
+
+def _final_board(moves):
+    if moves is None:
+        return chess.Board(STALEMATE_FEN)
+    board = chess.Board()
+    for uci in moves:
+        board.push_uci(uci)
+    return board
+
+
+def check_terminal_scores():
+    """Failure messages for positions without legal moves that are not scored as won, lost or drawn."""
+    failures = []
+    for name, moves, expected in TERMINAL_GAMES:
+        board = _final_board(moves)
+        result = terminal_result(board.fen())
+        win = win_percent(analysis_cp(result, board.turn))
+        if abs(win - expected) > 5:   # win% saturates at +-CP_CLAMP
+            failures.append(f"{name}: White's win% is {win:.1f}, expected {expected}")
+        if moves is None:
+            continue
+        # The mating move, found by the search before it or scored from the mated position: no loss
+        played = board.pop()
+        mover = board.turn
+        mate_in_one = 1 if mover == chess.WHITE else -1
+        before = {"type": "mate", "value": mate_in_one, "best_move": played.uci(), "depth": 20,
+                  "lines": [{"move": played.uci(), "type": "mate", "value": mate_in_one}]}
+        for lines in (before["lines"], []):
+            quality = move_quality(played, dict(before, lines=lines), result, mover)
+            if quality is None or quality["cpl"] != 0 or quality["accuracy"] < 99:
+                failures.append(f"{name}: the mating move {played.uci()} is rated {quality}")
+    return failures
+
+
+def _analysis(value):
+    return {"type": "cp", "value": value, "best_move": None, "lines": [], "depth": 10}
+
+
+def check_history_alignment():
+    """Failure messages where undo or re-enabling analysis leaves analysis_history off by an entry.
+
+    Follows the game loop: one entry per position (None while analysis
+    is off), replaced in place when the position is analysed again.
+    """
+    failures = []
+    controller = GameController()
+    try:
+        controller.save_current_analysis(_analysis(0))
+        for ply, uci in enumerate(["e2e4", "e7e5", "g1f3", "b8c6"]):
+            controller.apply_move(chess.Move.from_uci(uci))
+            controller.save_current_analysis(None if ply >= 2 else _analysis(ply + 1))
+        # Analysis switched back on: the current position's None entry is replaced
+        controller.save_current_analysis(_analysis(40))
+        if len(controller.analysis_history) != 5 or controller.analysis_history[-1]["value"] != 40:
+            failures.append(f"re-enabling analysis: {len(controller.analysis_history)} entries for 4 plies")
+        for plies in (3, 2):
+            controller.undo_last_move()
+            controller.save_current_analysis(_analysis(100 + plies))
+            history = controller.analysis_history
+            if len(history) != plies + 1 or history[-1]["value"] != 100 + plies:
+                failures.append(f"undo to {plies} plies: {len(history)} analysis entries")
+        if controller.analysis_history[1]["value"] != 1:
+            failures.append("undo replaced the analysis of an earlier ply")
+    finally:
+        controller.close()
+    return failures
+
+
+def main():
+    argparse.ArgumentParser(description="Consistency checks of analysis scoring that need no engine.").parse_args()
+    failures = check_terminal_scores() + check_history_alignment()
+    for failure in failures:
+        print(f"[ERROR] {failure}")
+    if failures:
+        sys.exit(1)
+    print("Analysis checks passed")
+
+
+if __name__ == "__main__":
+    main()
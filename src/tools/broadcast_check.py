@@ -0,0 +1,116 @@
+# src/tools/broadcast_check.py
+import argparse
+import random
+import sys
+import time
+
+from src.core.broadcast import BroadcastChannel, GameView, Subscription
+from src.core.game_controller import GameController
+
+
+def _analysis(rng, depth):
+    return {"type": "cp", "value": rng.randint(-300, 300), "best_move": None, "lines": [], "depth": depth}
+
+
+def _step(controller, rng):
+    """A random game event to apply: a move (with its analysis), an undo, or a deeper analysis of a past ply.
+
+    Moves that end the game are avoided, since a finished game refuses undos.
+    """
+    board = controller.get_board()
+    moves = [move for move in board.legal_moves if not _ends_game(board, move)]
+    roll = rng.random()
+    if controller.move_history and (roll < 0.1 or not moves):
+        return controller.undo_last_move
+    if roll < 0.4 and controller.analysis_history:
+        ply = rng.randrange(len(controller.analysis_history))
+        result = _analysis(rng, rng.randint(12, 30))
+        return lambda: controller.update_analysis(ply, result)
+    move, result = rng.choice(moves), _analysis(rng, 10)
+    return lambda: (controller.apply_move(move), controller._save_analysis(result))
+
+
+def _ends_game(board, move):
+    board.push(move)
+    try:
+        return board.is_game_over()
+    finally:
+        board.pop()
+
+
+class _CountingSubscription(Subscription):
+    def __init__(self, channel, stats):
+        super().__init__(channel)
+        self.stats = stats
+
+    def poll(self):
+        snapshot, deltas = super().poll()
+        self.stats["polls"] += 1
+        self.stats["snapshots"] += snapshot is not None
+        self.stats["deltas"] += len(deltas)
+        return snapshot, deltas
+
+
+def _matches(view, controller):
+    return (view.moves == controller.move_history and view.analyses == controller.analysis_history and
+            view.board.fen() == controller.get_fen())
+
+
+def check(views, events, log_size, max_interval, seed=1):
+    """Play `events` random events to `views` viewers polling every 1..max_interval events.
+
+    Returns (mismatches, stats); a view is compared with the controller
+    right after each of its polls and once more at the end.
+    """
+    rng = random.Random(seed)
+    controller = GameController()
+    channel = BroadcastChannel(controller, log_size)
+    stats = {"publish_s": 0.0, "poll_s": 0.0, "polls": 0, "snapshots": 0, "deltas": 0}
+    viewers = [(GameView(_CountingSubscription(channel, stats)), rng.randint(1, max_interval)) for _ in range(views)]
+    for view, _ in viewers:
+        view.refresh()
+    mismatches = 0
+    for event in range(1, events + 1):
+        action = _step(controller, rng)
+        started = time.perf_counter()
+        action()
+        stats["publish_s"] += time.perf_counter() - started
+        polled = [view for view, interval in viewers if event % interval == 0]
+        started = time.perf_counter()
+        for view in polled:
+            view.refresh()
+        stats["poll_s"] += time.perf_counter() - started
+        mismatches += sum(not _matches(view, controller) for view in polled)
+    for view, _ in viewers:
+        view.refresh()
+        mismatches += not _matches(view, controller)
+    channel.close()
+    stats["plies"] = len(controller.move_history)
+    stats["seq"] = channel.seq
+    return mismatches, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadcast fan-out check: many viewers polling at different "
+                                                 "rates must all mirror the game exactly.")
+    parser.add_argument("--views", type=int, default=3000)
+    parser.add_argument("--events", type=int, default=600, help="moves, undos and analysis updates")
+    parser.add_argument("--log-size", type=int, default=128,
+                        help="deltas the channel keeps (small, so slow viewers also resync from snapshots)")
+    parser.add_argument("--max-interval", type=int, default=200, help="slowest viewer polls every N events")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    mismatches, stats = check(args.views, args.events, args.log_size, args.max_interval, args.seed)
+    print(f"{args.views} views, {args.events} events ({stats['seq']} deltas, {stats['plies']} plies at the end)")
+    print(f"event (controller update + publish): {stats['publish_s'] * 1e6 / args.events:.1f} us  "
+          f"poll: {stats['poll_s'] * 1e6 / max(1, stats['polls']):.1f} us/poll over {stats['polls']} polls, "
+          f"{stats['snapshots']} snapshot resyncs, {stats['deltas']} deltas applied")
+    if mismatches:
+        print(f"[ERROR] {mismatches} view checks did not match the game")
+        sys.exit(1)
+    print("Every view matched the game")
+
+
+if __name__ == "__main__":
+    main()
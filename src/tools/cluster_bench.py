@@ -0,0 +1,88 @@
+# src/tools/cluster_bench.py
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import chess
+
+from src.core.analysis_policy import SearchBudget
+from src.net.analysis_cluster import AnalysisCoordinator
+
+
+def random_positions(count, seed=1):
+    """Distinct positions from random playouts."""
+    rng = random.Random(seed)
+    fens = set()
+    while len(fens) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(4, 60)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        fens.add(board.fen())
+    return sorted(fens)
+
+
+def run(worker_count, engines, fens, budget, kill_after=None):
+    """Analyse `fens` on `worker_count` local worker processes; returns (seconds, failed, stats)."""
+    coordinator = AnalysisCoordinator(host="127.0.0.1", port=0).start()
+    workers = [
+        subprocess.Popen([sys.executable, "-m", "src.net.analysis_worker",
+                          "--connect", f"127.0.0.1:{coordinator.port}", "--engines", str(engines)])
+        for _ in range(worker_count)
+    ]
+    try:
+        if not coordinator.wait_for_workers(worker_count, timeout=30):
+            raise RuntimeError("workers did not connect")
+        if kill_after is not None:
+            threading.Timer(kill_after, workers[0].kill).start()
+        started = time.perf_counter()
+        # Every position twice: the repeats must be served by de-duplication
+        results = coordinator.analyze_many(fens + fens, budget)
+        elapsed = time.perf_counter() - started
+        return elapsed, sum(result is None for result in results), dict(coordinator.stats)
+    finally:
+        coordinator.close()
+        for worker in workers:
+            worker.kill()
+            worker.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed analysis throughput vs. worker count (localhost).")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to try")
+    parser.add_argument("--engines", type=int, default=1, help="engines per worker")
+    parser.add_argument("--positions", type=int, default=200)
+    # Fixed work per position: a movetime budget fills whatever time it gets,
+    # so workers sharing cores would look like they scale
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument("--depth", type=int, help="depth per position (default 12)")
+    limit.add_argument("--nodes", type=int, help="nodes per position")
+    parser.add_argument("--kill-one", type=float, metavar="SECONDS",
+                        help="kill one worker this long into each run to exercise retries")
+    args = parser.parse_args()
+
+    fens = random_positions(args.positions)
+    budget = SearchBudget(nodes=args.nodes) if args.nodes else SearchBudget(depth=args.depth or 12)
+    cores = os.cpu_count() or 1
+    if max(args.workers) * args.engines > cores:
+        print(f"[WARNING] {max(args.workers) * args.engines} engines on {cores} cores: "
+              f"local workers share cores, so scaling is capped at x{max(1, cores // args.engines)}")
+    baseline = None
+    for count in args.workers:
+        elapsed, failed, stats = run(count, args.engines, fens, budget, args.kill_one if count > 1 else None)
+        rate = len(fens) / elapsed
+        baseline = baseline or rate / count
+        print(f"{count} workers x {args.engines} engines: {rate:.1f} positions/s "
+              f"(x{rate / baseline:.2f}, ideal x{count}), {failed} failed, "
+              f"dedup {stats['deduplicated']}, stolen {stats['stolen']}, retried {stats['retried']}, "
+              f"backups {stats['backups']}")
+
+
+if __name__ == "__main__":
+    main()
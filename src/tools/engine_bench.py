@@ -0,0 +1,97 @@
+# src/tools/engine_bench.py
+import argparse
+import subprocess
+
+from src.config.settings import STOCKFISH_PATH, ENGINE_CORES
+
+# Opening, middlegame and endgame positions so the average isn't skewed by one phase
+BENCH_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r1bq1rk1/pp2bppp/2n1pn2/2pp4/3P4/2PBPN2/PP1N1PPP/R1BQ1RK1 w - - 0 8",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+]
+
+
+class UciProcess:
+    """Minimal UCI pipe, enough to read the engine's own nodes/nps reports."""
+
+    def __init__(self, path):
+        self.process = subprocess.Popen(
+            [path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True, bufsize=1
+        )
+        self.send("uci")
+        self.wait_for("uciok")
+
+    def send(self, command):
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def wait_for(self, prefix):
+        lines = []
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError("engine closed its output")
+            lines.append(line.strip())
+            if line.startswith(prefix):
+                return lines
+
+    def configure(self, threads, hash_mb):
+        self.send(f"setoption name Threads value {threads}")
+        self.send(f"setoption name Hash value {hash_mb}")
+        self.send("ucinewgame")
+        self.send("isready")
+        self.wait_for("readyok")
+
+    def search(self, fen, movetime_ms):
+        """(nodes, nps) from the last info line reporting them."""
+        self.send(f"position fen {fen}")
+        self.send(f"go movetime {movetime_ms}")
+        nodes = nps = 0
+        for line in self.wait_for("bestmove"):
+            parts = line.split()
+            if parts[:1] == ["info"]:
+                if "nodes" in parts:
+                    nodes = int(parts[parts.index("nodes") + 1])
+                if "nps" in parts:
+                    nps = int(parts[parts.index("nps") + 1])
+        return nodes, nps
+
+    def close(self):
+        self.send("quit")
+        self.process.wait(timeout=5)
+
+
+def thread_counts(max_threads):
+    counts, n = [], 1
+    while n < max_threads:
+        counts.append(n)
+        n *= 2
+    return counts + [max_threads]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure engine nodes/s against thread count.")
+    parser.add_argument("--max-threads", type=int, default=ENGINE_CORES)
+    parser.add_argument("--movetime", type=int, default=3000, help="ms per position")
+    parser.add_argument("--hash-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    engine = UciProcess(STOCKFISH_PATH)
+    print(f"{'threads':>7} {'nodes/s':>12} {'speedup':>8} {'efficiency':>10}")
+    base = None
+    try:
+        for threads in thread_counts(max(1, args.max_threads)):
+            engine.configure(threads, args.hash_mb)
+            results = [engine.search(fen, args.movetime) for fen in BENCH_FENS]
+            nps = sum(r[1] for r in results) // len(results)
+            base = base or nps or 1
+            speedup = nps / base
+            print(f"{threads:>7} {nps:>12,} {speedup:>7.2f}x {speedup / threads:>9.0%}")
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# src/tools/extract_puzzles.py
+import argparse
+import itertools
+import time
+
+from src.config.settings import PUZZLE_WORKERS, PUZZLE_CHECK_DEPTH
+from src.core.game_log import GameLibrary
+from src.core.puzzles import PuzzleStore, PuzzlePipeline, iter_saved_games, iter_pgn_games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract tactical puzzles from analysed games.")
+    parser.add_argument("pgn", nargs="*", help="PGN files with [%%eval] comments")
+    parser.add_argument("--saved", action="store_true", help="also scan the saved game library")
+    parser.add_argument("--workers", type=int, default=PUZZLE_WORKERS, help="parallel engine processes")
+    parser.add_argument("--depth", type=int, default=PUZZLE_CHECK_DEPTH, help="verification search depth")
+    args = parser.parse_args()
+
+    sources = [iter_pgn_games(path) for path in args.pgn]
+    if args.saved:
+        sources.insert(0, iter_saved_games(GameLibrary()))
+
+    store = PuzzleStore()
+    pipeline = PuzzlePipeline(store, workers=args.workers, depth=args.depth)
+    probe = pipeline.analysis_factory()
+    engine_available = probe.stockfish is not None
+    probe.close()
+    if not engine_available:
+        print("[FATAL] Puzzle extraction needs the Stockfish engine to verify candidates")
+        store.close()
+        raise SystemExit(2)
+
+    start = time.perf_counter()
+    stats = pipeline.run(itertools.chain(*sources))
+    elapsed = time.perf_counter() - start
+    print(f"{stats['games']} games, {stats['candidates']} candidates "
+          f"({stats['skipped']} already checked), {stats['checked']} verified, "
+          f"{stats['puzzles']} new puzzles in {elapsed:.1f}s")
+    if stats["failed"]:
+        print(f"[WARNING] The engine gave no result for {stats['failed']} candidates; they are retried next run")
+    print(f"Puzzle store now holds {store.count()} puzzles")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
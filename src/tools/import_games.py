@@ -0,0 +1,27 @@
+# src/tools/import_games.py
+import argparse
+import time
+
+from src.core.game_log import GameLibrary
+from src.core.position_index import PositionIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the position index from saved games and PGN files.")
+    parser.add_argument("pgn", nargs="*", help="PGN files to import")
+    parser.add_argument("--saved", action="store_true", help="also index the saved game library")
+    args = parser.parse_args()
+
+    index = PositionIndex()
+    start = time.perf_counter()
+    with index.bulk_loader() as loader:
+        if args.saved:
+            print(f"Saved games: {loader.add_saved_games(GameLibrary())} added")
+        for path in args.pgn:
+            print(f"{path}: {loader.add_pgn_file(path)} added")
+    print(f"Indexed {loader.games_added} games in {time.perf_counter() - start:.1f}s")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
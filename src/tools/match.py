@@ -0,0 +1,66 @@
+# src/tools/match.py
+import argparse
+import time
+
+import chess
+
+from src.core.clock import parse_time_control
+from src.core.game_controller import GameController
+
+
+def play_game(white_level, black_level, time_control, poll_s=0.002):
+    """Play one timed AI vs AI game; returns (result, plies, seconds, think times per side)."""
+    controller = GameController(
+        white_is_human=False, black_is_human=False,
+        white_difficulty=white_level, black_difficulty=black_level,
+        time_control=time_control
+    )
+    think = {chess.WHITE: [], chess.BLACK: []}
+    started = time.monotonic()
+    turn_started = started
+    try:
+        while not controller.game_over:
+            mover = controller.board.board.turn
+            if controller.update() and len(controller.move_history) and not controller.flagged:
+                now = time.monotonic()
+                think[mover].append(now - turn_started)
+                turn_started = now
+            else:
+                time.sleep(poll_s)
+        return controller.get_result(), len(controller.move_history), time.monotonic() - started, think
+    finally:
+        controller.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless timed AI vs AI match.")
+    parser.add_argument("--levels", type=int, nargs=2, default=[8, 12], metavar=("A", "B"))
+    parser.add_argument("--games", type=int, default=2, help="colors alternate every game")
+    parser.add_argument("--time-control", default="1+0.5", metavar="MIN+INC")
+    args = parser.parse_args()
+
+    base_s, increment_s = parse_time_control(args.time_control)
+    level_a, level_b = args.levels
+    levels = {"A": level_a, "B": level_b}
+    score = {"A": 0.0, "B": 0.0}   # keyed by player, not level: both may play at the same level
+    for game in range(args.games):
+        white, black = ("A", "B") if game % 2 == 0 else ("B", "A")
+        result, plies, seconds, think = play_game(levels[white], levels[black], (base_s, increment_s))
+        if result == "1-0":
+            score[white] += 1
+        elif result == "0-1":
+            score[black] += 1
+        else:
+            score[white] += 0.5
+            score[black] += 0.5
+        budget = 2 * base_s + plies * increment_s
+        moves = think[chess.WHITE] + think[chess.BLACK]
+        avg = sum(moves) / len(moves) if moves else 0.0
+        print(f"game {game + 1}: {white} level {levels[white]} (W) vs {black} level {levels[black]} (B) "
+              f"{result} in {plies} plies, "
+              f"{seconds:.1f}s of {budget:.1f}s clock budget, avg move {avg:.2f}s, max {max(moves, default=0):.2f}s")
+    print(f"Score: A (level {level_a}) {score['A']} - {score['B']} B (level {level_b})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# src/tools/net_load_test.py
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import chess
+
+from src.net import protocol
+from src.net.server import ChessServer
+
+
+class SimulatedClient:
+    """Plays random legal moves in one server game and times each move's echo."""
+
+    def __init__(self, reader, writer, max_plies, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.board = chess.Board()
+        self.color = None
+        self.game_id = None
+        self.max_plies = max_plies
+        self.latencies = latencies
+        self.sent_at = None
+
+    @classmethod
+    async def connect(cls, host, port, max_plies, latencies):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, max_plies, latencies)
+
+    async def start(self, request):
+        self.writer.write(request)
+        msg_type, payload = await protocol.read_frame(self.reader)
+        if msg_type != protocol.MSG_GAME:
+            raise RuntimeError(f"server refused the game (error {payload[0]})")
+        self.game_id, self.color, moves = protocol.decode_game(payload)
+        for move in moves:
+            self.board.push(move)
+
+    def _maybe_move(self):
+        if self.board.turn != self.color or self.board.is_game_over() or self.board.ply() >= self.max_plies:
+            return
+        move = random.choice(list(self.board.legal_moves))
+        self.sent_at = time.perf_counter()
+        self.writer.write(protocol.move_frame(self.board.ply(), move))
+
+    async def play(self):
+        """Play until the game ends or reaches max_plies; returns plies seen."""
+        self._maybe_move()
+        while not self.board.is_game_over() and self.board.ply() < self.max_plies:
+            msg_type, payload = await protocol.read_frame(self.reader)
+            if msg_type == protocol.MSG_MOVE:
+                ply, move = protocol.decode_move(payload)
+                if self.board.turn == self.color and self.sent_at is not None:
+                    self.latencies.append(time.perf_counter() - self.sent_at)
+                    self.sent_at = None
+                self.board.push(move)
+                self._maybe_move()
+            elif msg_type == protocol.MSG_OVER:
+                break
+            elif msg_type == protocol.MSG_ERROR:
+                raise RuntimeError(f"server error {payload[0]}")
+        self.writer.close()
+        return self.board.ply()
+
+
+async def _human_game(host, port, max_plies, latencies, spectators=0, mismatches=None):
+    white = await SimulatedClient.connect(host, port, max_plies, latencies)
+    await white.start(protocol.new_game_frame(protocol.MODE_HUMAN, chess.WHITE))
+    black = await SimulatedClient.connect(host, port, max_plies, latencies)
+    await black.start(protocol.join_frame(white.game_id))
+    # Spectators never move (no color) and must end up with the players' game
+    watchers = [await SimulatedClient.connect(host, port, max_plies, latencies) for _ in range(spectators)]
+    for watcher in watchers:
+        await watcher.start(protocol.watch_frame(white.game_id))
+    plies = await asyncio.gather(white.play(), black.play(), *(watcher.play() for watcher in watchers))
+    if mismatches is not None:
+        mismatches.extend(w for w in watchers if w.board.move_stack != white.board.move_stack)
+    return max(plies)
+
+
+async def _ai_game(host, port, max_plies, latencies, difficulty):
+    client = await SimulatedClient.connect(host, port, max_plies, latencies)
+    await client.start(protocol.new_game_frame(protocol.MODE_AI, chess.WHITE, difficulty))
+    return await client.play()
+
+
+async def run_load_test(host, port, games, max_plies, ai_games=0, difficulty=1, spawn=False, spectators=0):
+    server = None
+    if spawn:
+        server = ChessServer(host, port)
+        await server.start()
+        port = server.port
+    latencies = []
+    mismatches = []
+    start = time.perf_counter()
+    try:
+        tasks = [_human_game(host, port, max_plies, latencies, spectators, mismatches) for _ in range(games)]
+        tasks += [_ai_game(host, port, max_plies, latencies, difficulty) for _ in range(ai_games)]
+        plies = await asyncio.gather(*tasks)
+    finally:
+        if server is not None:
+            await server.close()
+    elapsed = time.perf_counter() - start
+
+    total = sum(plies)
+    print(f"{len(plies)} games ({games} human, {ai_games} vs AI), {total} moves in {elapsed:.2f}s "
+          f"-> {total / elapsed:,.0f} moves/s")
+    if latencies:
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"move round trip: median {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p99 {p99 * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+    if spectators:
+        print(f"{games * spectators} spectators, {len(mismatches)} ended with a different game than the players")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the LAN server with simulated clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="server port (0 with --spawn picks a free one)")
+    parser.add_argument("--spawn", action="store_true", help="run the server in this process")
+    parser.add_argument("--games", type=int, default=200, help="human vs human games (two clients each)")
+    parser.add_argument("--ai-games", type=int, default=0, help="games against the server's engine pool")
+    parser.add_argument("--difficulty", type=int, default=1)
+    parser.add_argument("--max-plies", type=int, default=120)
+    parser.add_argument("--spectators", type=int, default=0, help="spectators watching each human game")
+    args = parser.parse_args()
+    asyncio.run(run_load_test(
+        args.host, args.port, args.games, args.max_plies, args.ai_games, args.difficulty, args.spawn,
+        args.spectators
+    ))
+
+
+if __name__ == "__main__":
+    main()
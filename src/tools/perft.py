@@ -0,0 +1,158 @@
+# src/tools/perft.py
+import argparse
+import sys
+import time
+from multiprocessing import Pool
+
+import chess
+import chess.polyglot
+
+from src.core.board import ChessBoard
+
+# Standard perft positions with known node counts per depth (chessprogramming.org)
+STANDARD_POSITIONS = [
+    ("startpos", chess.STARTING_FEN,
+     [20, 400, 8902, 197281, 4865609, 119060324]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603, 193690690]),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624, 11030083]),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333, 15833292]),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487, 89941194]),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594, 164075551]),
+]
+
+
+class AttackMapMismatch(Exception):
+    """ChessBoard's incrementally updated attack maps disagree with a full recomputation."""
+
+
+def _check_attack_maps(board):
+    position = board.board
+    fresh = [position.attacks_mask(sq) if position.piece_type_at(sq) else 0 for sq in chess.SQUARES]
+    if board.attack_maps.piece_attacks != fresh:
+        squares = [chess.square_name(sq) for sq in chess.SQUARES if board.attack_maps.piece_attacks[sq] != fresh[sq]]
+        raise AttackMapMismatch(f"attack maps stale on {', '.join(squares)} after "
+                                f"{' '.join(move.uci() for move in position.move_stack)} in {position.fen()}")
+
+
+def perft(board, depth, table=None, check_maps=False):
+    """Leaf nodes of the legal move tree below `board`, a ChessBoard (restored on return).
+
+    Moves go through ChessBoard.make_move/undo_move, so the incremental
+    attack maps are part of what is measured. Depth 1 is counted in bulk
+    without making the moves, except with `check_maps`, which makes every
+    move and compares the attack maps with a full recomputation at each
+    node. With `table` (a dict), subtree counts are cached per (Zobrist
+    hash, depth), so transpositions are only counted once.
+    """
+    if check_maps:
+        _check_attack_maps(board)
+    if depth <= 0:
+        return 1
+    position = board.board
+    if depth == 1 and not check_maps:
+        return position.legal_moves.count()
+    if table is not None:
+        key = (chess.polyglot.zobrist_hash(position), depth)
+        cached = table.get(key)
+        if cached is not None:
+            return cached
+    nodes = 0
+    for move in list(position.legal_moves):
+        board.make_move(move)
+        nodes += perft(board, depth - 1, table, check_maps)
+        board.undo_move()
+    if table is not None:
+        table[key] = nodes
+    return nodes
+
+
+def _perft_after(args):
+    fen, move_uci, depth, use_table, check_maps = args
+    board = ChessBoard(fen)
+    board.make_move(chess.Move.from_uci(move_uci))
+    return move_uci, perft(board, depth - 1, {} if use_table else None, check_maps)
+
+
+def divide(fen, depth, use_table=False, jobs=1, check_maps=False):
+    """{move uci: leaf nodes} for every root move; roots are split across `jobs` processes."""
+    board = chess.Board(fen)
+    tasks = [(fen, move.uci(), depth, use_table, check_maps) for move in board.legal_moves]
+    if jobs > 1 and depth > 1:
+        with Pool(jobs) as pool:
+            return dict(pool.map(_perft_after, tasks, chunksize=1))
+    return dict(map(_perft_after, tasks))
+
+
+def run(fen, depth, use_table=False, jobs=1, show_divide=False, check_maps=False):
+    """Total leaf nodes and elapsed seconds; prints the divide table when asked."""
+    start = time.perf_counter()
+    if show_divide or jobs > 1:
+        counts = divide(fen, depth, use_table, jobs, check_maps)
+        nodes = sum(counts.values())
+    else:
+        counts = None
+        nodes = perft(ChessBoard(fen), depth, {} if use_table else None, check_maps)
+    elapsed = time.perf_counter() - start
+    if show_divide:
+        for move in sorted(counts):
+            print(f"  {move}: {counts[move]}")
+    return nodes, elapsed
+
+
+def _report(name, depth, nodes, elapsed, expected=None):
+    nps = nodes / elapsed if elapsed > 0 else 0
+    status = ""
+    if expected is not None:
+        status = "  ok" if nodes == expected else f"  MISMATCH (expected {expected})"
+    print(f"{name:<10} depth {depth}: {nodes:>12,} nodes {elapsed:8.2f}s {nps:>12,.0f} nps{status}")
+
+
+def _run_suite(args):
+    """Standard positions up to --depth; returns how many miscounted."""
+    failures = 0
+    total_nodes = total_time = 0
+    for name, fen, expected in STANDARD_POSITIONS:
+        depth = min(args.depth, len(expected))
+        if args.divide:
+            print(f"{name}:")
+        nodes, elapsed = run(fen, depth, args.tt, args.jobs, args.divide, args.gate)
+        _report(name, depth, nodes, elapsed, expected[depth - 1])
+        failures += nodes != expected[depth - 1]
+        total_nodes += nodes
+        total_time += elapsed
+    _report("total", args.depth, total_nodes, total_time)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft move-generation check and benchmark.")
+    parser.add_argument("--fen", help="single position instead of the standard suite")
+    parser.add_argument("--depth", type=int, default=4, help="depth (suite: maximum depth per position)")
+    parser.add_argument("--divide", action="store_true", help="print node counts per root move")
+    parser.add_argument("--tt", action="store_true", help="cache subtree counts in a transposition table")
+    parser.add_argument("--jobs", type=int, default=1, help="split root moves across processes")
+    parser.add_argument("--gate", action="store_true",
+                        help="regression gate: also check the incremental attack maps at every node (slow)")
+    args = parser.parse_args()
+
+    try:
+        if args.fen:
+            nodes, elapsed = run(args.fen, args.depth, args.tt, args.jobs, args.divide, args.gate)
+            _report("fen", args.depth, nodes, elapsed)
+            return
+        failures = _run_suite(args)
+    except AttackMapMismatch as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if failures:
+        print(f"[ERROR] {failures} position(s) failed perft")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# src/tools/replay_trace.py
+import argparse
+import json
+import os
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # headless unless a display is asked for
+
+import pygame
+
+from src.config.settings import FPS
+from src.core.game_controller import GameController
+from src.core.position_index import PositionIndex
+from src.gui.session_trace import ReplayFrames, NullGameLog
+from src.main import _game_loop
+
+
+def replay(path):
+    """Run a recorded session through the game loop at full speed; returns the ReplayFrames."""
+    frames = ReplayFrames(path)
+    controller = frames.build_controller(lambda header: GameController(
+        white_difficulty=header["white_difficulty"],
+        black_difficulty=header["black_difficulty"],
+        time_control=tuple(header["time_control"]) if header["time_control"] else None,
+        initial_fen=header["initial_fen"]
+    ))
+    # Empty in-memory index: lookups cost the same without depending on local data
+    position_index = PositionIndex(":memory:")
+    try:
+        _game_loop(controller, frames.header["white_is_human"], frames.header["black_is_human"], NullGameLog(),
+                   position_index, frames=frames)
+    finally:
+        position_index.close()
+    return frames
+
+
+def summarize(frame_times):
+    """Frame time statistics in milliseconds."""
+    summary = {}
+    for name, times in (("all", [t for t, _ in frame_times]), ("rendered", [t for t, r in frame_times if r])):
+        if not times:
+            continue
+        ms = sorted(t * 1000 for t in times)
+        summary[name] = {
+            "frames": len(ms),
+            "mean": statistics.fmean(ms),
+            "p50": ms[len(ms) // 2],
+            "p95": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+            "p99": ms[min(len(ms) - 1, int(len(ms) * 0.99))],
+            "max": ms[-1],
+            "over_budget": sum(t > 1000 / FPS for t in ms),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game session headlessly and report frame times.")
+    parser.add_argument("trace", help="trace file written by python -m src.main --record-traces DIR")
+    parser.add_argument("--repeat", type=int, default=1, help="replay this many times and keep the fastest run")
+    parser.add_argument("--json", metavar="PATH", help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        frames = replay(args.trace)
+        runs.append((summarize(frames.frame_times), frames.divergences()))
+    pygame.quit()
+
+    summary, divergences = min(runs, key=lambda run: run[0]["all"]["mean"])
+    for name, stats in summary.items():
+        print(f"{name:>8}: {stats['frames']} frames, mean {stats['mean']:.2f} ms, p50 {stats['p50']:.2f}, "
+              f"p95 {stats['p95']:.2f}, p99 {stats['p99']:.2f}, max {stats['max']:.2f}, "
+              f"{stats['over_budget']} over the {1000 / FPS:.1f} ms frame budget")
+    if divergences:
+        print(f"[WARNING] Replay diverged from the trace {divergences} times (engine calls or AI moves not recorded)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"trace": args.trace, "frames": summary, "divergences": divergences}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# src/tools/shm_bench.py
+import argparse
+import gc
+import multiprocessing
+import statistics
+import time
+
+import chess
+
+from src.core.game_log import pack_move
+from src.core.shm_ring import ShmRing, RingReader
+
+# A realistic info line: depth 20, +0.35, a 12-move principal variation
+PV_UCI = ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5a4", "g8f6", "e1g1", "f8e7", "f1e1", "b7b5"]
+PV_PACKED = [pack_move(chess.Move.from_uci(move)) for move in PV_UCI]
+
+
+def _wait_until(deadline):
+    remaining = deadline - time.perf_counter()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def _ring_producer(name, count, interval_s, go):
+    ring = ShmRing.attach(name)
+    go.wait()
+    next_at = time.perf_counter()
+    for i in range(count):
+        # The key carries the send time (ns) when measuring latency
+        ring.publish(time.perf_counter_ns() if interval_s else i, 20, 1, 35, 1, PV_PACKED)
+        if interval_s:
+            next_at += interval_s
+            _wait_until(next_at)
+    ring.close()
+
+
+def _queue_producer(results, count, interval_s, go):
+    go.wait()
+    next_at = time.perf_counter()
+    for i in range(count):
+        results.put({"key": time.perf_counter_ns() if interval_s else i, "depth": 20, "type": "cp", "value": 35,
+                     "line": 1, "pv": PV_UCI})
+        if interval_s:
+            next_at += interval_s
+            _wait_until(next_at)
+    results.put(None)
+
+
+def _gc_collections():
+    return sum(stats["collections"] for stats in gc.get_stats())
+
+
+def run_ring(count, interval_s, capacity):
+    """(seconds, latencies in ns, dropped, gc collections) for `count` records through a ShmRing."""
+    context = multiprocessing.get_context("spawn")
+    ring = ShmRing(capacity=capacity)
+    reader = RingReader(ring)
+    go = context.Event()
+    producer = context.Process(target=_ring_producer, args=(ring.name, count, interval_s, go))
+    producer.start()
+    latencies = []
+    try:
+        collections = _gc_collections()
+        started = time.perf_counter()
+        go.set()
+        while reader.cursor < count:
+            records = reader.poll(limit=256)   # per-frame sized batches
+            if not records:
+                time.sleep(0)   # let the producer run on a busy machine
+            for record in records:
+                if interval_s:
+                    latencies.append(time.perf_counter_ns() - record.key)
+        elapsed = time.perf_counter() - started
+        collections = _gc_collections() - collections
+        producer.join()
+        return elapsed, latencies, reader.dropped, collections
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+def run_queue(count, interval_s):
+    """(seconds, latencies in ns, dropped, gc collections) for `count` records through a multiprocessing.Queue."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    go = context.Event()
+    producer = context.Process(target=_queue_producer, args=(results, count, interval_s, go))
+    producer.start()
+    latencies = []
+    collections = _gc_collections()
+    started = time.perf_counter()
+    go.set()
+    while True:
+        record = results.get()
+        if record is None:
+            break
+        if interval_s:
+            latencies.append(time.perf_counter_ns() - record["key"])
+    elapsed = time.perf_counter() - started
+    collections = _gc_collections() - collections
+    producer.join()
+    return elapsed, latencies, 0, collections
+
+
+def _percentiles(latencies):
+    us = sorted(ns / 1000 for ns in latencies)
+    return (f"p50 {us[len(us) // 2]:.1f} us, p99 {us[min(len(us) - 1, int(len(us) * 0.99))]:.1f} us, "
+            f"max {us[-1]:.1f} us, mean {statistics.fmean(us):.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory ring vs. multiprocessing.Queue for analysis results.")
+    parser.add_argument("--records", type=int, default=200000, help="records for the throughput run")
+    parser.add_argument("--latency-records", type=int, default=5000, help="records for the latency run")
+    parser.add_argument("--interval-us", type=int, default=200, help="time between records in the latency run")
+    parser.add_argument("--capacity", type=int, default=65536, help="ring slots")
+    args = parser.parse_args()
+
+    print(f"Throughput, {args.records} records sent back to back:")
+    for name, run in (("ring", lambda: run_ring(args.records, 0, args.capacity)),
+                      ("queue", lambda: run_queue(args.records, 0))):
+        elapsed, _, dropped, collections = run()
+        print(f"  {name:>5}: {(args.records - dropped) / elapsed:12,.0f} records/s delivered  ({elapsed:.2f} s, "
+              f"{dropped} dropped, {collections} gc collections)")
+
+    interval_s = args.interval_us / 1e6
+    print(f"Latency, {args.latency_records} records, one every {args.interval_us} us:")
+    for name, run in (("ring", lambda: run_ring(args.latency_records, interval_s, args.capacity)),
+                      ("queue", lambda: run_queue(args.latency_records, interval_s))):
+        _, latencies, dropped, collections = run()
+        print(f"  {name:>5}: {_percentiles(latencies)}  ({dropped} dropped, {collections} gc collections)")
+
+
+if __name__ == "__main__":
+    main()
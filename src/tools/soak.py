@@ -0,0 +1,221 @@
+# src/tools/soak.py
+import argparse
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import tracemalloc
+
+# Headless, and games go to a scratch save directory (read by settings at import)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+SCRATCH_DIR = tempfile.mkdtemp(prefix="chess-soak-")
+os.environ["CHESS_SAVE_PATH"] = SCRATCH_DIR
+
+import chess
+import pygame
+
+from src.config.settings import (
+    SOAK_WARMUP_CYCLES, SOAK_PLIES, SOAK_MAX_RSS_GROWTH_MB, SOAK_MAX_TRACEMALLOC_GROWTH_KB, SOAK_MAX_FD_GROWTH,
+    SOAK_MAX_CHILD_GROWTH, SOAK_MAX_THREAD_GROWTH
+)
+from src.gui.menu import Menu
+from src.gui.session_trace import LiveFrames
+from src.main import run_game
+
+MAX_FRAMES = 3000   # a cycle stuck this long is abandoned with a QUIT
+
+
+def _click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, {"pos": pos, "button": 1})
+
+
+def _key(key):
+    return pygame.event.Event(pygame.KEYDOWN, {"key": key, "mod": 0})
+
+
+class SoakFrames(LiveFrames):
+    """Plays a game as White with random moves, steps back through the replay and leaves via the back button."""
+
+    def __init__(self, plies, rng, analysis_process=False):
+        super().__init__(analysis_process)
+        self.plies = plies
+        self.rng = rng
+        self.display = None
+        self.script = []        # synthetic events still to send, one per frame
+        self.frame = 0
+        self.phase = "play"
+
+    def attach(self, controller, display):
+        self.display = display
+        controller.ai_move_delay_s = 0.0
+
+    def _square_pos(self, square):
+        return self.display.layout.square_center(chess.square_file(square), 7 - chess.square_rank(square))
+
+    def _plan(self, controller):
+        board = controller.get_board()
+        if self.phase == "play":
+            if controller.is_game_over() or len(controller.move_history) >= self.plies:
+                self.phase = "replay"
+            elif board.turn == chess.WHITE and not controller.ai_move_pending:
+                moves = [move for move in board.legal_moves if move.promotion is None]
+                if not moves:
+                    self.phase = "replay"
+                else:
+                    move = self.rng.choice(moves)
+                    self.script = [_click(self._square_pos(move.from_square)), _click(self._square_pos(move.to_square))]
+                return
+            else:
+                return
+        if self.phase == "replay":
+            self.script = [_key(pygame.K_LEFT)] * 3 + [_key(pygame.K_ESCAPE)]
+            self.phase = "back"
+        elif self.phase == "back" and self.display.back_button_rect is not None:
+            self.script = [_click(self.display.back_button_rect.center)]
+            self.phase = "confirm"
+        elif self.phase == "confirm" and self.display.confirm_yes_rect is not None:
+            self.script = [_click(self.display.confirm_yes_rect.center)]
+            self.phase = "done"
+
+    def next_frame(self, controller):
+        events = super().next_frame(controller)
+        self.frame += 1
+        if self.frame > MAX_FRAMES:
+            return events + [pygame.event.Event(pygame.QUIT)]
+        if not self.script:
+            self._plan(controller)
+        if self.script:
+            events.append(self.script.pop(0))
+        return events
+
+
+def open_menu_and_start():
+    """Choose "Human vs AI (Play as White)" and confirm the difficulty on a fresh Menu; returns its result."""
+    with Menu() as menu:
+        labels = dict(menu.start_buttons())
+        pygame.event.post(_click(labels["Human vs AI (Play as White)"].center))
+        # The start screen drains the queue before the difficulty screen opens
+        pygame.time.set_timer(_click(menu.difficulty_confirm_rect().center), 100, loops=1)
+        return menu.show_start_screen()
+
+
+def _proc_status(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _child_processes():
+    pid = str(os.getpid())
+    count = 0
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        count += fields[1] == pid
+    return count
+
+
+def measure():
+    """Resource counters of this process (Linux /proc).
+
+    Handles are counted before collecting garbage: engine processes,
+    pipes and threads must be released by close(), not by finalizers.
+    """
+    row = {
+        "fds": len(os.listdir("/proc/self/fd")),
+        "children": _child_processes(),
+        "threads": threading.active_count(),
+    }
+    gc.collect()
+    row["rss_mb"] = _proc_status("VmRSS") / 1024
+    row["traced_kb"] = tracemalloc.get_traced_memory()[0] / 1024
+    return row
+
+
+LIMITS = {
+    "rss_mb": SOAK_MAX_RSS_GROWTH_MB,
+    "traced_kb": SOAK_MAX_TRACEMALLOC_GROWTH_KB,
+    "fds": SOAK_MAX_FD_GROWTH,
+    "children": SOAK_MAX_CHILD_GROWTH,
+    "threads": SOAK_MAX_THREAD_GROWTH,
+}
+
+
+def soak(cycles, plies, warmup=SOAK_WARMUP_CYCLES, seed=1, analysis_process=False):
+    """Run menu -> game -> replay -> back cycles; returns (per-cycle measurements, failures)."""
+    rng = random.Random(seed)
+    tracemalloc.start()
+    rows = []
+    failures = []
+    baseline = None
+    for cycle in range(1, warmup + cycles + 1):
+        choice = open_menu_and_start()
+        if not choice or choice[:2] != ("human_vs_ai", chess.WHITE):
+            failures.append(f"cycle {cycle}: menu returned {choice}")
+            break
+        result = run_game(white_human=True, black_human=False, black_difficulty=choice[2],
+                          frames=SoakFrames(plies, rng, analysis_process))
+        if result != "back_to_menu":
+            failures.append(f"cycle {cycle}: game ended with {result!r} instead of going back to the menu")
+            break
+        row = measure()
+        rows.append(row)
+        if cycle == warmup:
+            baseline = row
+        line = (f"cycle {cycle:3d}  rss {row['rss_mb']:7.1f} MB  traced {row['traced_kb']:8.0f} KB  "
+                f"fds {row['fds']:3d}  children {row['children']:2d}  threads {row['threads']:2d}")
+        if cycle <= warmup:
+            line += "  (warmup)"
+        else:
+            line += (f"  growth: rss {row['rss_mb'] - baseline['rss_mb']:+.1f} MB, "
+                     f"traced {row['traced_kb'] - baseline['traced_kb']:+.0f} KB")
+        print(line)
+    tracemalloc.stop()
+
+    if baseline is not None and rows:
+        final = rows[-1]
+        for name, limit in LIMITS.items():
+            if final[name] - baseline[name] > limit:
+                failures.append(f"{name} grew by {final[name] - baseline[name]:.1f} over {cycles} cycles "
+                                f"(limit {limit})")
+    return rows, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test: repeated menu -> game -> replay -> back cycles, "
+                                                 "failing on memory, fd, process or thread growth.")
+    parser.add_argument("--cycles", type=int, default=20, help="measured cycles after the warmup")
+    parser.add_argument("--warmup", type=int, default=SOAK_WARMUP_CYCLES)
+    parser.add_argument("--plies", type=int, default=SOAK_PLIES, help="plies played per game")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--analysis-process", action="store_true", help="analysis engine in a child process")
+    args = parser.parse_args()
+
+    if not os.path.isdir("/proc/self/fd"):
+        print("[FATAL] The soak test reads /proc and needs Linux")
+        raise SystemExit(2)
+    try:
+        _, failures = soak(args.cycles, args.plies, max(1, args.warmup), args.seed, args.analysis_process)
+    finally:
+        pygame.quit()
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+    for failure in failures:
+        print(f"[ERROR] {failure}")
+    if failures:
+        sys.exit(1)
+    print("Soak test passed")
+
+
+if __name__ == "__main__":
+    main()